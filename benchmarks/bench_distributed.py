@@ -0,0 +1,100 @@
+from time import time
+import datetime
+import os
+from sfgad.analyzer import Analyzer
+from sfgad.distributed import DistributedAnalyzer, start_local_workers
+from sfgad.modules.features import VertexDegree
+from sfgad.modules.observation_selection import HistoricSameSelection
+from sfgad.modules.probability_combination import AvgProbability
+from sfgad.modules.probability_estimation import Gaussian
+from sfgad.modules.weighting import ConstantWeight
+import pandas as pd
+import numpy as np
+
+# the key shared by the coordinator and the local workers
+KEY = os.urandom(32)
+
+
+def total_benchmark():
+    # Small Size
+    benchmark_distributed_analyzer(n_vertices=100, n_edges=500, n_timesteps=20, n_runs=5)
+    # Medium Size
+    benchmark_distributed_analyzer(n_vertices=1000, n_edges=5000, n_timesteps=20, n_runs=3)
+    # Large Size
+    benchmark_distributed_analyzer(n_vertices=10000, n_edges=50000, n_timesteps=20, n_runs=1)
+
+
+def generate_dataset(n_vertices, n_edges, n_timesteps):
+    dfs = []
+    for i in range(n_timesteps):
+        dfs.append(pd.DataFrame({
+            'TIMESTAMP': datetime.datetime.fromordinal(1).replace(year=2017) + datetime.timedelta(days=i),
+            'E_NAME': 'E',
+            'E_TYPE': 'E_TYPE',
+            'SRC_NAME': np.random.randint(n_vertices, size=n_edges).astype(str),
+            'SRC_TYPE': 'V_TYPE',
+            'DST_NAME': np.random.randint(n_vertices, size=n_edges).astype(str),
+            'DST_TYPE': 'V_TYPE'}))
+    return dfs
+
+
+def print_dataset_stats(n_vertices, n_edges, n_timesteps):
+    print("Dataset statistics:")
+    print("===================")
+    print("%s %d" % ("Number of vertices:".ljust(25), n_vertices))
+    print("%s %d" % ("Number of edges:".ljust(25), n_edges))
+    print("%s %d" % ("Number of timesteps:".ljust(25), n_timesteps))
+
+
+def create_analyzer(addresses=None):
+    modules = ([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(), AvgProbability())
+    if addresses is None:
+        return Analyzer(*modules, n_jobs=1)
+    return DistributedAnalyzer(*modules, workers=addresses, key=KEY, n_jobs=1)
+
+
+def benchmark_distributed_analyzer(n_vertices, n_edges, n_timesteps, n_runs):
+    dfs = generate_dataset(n_vertices, n_edges, n_timesteps)
+    n_scored = sum(len(pd.unique(df[['SRC_NAME', 'DST_NAME']].values.ravel())) for df in dfs)
+
+    print("DISTRIBUTED ANALYZER")
+    print("====================")
+
+    print("")
+    print_dataset_stats(n_vertices, n_edges, n_timesteps)
+
+    print()
+    print("Throughput in vertices per second (average over %d runs):" % n_runs)
+    print("====================")
+    print("{0: <30} {1: >12} {2: >12} {3: >12} {4: >12} {5: >12}"
+          "".format("Analyzer", "local", "1 worker", "2 workers", "4 workers", "8 workers"))
+    print("-" * 95)
+
+    throughputs = [n_scored / benchmark_analyzer(None, dfs, n=n_runs)]
+    for n_workers in [1, 2, 4, 8]:
+        processes, addresses = start_local_workers(n_workers, KEY)
+        throughputs.append(n_scored / benchmark_analyzer(addresses, dfs, n=n_runs))
+
+        # shut down the workers
+        analyzer = create_analyzer(addresses)
+        analyzer.connect()
+        analyzer.close(shutdown_workers=True)
+        for process in processes:
+            process.join()
+
+    print("{0: <30} {1: >12.1f} {2: >12.1f} {3: >12.1f} {4: >12.1f} {5: >12.1f}"
+          "".format("DistributedAnalyzer", *throughputs))
+    print()
+
+
+def benchmark_analyzer(addresses, dfs, n=5):
+    total = 0
+    for i in range(n):
+        analyzer = create_analyzer(addresses)
+        start = time()
+        for df in dfs:
+            analyzer.fit_transform(df)
+        total += time() - start
+        if addresses is not None:
+            analyzer.close()
+    return total / n
@@ -15,6 +15,8 @@ def total_benchmark():
     # Large Size
     benchmark_parametric_estimators(1000, 1, 1000, 5)
     benchmark_non_parametric_estimators(1000, 1, 1000, 5)
+    # Segmented fit and transform
+    benchmark_segmented_estimators(1000, 1, 100, 5)
 
 
 def generate_dataset(n_samples, n_features, n_observations):
@@ -94,6 +96,41 @@ def benchmark_non_parametric_estimators(n_samples, n_features, n_observations, n
     print()
 
 
+def benchmark_segmented_estimators(n_segments, n_features, segment_size, n_runs):
+    reference_observations = np.random.random((n_segments * segment_size, n_features))
+    weights = np.random.random(n_segments * segment_size)
+    offsets = np.arange(n_segments + 1) * segment_size
+    samples = np.random.random((n_segments, n_features))
+
+    estimators = [
+        ('Exponential', Exponential()),
+        ('Gaussian', Gaussian()),
+        ('Uniform', Uniform()),
+        ('EmpiricalEstimator', EmpiricalEstimator())
+    ]
+
+    print("SEGMENTED ESTIMATORS")
+    print("====================")
+
+    print("")
+    print("Dataset statistics:")
+    print("===================")
+    print("%s %d" % ("Number of segments:".ljust(25), n_segments))
+    print("%s %d" % ("Number of features:".ljust(25), n_features))
+    print("%s %d" % ("Observations per segment:".ljust(25), segment_size))
+
+    print()
+    print("Computation time (average over %d runs):" % n_runs)
+    print("====================")
+    print("{0: <30} {1: >12} {2: >12} {3: >12}".format("Estimator", "per call", "segmented", "speedup"))
+    print("-" * 69)
+    for name, e in estimators:
+        time_1 = benchmark_estimator_per_segment(e, samples, reference_observations, weights, offsets, n=n_runs)
+        time_2 = benchmark_estimator_segmented(e, samples, reference_observations, weights, offsets, n=n_runs)
+        print("{0: <30} {1: >11.4f}s {2: >11.4f}s {3: >11.1f}x".format(name, time_1, time_2, time_1 / time_2))
+    print()
+
+
 def print_dataset_stats(n_samples, n_features, n_observations):
     print("Dataset statistics:")
     print("===================")
@@ -110,3 +147,24 @@ def benchmark_estimator(estimator, samples, observations, weights, n=100):
             estimator.estimate(pd.DataFrame(list(sample), columns=samples.columns), observations, weights)
         total += time() - start
     return total / n
+
+
+def benchmark_estimator_per_segment(estimator, samples, reference_observations, weights, offsets, n=100):
+    total = 0
+    for i in range(n):
+        start = time()
+        for j, sample in enumerate(samples):
+            estimator.estimate(sample[None, :], reference_observations[offsets[j]:offsets[j + 1]],
+                               weights[offsets[j]:offsets[j + 1]])
+        total += time() - start
+    return total / n
+
+
+def benchmark_estimator_segmented(estimator, samples, reference_observations, weights, offsets, n=100):
+    total = 0
+    for i in range(n):
+        start = time()
+        estimator.fit_segments(reference_observations, weights, offsets)
+        estimator.transform_segments(samples)
+        total += time() - start
+    return total / n
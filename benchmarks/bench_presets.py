@@ -0,0 +1,226 @@
+import argparse
+import datetime
+import json
+import platform
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from sfgad import algorithms
+
+VERTEX_TYPES = ('PERSON', 'PICTURE')
+EDGE_TYPES = ('LIKE', 'POST')
+
+PRESETS = ['dapa', 'hotspot', 'dnd_modified', 'nphgs']
+
+SCALES = {
+    'small': {'n_vertices': 100, 'n_edges': 500, 'n_windows': 20},
+    'medium': {'n_vertices': 1000, 'n_edges': 5000, 'n_windows': 20},
+    'large': {'n_vertices': 10000, 'n_edges': 50000, 'n_windows': 10},
+}
+
+# the metrics compared against the baseline and whether higher values are better
+METRICS = [('latency_p50', False), ('latency_p99', False), ('throughput', True), ('peak_rss_mb', False)]
+
+
+def total_benchmark(seed=0):
+    # Small, medium and large size
+    return benchmark_presets(PRESETS, list(SCALES), seed)
+
+
+def create_analyzer(preset):
+    if preset == 'dapa':
+        return algorithms.dapa(n_jobs=1)
+    if preset == 'hotspot':
+        # the windows of the stream are one day long
+        return algorithms.hotspot(window_size=24 * 60 * 60, n_jobs=1)
+    if preset == 'dnd_modified':
+        return algorithms.dnd_modified(n_jobs=1)
+    if preset == 'nphgs':
+        return algorithms.nphgs(edge_types=EDGE_TYPES, n_jobs=1)
+    raise ValueError("Unknown preset %s." % preset)
+
+
+def generate_stream(n_vertices, n_edges, n_windows, seed):
+    """
+    Generates a reproducible stream of windows, which are one day long, with typed vertices and edges.
+    """
+    random = np.random.RandomState(seed)
+    vertex_types = np.array(VERTEX_TYPES)[random.randint(len(VERTEX_TYPES), size=n_vertices)]
+    start = datetime.datetime(2017, 1, 1)
+
+    dfs = []
+    for i in range(n_windows):
+        src = random.randint(n_vertices, size=n_edges)
+        dst = random.randint(n_vertices, size=n_edges)
+        seconds = np.sort(random.randint(24 * 60 * 60, size=n_edges))
+        dfs.append(pd.DataFrame({
+            'TIMESTAMP': [start + datetime.timedelta(days=i, seconds=int(s)) for s in seconds],
+            'E_NAME': ['E_%d_%d' % (i, j) for j in range(n_edges)],
+            'E_TYPE': np.array(EDGE_TYPES)[random.randint(len(EDGE_TYPES), size=n_edges)],
+            'SRC_NAME': src.astype(str),
+            'SRC_TYPE': vertex_types[src],
+            'DST_NAME': dst.astype(str),
+            'DST_TYPE': vertex_types[dst]}))
+    return dfs
+
+
+def print_dataset_stats(n_vertices, n_edges, n_windows):
+    print("Dataset statistics:")
+    print("===================")
+    print("%s %d" % ("Number of vertices:".ljust(25), n_vertices))
+    print("%s %d" % ("Number of edges:".ljust(25), n_edges))
+    print("%s %d" % ("Number of windows:".ljust(25), n_windows))
+
+
+def benchmark_presets(presets, scales, seed):
+    results = {'meta': {'seed': seed, 'python': platform.python_version(), 'platform': platform.platform(),
+                        'numpy': np.__version__, 'pandas': pd.__version__},
+               'results': {}}
+
+    print("ALGORITHM PRESETS")
+    print("====================")
+
+    for scale in scales:
+        print("")
+        print_dataset_stats(**SCALES[scale])
+
+        print()
+        print("Latency per window in ms, throughput in vertices per second and peak RSS in MB:")
+        print("====================")
+        print("{0: <20} {1: >12} {2: >12} {3: >12} {4: >12} {5: >12} {6: >12}"
+              "".format("Preset", "p50", "p90", "p99", "throughput", "peak RSS", "history"))
+        print("-" * 98)
+
+        for preset in presets:
+            # every run gets a fresh process, so that the peak RSS is measured per preset and scale
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                result = executor.submit(run_preset, preset, scale, seed).result()
+            results['results']['%s/%s' % (preset, scale)] = result
+
+            if 'error' in result:
+                print("{0: <20} {1}".format(preset, result['error']))
+            else:
+                print("{0: <20} {1: >12.1f} {2: >12.1f} {3: >12.1f} {4: >12.1f} {5: >12.1f} {6: >12d}"
+                      "".format(preset, 1000 * result['latency_p50'], 1000 * result['latency_p90'],
+                                1000 * result['latency_p99'], result['throughput'], result['peak_rss_mb'],
+                                result['history_rows']))
+        print()
+
+    return results
+
+
+def run_preset(preset, scale, seed):
+    """
+    Replays the stream of the given scale through the analyzer of the given preset.
+    :return: dictionary with the latency percentiles per window in seconds, the throughput in vertices per second, the
+    peak RSS in MB and the number of rows of the history.
+    """
+    dfs = generate_stream(seed=seed, **SCALES[scale])
+
+    try:
+        analyzer = create_analyzer(preset)
+
+        latencies = []
+        n_scored = 0
+        for df in dfs:
+            start = perf_counter()
+            result = analyzer.fit_transform(df)
+            latencies.append(perf_counter() - start)
+            n_scored += len(result)
+
+        history_rows = len(analyzer.db.select_all())
+    except Exception as e:
+        return {'error': '%s: %s' % (type(e).__name__, e)}
+
+    # ru_maxrss is given in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / 1024 ** 2 if sys.platform == 'darwin' else peak_rss / 1024
+
+    return {'latency_p50': float(np.percentile(latencies, 50)),
+            'latency_p90': float(np.percentile(latencies, 90)),
+            'latency_p99': float(np.percentile(latencies, 99)),
+            'latency_max': float(np.max(latencies)),
+            'throughput': n_scored / sum(latencies),
+            'peak_rss_mb': peak_rss_mb,
+            'history_rows': history_rows,
+            'n_windows': len(dfs)}
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Compares the results with the results of a baseline run.
+    :param tolerance: The relative change of a metric, which is still accepted.
+    :return: list of tuples (run, metric, baseline value, value) of the regressions. Failed runs and runs of the
+    baseline, which are missing in the results, are regressions as well.
+    """
+    regressions = []
+
+    for run in sorted(set(results['results']) | set(baseline['results'])):
+        result = results['results'].get(run)
+        expected = baseline['results'].get(run)
+        if result is None:
+            regressions.append((run, 'missing', None, None))
+            continue
+        if 'error' in result:
+            regressions.append((run, 'error', expected.get('error') if expected else None, result['error']))
+            continue
+        # the metrics of a run, which failed in the baseline or was not part of it, cannot regress
+        if expected is None or 'error' in expected:
+            continue
+
+        for metric, higher_is_better in METRICS:
+            if higher_is_better:
+                regressed = result[metric] < expected[metric] / (1 + tolerance)
+            else:
+                regressed = result[metric] > expected[metric] * (1 + tolerance)
+            if regressed:
+                regressions.append((run, metric, expected[metric], result[metric]))
+
+    return regressions
+
+
+def print_regressions(regressions, tolerance):
+    print("Regressions against the baseline (tolerance %d%%):" % (100 * tolerance))
+    print("====================")
+    if not regressions:
+        print("None")
+    for run, metric, expected, value in regressions:
+        print("{0: <30} {1: <15} {2} -> {3}".format(run, metric, expected, value))
+    print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replays a seeded synthetic stream through the algorithm presets.")
+    parser.add_argument('--presets', nargs='+', default=PRESETS, choices=PRESETS)
+    parser.add_argument('--scales', nargs='+', default=list(SCALES), choices=list(SCALES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="JSON file, to which the results are written.")
+    parser.add_argument('--baseline', help="JSON file of a previous run, against which the results are compared.")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = benchmark_presets(args.presets, args.scales, args.seed)
+
+    if args.output is not None:
+        save_results(results, args.output)
+
+    failed = [run for run, result in results['results'].items() if 'error' in result]
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = compare_results(results, json.load(f), args.tolerance)
+        print_regressions(regressions, args.tolerance)
+        sys.exit(1 if regressions else 0)
+
+    sys.exit(1 if failed else 0)
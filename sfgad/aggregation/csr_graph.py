@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+COL_NAME = 'name'
+COL_TYPE = 'type'
+COL_P = 'p_value'
+
+COL_SRC_NAME = 'SRC_NAME'
+COL_SRC_TYPE = 'SRC_TYPE'
+COL_DST_NAME = 'DST_NAME'
+COL_DST_TYPE = 'DST_TYPE'
+
+# the arrays, which are needed to grow subgraphs
+SHARED_ARRAYS = ['p', 'indptr', 'indices']
+
+
+class CSRGraph:
+    """
+    An undirected graph with p-values, whose vertices are stored in arrays sorted by ascending p-value. A vertex is
+    identified by its rank in this order. The neighbors of vertex i are indices[indptr[i]:indptr[i + 1]] in ascending
+    order. The distinct types are listed in type_order in the order of their first vertex before sorting.
+    """
+
+    def __init__(self, names, types, p, indptr, indices, type_order=None):
+        self.names = names
+        self.types = types
+        self.p = p
+        self.indptr = indptr
+        self.indices = indices
+        self.type_order = pd.unique(types) if type_order is None else type_order
+
+    @classmethod
+    def from_frames(cls, df_edges, df_p):
+        """
+        Creates the graph of the given edges with the p-values of their vertices. Vertices without edges are not part
+        of the graph. If a name occurs several times, its last p-value and its last type are used like in
+        create_p_graph().
+        :param df_edges: DataFrame of edges in the graph.
+        :param df_p: DataFrame of vertices and their p-values.
+        :return: the graph.
+        """
+        src_names = df_edges[COL_SRC_NAME].values.astype(str)
+        dst_names = df_edges[COL_DST_NAME].values.astype(str)
+        p_names = df_p[COL_NAME].values.astype(str)
+
+        # the vertices of the edges with the last type of every name
+        df_vertices = pd.DataFrame({'name': np.concatenate([src_names, dst_names]),
+                                    'type': np.concatenate([df_edges[COL_SRC_TYPE].values,
+                                                            df_edges[COL_DST_TYPE].values])})
+        df_vertices = df_vertices.drop_duplicates().drop_duplicates('name', keep='last')
+
+        if not np.all(pd.Index(df_vertices['name'].values).isin(p_names)):
+            raise ValueError('Vertex has an edge, but not an associated p-value.')
+
+        if len(df_vertices) == 0:
+            return cls(np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype=np.float64),
+                       np.zeros(1, dtype=np.int64), np.array([], dtype=np.int64))
+
+        # the vertices in the order of their first p-value with their last p-value (and their last type, if the
+        # p-values have types)
+        in_graph = pd.Index(p_names).isin(df_vertices['name'].values)
+        df_nodes = pd.DataFrame({'name': p_names[in_graph], 'p': df_p[COL_P].values[in_graph]})
+        if COL_TYPE in df_p.columns:
+            df_vertices = pd.DataFrame({'name': df_nodes['name'], 'type': df_p[COL_TYPE].values[in_graph]})
+            df_vertices = df_vertices.drop_duplicates('name', keep='last')
+
+        first = ~df_nodes['name'].duplicated(keep='first').values
+        last_p = df_nodes.drop_duplicates('name', keep='last').set_index('name')['p']
+
+        names = df_nodes['name'].values[first]
+        p = np.asarray(last_p.reindex(names).values, dtype=np.float64)
+        types = df_vertices.set_index('name')['type'].reindex(names).values
+
+        type_order = pd.unique(types)
+
+        # sort the vertices by ascending p-value (the sort is stable)
+        order = np.argsort(p, kind='mergesort')
+        names, types, p = names[order], types[order], p[order]
+
+        # symmetric adjacency without duplicate edges
+        ranks = pd.Index(names)
+        src = ranks.get_indexer(src_names).astype(np.int64)
+        dst = ranks.get_indexer(dst_names).astype(np.int64)
+        keys = np.unique(np.concatenate([src * len(names) + dst, dst * len(names) + src]))
+        rows, indices = np.divmod(keys, len(names))
+
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(names)))]).astype(np.int64)
+
+        return cls(names, types, p, indptr, indices, type_order)
+
+    def __len__(self):
+        return len(self.p)
+
+    def neighbors(self, vertices):
+        """
+        Returns the neighbors of all given vertices (with duplicates).
+        :param vertices: Array of vertices.
+        :return: array with the neighbors.
+        """
+        vertices = np.asarray(vertices, dtype=np.int64)
+        starts = self.indptr[vertices]
+        lengths = self.indptr[vertices + 1] - starts
+
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return self.indices[positions]
+
+    def edges(self):
+        """
+        Returns every edge of the graph once.
+        :return: tuple (src, dst) of arrays with the end vertices of the edges, where src < dst.
+        """
+        src = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+        once = src < self.indices
+
+        return src[once], self.indices[once]
+
+    def components(self, mask):
+        """
+        Labels the connected components of the subgraph induced by the vertices in the given mask.
+        :param mask: Boolean array, which selects the vertices.
+        :return: array with the component (its vertex with the lowest rank) of every vertex or -1 for vertices outside
+            the mask.
+        """
+        src, dst = self.edges()
+        induced = mask[src] & mask[dst]
+
+        return np.where(mask, union_find(len(self), src[induced], dst[induced]), -1)
+
+    def to_shared_memory(self):
+        """
+        Copies the p-values and the adjacency of the graph into shared memory, so that other processes can grow
+        subgraphs without copying the graph. The caller has to close and unlink the blocks, when they are not needed
+        anymore.
+        :return: tuple (blocks, spec) with the shared memory blocks and the specification for from_shared_memory().
+        """
+        # shared memory is only available from Python 3.8 on and only needed, if the seeds are grown in several processes
+        from multiprocessing.shared_memory import SharedMemory
+
+        blocks = []
+        spec = {}
+
+        for name in SHARED_ARRAYS:
+            array = getattr(self, name)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+
+            blocks.append(block)
+            spec[name] = (block.name, array.shape, array.dtype.str)
+
+        return blocks, spec
+
+    @classmethod
+    def from_shared_memory(cls, spec):
+        """
+        Attaches to a graph in shared memory. The graph has neither names nor types.
+        :param spec: The specification returned by to_shared_memory().
+        :return: tuple (graph, blocks) with the graph and the attached blocks, which have to be kept open as long as
+            the graph is used.
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        blocks = []
+        arrays = {}
+
+        for name in SHARED_ARRAYS:
+            block_name, shape, dtype = spec[name]
+            block = SharedMemory(name=block_name)
+
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+        return cls(None, None, arrays['p'], arrays['indptr'], arrays['indices'], type_order=[]), blocks
+
+
+def union_find(n, src, dst):
+    """
+    Finds the connected components of a graph with union-find over its edge arrays. In every round, the root of the
+    higher end of every edge between two components is linked to the lower root and the paths are compressed by
+    pointer jumping, until no edge connects two components.
+    :param n: The number of vertices.
+    :param src: Array with the source vertices of the edges.
+    :param dst: Array with the destination vertices of the edges.
+    :return: array with the root of the component of every vertex, which is its vertex with the lowest index.
+    """
+    roots = np.arange(n, dtype=np.int64)
+
+    while True:
+        src_roots, dst_roots = roots[src], roots[dst]
+        linked = src_roots != dst_roots
+        if not np.any(linked):
+            return roots
+
+        np.minimum.at(roots, np.maximum(src_roots[linked], dst_roots[linked]),
+                      np.minimum(src_roots[linked], dst_roots[linked]))
+
+        jumped = roots[roots]
+        while not np.array_equal(jumped, roots):
+            roots = jumped
+            jumped = roots[roots]
@@ -1,8 +1,13 @@
+import heapq
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from math import log
 
 import networkx as nx
+import numpy as np
 import pandas as pd
 
+from .csr_graph import CSRGraph
+
 COL_NAME = 'name'
 COL_TYPE = 'type'
 COL_P = 'p_value'
@@ -14,8 +19,11 @@ COL_DST_TYPE = 'DST_TYPE'
 COL_E_NAME = 'E_NAME'
 COL_E_TYPE = 'DST_TYPE'
 
+# the graph in shared memory of a worker process of grow_seeds()
+_shared_graph = None
+
 
-def scan(df_edges, df_p, alpha_max, K, Z=None, C=None):
+def scan(df_edges, df_p, alpha_max, K, Z=None, C=None, backend='networkx', n_jobs=1):
     """
     Extracts the most anomalous subgraph based on the Non-Parametric Heterogeneous Graph Scan (NPHGS).
     :param df_edges: DataFrame of edges in the graph.
@@ -24,8 +32,19 @@ def scan(df_edges, df_p, alpha_max, K, Z=None, C=None):
     :param K: the number of seed vertices considered per type.
     :param Z: the number of iterations per seed vertex.
     :param C: the vertex types present in the graph.
+    :param backend: Either 'networkx' or 'csr', which scans arrays of a CSRGraph without networkx.
+    :param n_jobs: The number of processes, which grow the seeds. If n_jobs > 1, the seeds are grown in a process pool
+        on a CSRGraph in shared memory independent of the backend.
     :return: tuples (subgraph, score) of the most anomalous subgraph with its score.
     """
+    if backend not in ['networkx', 'csr']:
+        raise ValueError("The given backend is unknown! Possible backends are: 'networkx' & 'csr'.")
+    if n_jobs < 1:
+        raise ValueError("The number of jobs must be at least 1.")
+
+    if backend == 'csr' or n_jobs > 1:
+        return scan_csr(CSRGraph.from_frames(df_edges, df_p), alpha_max, K, Z, C, n_jobs)
+
     p_graph = create_p_graph(df_edges, df_p)
     if p_graph.number_of_nodes() == 0:
         return set(), 0
@@ -36,6 +55,7 @@ def scan(df_edges, df_p, alpha_max, K, Z=None, C=None):
         C = set(nx.get_node_attributes(p_graph, name='type').values())
 
     vertices = sort_by_ascending_p(p_graph.nodes(data=True))
+    ranks = {v[0]: i for i, v in enumerate(vertices)}
 
     subgraphs = []
 
@@ -43,29 +63,463 @@ def scan(df_edges, df_p, alpha_max, K, Z=None, C=None):
         typed_vertices = [v for v in vertices if v[1]["type"] == c]
         for k in range(min(K, len(typed_vertices))):
             if typed_vertices[k][1]['p'] <= alpha_max:
-                subgraphs.append(grow_max_subgraph(p_graph, typed_vertices[k], vertices, alpha_max, Z))
+                subgraphs.append(grow_max_subgraph(p_graph, typed_vertices[k], vertices, alpha_max, Z, ranks))
 
     best_subgraph, best_score = max(subgraphs, key=lambda s: s[1], default=([], 0))
 
     return [v[0] for v in best_subgraph], best_score
 
 
-def grow_max_subgraph(p_graph, seed, vertices, alpha_max, Z):
+def scan_csr(graph, alpha_max, K, Z=None, C=None, n_jobs=1):
+    """
+    Extracts the most anomalous subgraph of a CSRGraph like scan().
+    :param graph: The CSRGraph.
+    :param alpha_max: the significance threshold.
+    :param K: the number of seed vertices considered per type.
+    :param Z: the number of iterations per seed vertex.
+    :param C: the vertex types present in the graph.
+    :param n_jobs: The number of processes, which grow the seeds.
+    :return: tuples (subgraph, score) of the most anomalous subgraph with its score.
+    """
+    if len(graph) == 0:
+        return set(), 0
+
+    if Z is None:
+        Z = int(log(len(graph), 2))
+    if C is None:
+        # the types are inserted in the same order as in scan(), so that they are iterated in the same order
+        C = set(graph.type_order)
+
+    seeds = []
+
+    for c in C:
+        typed_vertices = np.flatnonzero(graph.types == c)
+        for seed in typed_vertices[:K]:
+            if graph.p[seed] <= alpha_max:
+                seeds.append(seed)
+
+    # the subgraph of a seed lies within its component among the vertices with a p-value <= alpha_max
+    bounds = component_bounds(graph, graph.components(graph.p <= alpha_max))[np.array(seeds, dtype=np.int64)]
+
+    # the pruned seeds score less than another seed and are skipped like in the serial order of the seeds
+    subgraphs = [subgraph for subgraph in grow_seeds(graph, seeds, alpha_max, Z, n_jobs, bounds) if
+                 subgraph is not None]
+
+    best_subgraph, best_score = max(subgraphs, key=lambda s: s[1], default=([], 0))
+
+    return list(graph.names[best_subgraph]), best_score
+
+
+def grow_max_subgraph(p_graph, seed, vertices, alpha_max, Z, ranks=None):
+    """
+    Grows the subgraph of the given seed vertex for at most Z iterations. The neighbors of the subgraph (the frontier)
+    are maintained incrementally from the adjacency of the newly added vertices in a heap ordered by the rank of the
+    vertices in the sorted vertex list.
+    :param p_graph: The graph with the p-values of the vertices.
+    :param seed: The seed vertex.
+    :param vertices: All vertices sorted by ascending p-value.
+    :param alpha_max: the significance threshold.
+    :param Z: the maximal number of iterations.
+    :param ranks: Dictionary with the position of every vertex in vertices.
+    :return: tuple (subgraph, score).
+    """
+    if ranks is None:
+        ranks = {v[0]: i for i, v in enumerate(vertices)}
+
     s = [seed]
     score = 0
 
+    members = {seed[0]}
+    frontier = []
+    push_neighbors(p_graph, seed[0], ranks, members, frontier)
+
     for z in range(Z):
-        g = get_neighbors(p_graph, vertices, s)
+        g = pop_candidates(frontier, vertices, alpha_max, s[-1][1]['p'])
         b, score = relaxed_problem(alpha_max, s, g)
 
-        if len({v[0] for v in b} - {v[0] for v in s}) != 0:
+        if len(b) != len(s):
             s = b
+            for v in g:
+                push_neighbors(p_graph, v[0], ranks, members, frontier)
         else:
             return s, score
 
     return s, score
 
 
+def push_neighbors(p_graph, vertex, ranks, members, frontier):
+    """
+    Pushes the neighbors of the given vertex, which are neither part of the subgraph nor of the frontier yet, to the
+    frontier.
+    :param p_graph: The graph with the p-values of the vertices.
+    :param vertex: The name of the vertex.
+    :param ranks: Dictionary with the position of every vertex in the sorted vertex list.
+    :param members: Set of the names of all vertices in the subgraph or the frontier. It is updated in place.
+    :param frontier: Heap with the ranks of the vertices in the frontier. It is updated in place.
+    """
+    for u in p_graph.neighbors(vertex):
+        if u not in members:
+            members.add(u)
+            heapq.heappush(frontier, ranks[u])
+
+
+def pop_candidates(frontier, vertices, alpha_max, p_max):
+    """
+    Pops all vertices from the frontier, which the relaxed problem adds to the subgraph. These are the vertices with a
+    p-value < alpha_max and <= p_max, the p-value of the last vertex of the subgraph. All other vertices of the frontier
+    are never merged before the last vertex of the subgraph.
+    :param frontier: Heap with the ranks of the vertices in the frontier. It is updated in place.
+    :param vertices: All vertices sorted by ascending p-value.
+    :param alpha_max: the significance threshold.
+    :param p_max: The p-value of the last vertex of the subgraph.
+    :return: the candidates sorted by ascending p-value.
+    """
+    candidates = []
+    while frontier and vertices[frontier[0]][1]['p'] < alpha_max and vertices[frontier[0]][1]['p'] <= p_max:
+        candidates.append(vertices[heapq.heappop(frontier)])
+
+    return candidates
+
+
+def scan_multi_alpha(df_edges, df_p, alphas, K, Z=None, C=None):
+    """
+    Extracts the most anomalous subgraph for each of the given significance thresholds in a single pass. The graph is
+    built and sorted by p-value once. The subgraph of a seed only depends on the rank limit of its candidates (see
+    candidate_limit()), which is the same for all thresholds above the p-value of the seed, so that it is grown once
+    per distinct limit and scored for all these thresholds at once.
+    :param df_edges: DataFrame of edges in the graph.
+    :param df_p: DataFrame of vertices and their p-values.
+    :param alphas: Array-like of significance thresholds.
+    :param K: the number of seed vertices considered per type.
+    :param Z: the number of iterations per seed vertex.
+    :param C: the vertex types present in the graph.
+    :return: list with a tuple (subgraph, score) per threshold like returned by scan() for this threshold.
+    """
+    alphas = np.asarray(alphas, dtype=np.float64)
+    if alphas.ndim != 1 or len(alphas) == 0:
+        raise ValueError("The significance thresholds must be a non-empty one-dimensional array.")
+
+    graph = CSRGraph.from_frames(df_edges, df_p)
+    if len(graph) == 0:
+        return [(set(), 0) for _ in alphas]
+
+    if Z is None:
+        Z = int(log(len(graph), 2))
+    if C is None:
+        C = set(graph.type_order)
+
+    seeds = np.array([seed for c in C for seed in np.flatnonzero(graph.types == c)[:K]], dtype=np.int64)
+
+    # the rank limit of every seed for every threshold
+    alpha_limits = np.searchsorted(graph.p, alphas, side='left')
+    seed_limits = np.searchsorted(graph.p, graph.p[seeds], side='right')
+    limits = np.minimum(alpha_limits[:, None], seed_limits[None, :])
+
+    grown = {}
+    results = []
+
+    for a, alpha_max in enumerate(alphas):
+        subgraphs = []
+
+        for i in np.flatnonzero(graph.p[seeds] <= alpha_max):
+            key = (seeds[i], limits[a, i])
+            if key not in grown:
+                grown[key] = grow_limited_subgraph(graph, seeds[i], limits[a, i], Z)
+            subgraphs.append(grown[key])
+
+        best_subgraph, best_score = max(subgraphs, key=lambda s: s[1], default=([], 0))
+        results.append((list(graph.names[best_subgraph]), best_score))
+
+    return results
+
+
+def grow_seeds(graph, seeds, alpha_max, Z, n_jobs=1, bounds=None):
+    """
+    Grows the subgraphs of the given seeds of a CSRGraph. If n_jobs > 1, the seeds are grown in a pool of n_jobs
+    processes, which share the graph in shared memory.
+
+    A seed is pruned, if the given upper bound of its score is below the best score found so far. A seed is pruned as
+    well, if it is part of a subgraph grown before, which cannot grow any further, and if the score of every subgraph
+    grown from the seed is bounded below the best score found so far (see score_bound()). The subgraph of such a seed
+    lies within the closed subgraph, so that it can never be the best subgraph. The seeds with the highest bounds are
+    grown first and among them the seeds with the highest p-values, as their closed subgraphs contain the seeds with
+    lower p-values.
+    :param graph: The CSRGraph.
+    :param seeds: List with the ranks of the seed vertices.
+    :param alpha_max: the significance threshold.
+    :param Z: the maximal number of iterations.
+    :param n_jobs: The number of processes.
+    :param bounds: Array with an upper bound of the score of every seed (e.g. from component_bounds()) or None.
+    :return: list with a tuple (subgraph, score) per seed or None, if the seed was pruned.
+    """
+    if bounds is None:
+        bounds = np.full(len(seeds), np.inf)
+
+    subgraphs = [None] * len(seeds)
+    pending = sorted(range(len(seeds)), key=lambda i: (bounds[i], graph.p[seeds[i]]), reverse=True)
+
+    closed_subgraphs = []
+    best_score = 0
+
+    def add(i, subgraph):
+        nonlocal best_score
+
+        subgraphs[i] = subgraph
+        best_score = max(best_score, subgraph[1])
+
+        if is_closed(graph, seeds[i], subgraph[0], alpha_max):
+            closed_subgraphs.append(np.sort(subgraph[0]))
+
+    def next_seed():
+        while pending:
+            i = pending.pop(0)
+            if bounds[i] < best_score:
+                continue
+            if not any(score_bound(graph, seeds[i], closed, alpha_max) < best_score for closed in closed_subgraphs):
+                return i
+        return None
+
+    if n_jobs == 1:
+        i = next_seed()
+        while i is not None:
+            add(i, grow_max_subgraph_csr(graph, seeds[i], alpha_max, Z))
+            i = next_seed()
+
+        return subgraphs
+
+    blocks, spec = graph.to_shared_memory()
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=attach_shared_graph, initargs=(spec,)) as executor:
+            running = {}
+
+            while True:
+                while len(running) < n_jobs:
+                    i = next_seed()
+                    if i is None:
+                        break
+                    running[executor.submit(grow_shared_seed, seeds[i], alpha_max, Z)] = i
+
+                if not running:
+                    return subgraphs
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    add(running.pop(future), future.result())
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def attach_shared_graph(spec):
+    """
+    Attaches a worker process of grow_seeds() to the graph in shared memory.
+    :param spec: The specification returned by CSRGraph.to_shared_memory().
+    """
+    global _shared_graph
+    _shared_graph = CSRGraph.from_shared_memory(spec)
+
+
+def grow_shared_seed(seed, alpha_max, Z):
+    """
+    Grows the subgraph of the given seed of the graph in shared memory in a worker process of grow_seeds().
+    :param seed: The rank of the seed vertex.
+    :param alpha_max: the significance threshold.
+    :param Z: the maximal number of iterations.
+    :return: tuple (subgraph, score) with the ranks of the vertices in the subgraph.
+    """
+    return grow_max_subgraph_csr(_shared_graph[0], seed, alpha_max, Z)
+
+
+def candidate_limit(graph, seed, alpha_max):
+    """
+    Returns the rank of the first vertex of a CSRGraph, which is never added to the subgraph of the given seed. This is
+    the first vertex with a p-value >= alpha_max or > the p-value of the seed.
+    :param graph: The CSRGraph.
+    :param seed: The rank of the seed vertex.
+    :param alpha_max: the significance threshold.
+    :return: the rank.
+    """
+    return min(np.searchsorted(graph.p, alpha_max, side='left'), np.searchsorted(graph.p, graph.p[seed], side='right'))
+
+
+def is_closed(graph, seed, subgraph, alpha_max):
+    """
+    Checks whether the subgraph of the given seed cannot grow any further, because all its neighbors are either part of
+    it or are never added to it.
+    :param graph: The CSRGraph.
+    :param seed: The rank of the seed vertex.
+    :param subgraph: Array with the ranks of the vertices in the subgraph.
+    :param alpha_max: the significance threshold.
+    :return: True, if the subgraph is closed.
+    """
+    neighbors = graph.neighbors(subgraph)
+    neighbors = neighbors[neighbors < candidate_limit(graph, seed, alpha_max)]
+
+    return bool(np.all(np.isin(neighbors, subgraph)))
+
+
+def component_bounds(graph, labels):
+    """
+    Returns an upper bound of the score of every subgraph within the component of every vertex like score_bound(). A
+    prefix with n_alpha vertices with p-values <= alpha scores at most n_alpha * log(1 / alpha, 2) and n_alpha is at most
+    the number of vertices of the component with a p-value <= alpha.
+    :param graph: The CSRGraph.
+    :param labels: Array with the component of every vertex or -1 for vertices outside all components (see
+        CSRGraph.components()).
+    :return: array with the bound of the component of every vertex and 0 for vertices outside all components.
+    """
+    bounds = np.zeros(len(graph))
+
+    # the vertices grouped by component in ascending order of their ranks
+    vertices = np.flatnonzero(labels >= 0)
+    vertices = vertices[np.argsort(labels[vertices], kind='mergesort')]
+    if len(vertices) == 0:
+        return bounds
+
+    starts = np.flatnonzero(np.concatenate([[True], labels[vertices][1:] != labels[vertices][:-1]]))
+    sizes = np.diff(np.concatenate([starts, [len(vertices)]]))
+    n_alpha = np.arange(1, len(vertices) + 1) - np.repeat(starts, sizes)
+
+    p = graph.p[vertices]
+    with np.errstate(divide='ignore'):
+        values = np.where(p > 0, n_alpha * (np.log(1 / p) / log(2)), 0)
+
+    # relaxed by a small tolerance for rounding errors like in score_bound()
+    bounds[vertices] = np.repeat(np.maximum.reduceat(values, starts), sizes) * (1 + 1e-9) + 1e-9
+
+    return bounds
+
+
+def score_bound(graph, seed, closed_subgraph, alpha_max):
+    """
+    Returns an upper bound of the score of every subgraph grown from the given seed within a closed subgraph. If the
+    seed is part of the closed subgraph, every subgraph grown from it consists of the seed and vertices of the closed
+    subgraph with a lower rank. A prefix with n_alpha vertices with p-values <= alpha scores at most
+    n_alpha * log(1 / alpha, 2), the Berk-Jones statistic for n = n_alpha.
+    :param graph: The CSRGraph.
+    :param seed: The rank of the seed vertex.
+    :param closed_subgraph: Sorted array with the ranks of the vertices in the closed subgraph.
+    :param alpha_max: the significance threshold.
+    :return: the bound or infinity, if the seed is not part of the closed subgraph.
+    """
+    position = np.searchsorted(closed_subgraph, seed)
+    if position == len(closed_subgraph) or closed_subgraph[position] != seed:
+        return np.inf
+
+    R = candidate_limit(graph, seed, alpha_max)
+    p = graph.p[np.union1d(closed_subgraph[closed_subgraph < R], [seed])]
+    n_zero = np.count_nonzero(p == 0)
+    p = p[n_zero:]
+
+    # p is sorted, as the ranks are sorted, and the bound is relaxed by a small tolerance for rounding errors
+    n_alpha = n_zero + np.searchsorted(p, p, side='right')
+    return np.max(n_alpha * (np.log(1 / p) / log(2)), initial=0) * (1 + 1e-9) + 1e-9
+
+
+def grow_max_subgraph_csr(graph, seed, alpha_max, Z):
+    """
+    Grows the subgraph of the given seed vertex of a CSRGraph like grow_max_subgraph(). As the vertices are sorted by
+    p-value, the vertices, which the relaxed problem adds to the subgraph, are exactly the vertices with a rank below
+    candidate_limit().
+    :param graph: The CSRGraph.
+    :param seed: The rank of the seed vertex.
+    :param alpha_max: the significance threshold.
+    :param Z: the maximal number of iterations.
+    :return: tuple (subgraph, score) with the ranks of the vertices in the subgraph.
+    """
+    return grow_limited_subgraph(graph, seed, candidate_limit(graph, seed, alpha_max), Z)
+
+
+def grow_limited_subgraph(graph, seed, R, Z):
+    """
+    Grows the subgraph of the given seed vertex of a CSRGraph by the neighbors with a rank below R.
+    :param graph: The CSRGraph.
+    :param seed: The rank of the seed vertex.
+    :param R: The rank limit of the candidates.
+    :param Z: the maximal number of iterations.
+    :return: tuple (subgraph, score) with the ranks of the vertices in the subgraph.
+    """
+    s = np.array([seed], dtype=np.int64)
+    score = 0
+
+    added = np.zeros(R, dtype=bool)
+    if seed < R:
+        added[seed] = True
+    new = s
+
+    for z in range(Z):
+        g = np.unique(graph.neighbors(new))
+        g = g[g < R]
+        g = g[~added[g]]
+
+        # all candidates have a p-value below the threshold
+        b, score = relaxed_problem_csr(graph.p, np.inf, s, g)
+
+        if len(g) > 0:
+            s = b
+            added[g] = True
+            new = g
+        else:
+            return s, score
+
+    return s, score
+
+
+def relaxed_problem_csr(p, alpha_max, vertices, neighbors):
+    """
+    Solves the relaxed problem like relaxed_problem() for arrays of ranks into the p-values p.
+    :param p: Array with the p-values of all vertices.
+    :param alpha_max: the significance threshold.
+    :param vertices: Array with the ranks of the vertices in the subgraph sorted by ascending p-value.
+    :param neighbors: Array with the ranks of the neighbors sorted by ascending p-value.
+    :return: tuple (subgraph, score) with the merged ranks of the vertices and neighbors and the best score.
+    """
+    vertex_positions, neighbor_positions, score = merge_by_p(p[vertices], p[neighbors], alpha_max)
+
+    subgraph = np.empty(len(vertex_positions) + len(neighbor_positions), dtype=np.int64)
+    subgraph[vertex_positions] = vertices
+    subgraph[neighbor_positions] = neighbors[:len(neighbor_positions)]
+
+    return subgraph, score
+
+
+def merge_by_p(p_vertices, p_neighbors, alpha_max):
+    """
+    Merges the neighbors into the vertices of the subgraph by ascending p-value and computes the best Berk-Jones
+    statistic of all prefixes of the merged vertices at once. Like in the merge loop of the relaxed problem, neighbors
+    with a p-value >= alpha_max are never merged, on ties the neighbors are merged first and the merge stops after the
+    last vertex of the subgraph.
+    :param p_vertices: Array with the p-values of the vertices in the subgraph sorted in ascending order.
+    :param p_neighbors: Array with the p-values of the neighbors sorted in ascending order.
+    :param alpha_max: the significance threshold.
+    :return: tuple (vertex_positions, neighbor_positions, score) with the positions of the vertices and of the merged
+        neighbors (a prefix of the neighbors) in the merged order and the best score.
+    """
+    p_neighbors = p_neighbors[:np.searchsorted(p_neighbors, alpha_max, side='left')]
+    if len(p_vertices) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), 0
+
+    vertex_positions = np.arange(len(p_vertices)) + np.searchsorted(p_neighbors, p_vertices, side='right')
+    neighbor_positions = np.arange(len(p_neighbors)) + np.searchsorted(p_vertices, p_neighbors, side='left')
+    neighbor_positions = neighbor_positions[neighbor_positions < vertex_positions[-1]]
+
+    length = vertex_positions[-1] + 1
+    p_merged = np.empty(length, dtype=np.float64)
+    p_merged[vertex_positions] = p_vertices
+    p_merged[neighbor_positions] = p_neighbors[:len(neighbor_positions)]
+
+    # the number of merged neighbors before every position
+    n_neighbors = np.zeros(length, dtype=np.int64)
+    n_neighbors[neighbor_positions] = 1
+    n_neighbors = np.cumsum(n_neighbors)
+
+    scores = bj_statistics(p_merged, np.arange(1, length + 1), n_neighbors + len(p_vertices))
+
+    return vertex_positions, neighbor_positions, max(0, scores.max())
+
+
 def kl_divergence(a, b):
     if b == 0 or b >= a:
         return 0
@@ -84,39 +538,58 @@ def bj_statistic(alpha, n_alpha, n):
         return n * kl_divergence(n_alpha / n, alpha)
 
 
+def bj_statistics(alpha, n_alpha, n):
+    """
+    Computes the Berk-Jones statistic like bj_statistic() for arrays of the arguments.
+    :param alpha: Array of significance levels.
+    :param n_alpha: Array with the numbers of p-values <= alpha.
+    :param n: Array with the numbers of p-values.
+    :return: array with the statistics.
+    """
+    alpha = np.asarray(alpha, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    a = np.divide(n_alpha, n, out=np.zeros_like(n), where=n > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        kl = np.where(a == 1, np.log(1 / alpha) / log(2),
+                      a * (np.log(a / alpha) / log(2)) + (1 - a) * (np.log((1 - a) / (1 - alpha)) / log(2)))
+        kl = np.where(a == 0, np.log(1 / (1 - alpha)) / log(2), kl)
+        kl = np.where((alpha == 0) | (alpha >= a), 0, kl)
+
+    return n * kl
+
+
 def sort_by_ascending_p(vertices):
     return sorted(vertices, key=lambda v: v[1]["p"], reverse=False)
 
 
 def get_neighbors(p_graph, vertices, seeds):
     seed_indices = {v[0] for v in seeds}
-    return [v for v in vertices if v[0] not in seed_indices and len(set(p_graph.neighbors(v[0])) & seed_indices) != 0]
+    neighbor_indices = {u for v in seed_indices for u in p_graph.neighbors(v)} - seed_indices
+    return [v for v in vertices if v[0] in neighbor_indices]
 
 
 def relaxed_problem(alpha_max, vertices, neighbors):
-    best_subgraph = []
-    best_score = 0
-
-    i = 0
-    j = 0
-    subgraph = []
-
-    while i < len(vertices):
-        if j == len(neighbors) or neighbors[j][1]['p'] >= alpha_max or vertices[i][1]['p'] < neighbors[j][1]['p']:
-            p = vertices[i][1]['p']
-            subgraph.append(vertices[i])
-            i += 1
-        else:
-            p = neighbors[j][1]['p']
-            subgraph.append(neighbors[j])
-            j += 1
+    """
+    Merges the neighbors into the vertices of the subgraph by ascending p-value and scores all prefixes of the merged
+    vertices at once (see merge_by_p()).
+    :param alpha_max: the significance threshold.
+    :param vertices: The vertices of the subgraph sorted by ascending p-value.
+    :param neighbors: The neighbors sorted by ascending p-value.
+    :return: tuple (subgraph, score) with the merged vertices and neighbors and the best score.
+    """
+    p_vertices = np.fromiter((v[1]['p'] for v in vertices), dtype=np.float64, count=len(vertices))
+    p_neighbors = np.fromiter((v[1]['p'] for v in neighbors), dtype=np.float64, count=len(neighbors))
 
-        score = bj_statistic(p, j + i, j + len(vertices))
+    vertex_positions, neighbor_positions, score = merge_by_p(p_vertices, p_neighbors, alpha_max)
 
-        if score >= best_score:
-            best_subgraph, best_score = (subgraph, score)
+    subgraph = [None] * (len(vertex_positions) + len(neighbor_positions))
+    for position, v in zip(vertex_positions.tolist(), vertices):
+        subgraph[position] = v
+    for position, v in zip(neighbor_positions.tolist(), neighbors):
+        subgraph[position] = v
 
-    return best_subgraph, best_score
+    return subgraph, score
 
 
 def create_p_graph(df_edges, df_p):
@@ -136,10 +609,10 @@ def create_p_graph(df_edges, df_p):
     graph = nx.Graph()
 
     for vertex in df_p.itertuples():
-        graph.add_node(n=vertex.name, attr_dict={'type': vertex.type, 'p': vertex.p_value})
+        graph.add_node(vertex.name, type=vertex.type, p=vertex.p_value)
 
     for edge in df_edges.itertuples():
-        graph.add_edge(u=edge.SRC_NAME, v=edge.DST_NAME, attr_dict={'name': edge.E_NAME, 'type': edge.E_TYPE})
+        graph.add_edge(edge.SRC_NAME, edge.DST_NAME, name=edge.E_NAME, type=edge.E_TYPE)
 
     return graph
 
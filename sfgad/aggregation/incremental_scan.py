@@ -0,0 +1,148 @@
+from math import log
+
+import numpy as np
+import pandas as pd
+
+from .csr_graph import CSRGraph
+from .graph_scan import grow_max_subgraph_csr
+
+
+class IncrementalScanner:
+    """
+    Extracts the most anomalous subgraph of every window of a stream like graph_scan.scan(), but reuses the subgraphs
+    grown in the previous window.
+
+    The subgraph of a seed lies within the connected component of the seed among the vertices with a p-value <=
+    alpha_max. If no vertex of this component changed its p-value or its edges since the previous window, the component
+    and thus the subgraph are the same as before, so that only the seeds in changed components are grown again and the
+    work per window depends on the changed region of the graph. Only the previous window is kept, its vertices are
+    matched to the vertices of the next window by their names.
+    """
+
+    def __init__(self, alpha_max, K, Z=None, C=None):
+        """
+        :param alpha_max: the significance threshold.
+        :param K: the number of seed vertices considered per type.
+        :param Z: the number of iterations per seed vertex. If None, it is log2 of the number of vertices of a window.
+        :param C: the vertex types present in the graph.
+        """
+        self.alpha_max = alpha_max
+        self.K = K
+        self.Z = Z
+        self.C = C
+
+        # the names and p-values of the vertices and the edges (by the ranks of their vertices) of the previous window
+        self.names = np.array([], dtype=object)
+        self.p = np.array([], dtype=np.float64)
+        self.edge_keys = np.array([], dtype=np.int64)
+
+        # the subgraphs (as names) of the seeds (by their names) of the previous window
+        self.subgraphs = {}
+        self.last_Z = None
+
+        # the numbers of seeds of the last window, which were grown and reused
+        self.n_grown = 0
+        self.n_reused = 0
+
+    def scan(self, df_edges, df_p):
+        """
+        Extracts the most anomalous subgraph of the next window.
+        :param df_edges: DataFrame of edges in the graph.
+        :param df_p: DataFrame of vertices and their p-values.
+        :return: tuples (subgraph, score) of the most anomalous subgraph with its score.
+        """
+        graph = CSRGraph.from_frames(df_edges, df_p)
+        src, dst = graph.edges()
+
+        dirty = self.changed_vertices(graph, src, dst)
+
+        self.names, self.p, self.edge_keys = graph.names, graph.p, edge_keys_of(src, dst)
+        self.n_grown = 0
+        self.n_reused = 0
+
+        if len(graph) == 0:
+            self.subgraphs = {}
+            return set(), 0
+
+        Z = int(log(len(graph), 2)) if self.Z is None else self.Z
+        C = set(graph.type_order) if self.C is None else self.C
+
+        # the subgraphs cannot be reused, if the number of iterations changed
+        if Z != self.last_Z:
+            self.subgraphs = {}
+        self.last_Z = Z
+
+        # a changed vertex, which is not significant (anymore), can still have split or shrunk the components of its
+        # neighbors
+        significant = graph.p <= self.alpha_max
+        labels = graph.components(significant)
+        dirty_labels = labels[np.concatenate([np.flatnonzero(dirty), graph.neighbors(np.flatnonzero(dirty))])]
+        dirty_components = np.unique(dirty_labels[dirty_labels >= 0])
+
+        subgraphs = {}
+        results = []
+
+        for c in C:
+            typed_vertices = np.flatnonzero(graph.types == c)
+            for seed in typed_vertices[:self.K]:
+                if graph.p[seed] <= self.alpha_max:
+                    name = graph.names[seed]
+
+                    if name in self.subgraphs and labels[seed] not in dirty_components:
+                        subgraphs[name] = self.subgraphs[name]
+                        self.n_reused += 1
+                    else:
+                        subgraph, score = grow_max_subgraph_csr(graph, seed, self.alpha_max, Z)
+                        subgraphs[name] = (list(graph.names[subgraph]), score)
+                        self.n_grown += 1
+
+                    results.append(subgraphs[name])
+
+        self.subgraphs = subgraphs
+
+        return max(results, key=lambda s: s[1], default=([], 0))
+
+    def changed_vertices(self, graph, src, dst):
+        """
+        Finds the vertices, which are new or changed their p-value or their edges since the previous window.
+        :param graph: The CSRGraph of the window.
+        :param src: Array with the lower end vertex of every edge of the window.
+        :param dst: Array with the higher end vertex of every edge of the window.
+        :return: boolean array, which is True for the changed vertices.
+        """
+        # the rank of every vertex in the previous window (-1 for new vertices) and vice versa
+        previous = pd.Index(self.names).get_indexer(graph.names)
+        known = previous >= 0
+        current = np.full(len(self.names), -1, dtype=np.int64)
+        current[previous[known]] = np.flatnonzero(known)
+
+        changed = ~known
+        changed[known] = self.p[previous[known]] != graph.p[known]
+
+        # the edges of the window by the previous ranks of their vertices (the edges of new vertices are new)
+        old_edges = known[src] & known[dst]
+        edge_keys = edge_keys_of(previous[src[old_edges]], previous[dst[old_edges]])
+
+        # the end vertices of the added and removed edges, which are part of the window
+        added = ~old_edges
+        added[old_edges] = ~np.isin(edge_keys, self.edge_keys, assume_unique=True)
+        removed = np.setdiff1d(self.edge_keys, edge_keys, assume_unique=True)
+        ends = current[np.concatenate([removed >> 32, removed & 0xFFFFFFFF])]
+
+        changed[src[added]] = True
+        changed[dst[added]] = True
+        changed[ends[ends >= 0]] = True
+
+        return changed
+
+
+def edge_keys_of(src, dst):
+    """
+    Returns a unique int64 key for every edge based on the ranks of its end vertices.
+    :param src: Array with an end vertex of every edge.
+    :param dst: Array with the other end vertex of every edge.
+    :return: array with the keys in the order of the edges.
+    """
+    src, dst = np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+
+    return (np.minimum(src, dst) << 32) | np.maximum(src, dst)
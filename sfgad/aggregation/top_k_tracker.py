@@ -0,0 +1,140 @@
+import heapq
+import itertools
+
+import numpy as np
+
+
+class TopKTracker:
+    """
+    Keeps the k most anomalous entries (vertex, time_window, p_value) of a stream of p_values, e.g. of the windows of an
+    analyzer. Every vertex is kept at most once with its most anomalous entry, and entries older than the horizon are
+    evicted. An update costs O(log k), as the entries are kept in heaps bounded by k instead of sorting the p_values of
+    whole windows. With a horizon, the k most anomalous entries of every window within the horizon are kept, so that
+    the memory is bounded by O(k * horizon) and the k most anomalous entries of the remaining windows are known, when
+    a window is evicted.
+    """
+
+    def __init__(self, k, horizon=None):
+        """
+        :param k: The maximal number of entries.
+        :param horizon: The number of time windows, for which an entry is kept, or None to keep the entries until they
+        are pushed out.
+        """
+        if k < 1:
+            raise ValueError("The number of entries k must be at least 1.")
+        if horizon is not None and horizon < 1:
+            raise ValueError("The horizon must be at least 1 time window.")
+
+        self.k = k
+        self.horizon = horizon
+
+        # a bucket (entries, heap) per time window within the horizon or a single bucket (key None) without horizon.
+        # The entries map every kept vertex of the bucket to its entry (p_value, time_window, id). The heap orders them
+        # by decreasing p_value (the least anomalous entry first, on ties the older and then the earlier added one).
+        # Entries, which are not kept anymore, are removed lazily from the heap.
+        self.buckets = {}
+
+        self.time_window = None
+        self.ids = itertools.count()
+
+    def __len__(self):
+        return len(self.top())
+
+    def update(self, vertex, time_window, p_value):
+        """
+        Adds the p_value of a vertex in a time window. Missing p_values are ignored.
+        :param vertex: The vertex, e.g. a tuple (name, type).
+        :param time_window: The time window of the p_value.
+        :param p_value: The p_value.
+        """
+        if np.isnan(p_value):
+            return
+
+        self.advance(time_window)
+        if self.is_expired(time_window):
+            return
+
+        entries, heap = self.buckets.setdefault(None if self.horizon is None else time_window, ({}, []))
+
+        # the most anomalous entry of the vertex is kept and on ties the newer one
+        entry = entries.get(vertex)
+        if entry is not None and (entry[0], -entry[1]) <= (p_value, -time_window):
+            return
+
+        if entry is None and len(entries) >= self.k:
+            p_max, window = self.least_anomalous(entries, heap)
+            if (p_max, -window) < (p_value, -time_window):
+                return
+            del entries[heapq.heappop(heap)[3]]
+
+        entry_id = next(self.ids)
+        entries[vertex] = (p_value, time_window, entry_id)
+        heapq.heappush(heap, (-p_value, time_window, entry_id, vertex))
+
+        self.compact(entries, heap)
+
+    def update_many(self, vertices, time_window, p_values):
+        """
+        Adds the p_values of several vertices in a time window.
+        :param vertices: Iterable of vertices.
+        :param time_window: The time window of the p_values.
+        :param p_values: Iterable of p_values.
+        """
+        for vertex, p_value in zip(vertices, p_values):
+            self.update(vertex, time_window, p_value)
+
+    def advance(self, time_window):
+        """
+        Advances the tracker to the given time window and evicts the windows beyond the horizon.
+        :param time_window: The time window.
+        """
+        if self.time_window is not None and time_window <= self.time_window:
+            return
+        self.time_window = time_window
+
+        if self.horizon is not None:
+            for window in [window for window in self.buckets if self.is_expired(window)]:
+                del self.buckets[window]
+
+    def top(self):
+        """
+        Returns the k most anomalous kept entries (one per vertex) from the most anomalous to the least anomalous one.
+        :return: list of tuples (vertex, time_window, p_value).
+        """
+        best = {}
+        for entries, heap in self.buckets.values():
+            for vertex, entry in entries.items():
+                if vertex not in best or (entry[0], -entry[1]) < (best[vertex][0], -best[vertex][1]):
+                    best[vertex] = entry
+
+        entries = sorted(best.items(), key=lambda item: (item[1][0], -item[1][1]))[:self.k]
+
+        return [(vertex, window, p_value) for vertex, (p_value, window, entry_id) in entries]
+
+    def is_expired(self, time_window):
+        return self.horizon is not None and time_window <= self.time_window - self.horizon
+
+    @staticmethod
+    def least_anomalous(entries, heap):
+        """
+        Removes the entries, which are not kept anymore, from the top of the heap of a bucket and returns the least
+        anomalous kept entry.
+        :param entries: The kept entries of the bucket.
+        :param heap: The heap of the bucket.
+        :return: tuple (p_value, time_window) of the entry.
+        """
+        while entries.get(heap[0][3], (None, None, None))[2] != heap[0][2]:
+            heapq.heappop(heap)
+
+        return -heap[0][0], heap[0][1]
+
+    def compact(self, entries, heap):
+        """
+        Rebuilds the heap of a bucket from its kept entries, as soon as it mostly consists of entries, which are not
+        kept anymore, so that the memory stays bounded by O(k) per bucket.
+        :param entries: The kept entries of the bucket.
+        :param heap: The heap of the bucket.
+        """
+        if len(heap) > 2 * self.k + 16:
+            heap[:] = [(-p_value, window, entry_id, vertex) for vertex, (p_value, window, entry_id) in entries.items()]
+            heapq.heapify(heap)
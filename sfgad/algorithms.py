@@ -57,7 +57,7 @@ def hotspot(half_life=10, window_size=24 * 60 * 60, mode='HC', n_jobs=4):
     """
     features_list = [HotSpotFeatures(half_life=half_life, window_size=window_size)]
     observation_gatherer = HistoricSameSelection()
-    weighting_function = ConstantWeight(default_weight=1)
+    weighting_function = ConstantWeight(weight=1)
     probability_estimator = Gaussian()
     if mode == 'HC':
         probability_combiner = SelectedFeatureProbability(feature_position=0)
@@ -87,7 +87,7 @@ def hotspot_modified(half_life=10, window_size=24 * 60 * 60, mode='HC', n_jobs=4
     features_list = [HotSpotFeatures(half_life=half_life, window_size=window_size)]
     observation_gatherer = FallbackSelection(HistoricSameSelection(), HistoricAgeSimilarSelection(),
                                              threshold=2 * half_life)
-    weighting_function = ConstantWeight(default_weight=1)
+    weighting_function = ConstantWeight(weight=1)
     probability_estimator = Gaussian()
     if mode == 'HC':
         probability_combiner = SelectedFeatureProbability(feature_position=0)
@@ -115,7 +115,7 @@ def hotspot_modified(half_life=10, window_size=24 * 60 * 60, mode='HC', n_jobs=4
 #     """
 #     features_list = [DNDFeatures()]
 #     observation_gatherer = HistoricSameSelection()
-#     weighting_function = ConstantWeight(default_weight=1)
+#     weighting_function = ConstantWeight(weight=1)
 #     probability_estimator = Gaussian()
 #     if mode == 'fr':
 #         probability_combiner = SelectedFeatureProbability(feature_position=0)
@@ -144,7 +144,7 @@ def dnd_modified(n_jobs=4):
     """
     features_list = [VertexDegreeDifference()]
     observation_gatherer = FallbackSelection(HistoricSameSelection(), HistoricAgeSimilarSelection(), threshold=20)
-    weighting_function = ConstantWeight(default_weight=1)
+    weighting_function = ConstantWeight(weight=1)
     probability_estimator = Gaussian()
     probability_combiner = SelectedFeatureProbability()
 
@@ -163,7 +163,7 @@ def nphgs(edge_types=tuple('TYPE'), n_jobs=4):
     """
     features_list = [VertexDegreeByType(edge_types=edge_types)]
     observation_gatherer = FallbackSelection(HistoricSameSelection(), HistoricAgeSimilarSelection(), threshold=20)
-    weighting_function = ConstantWeight(default_weight=1)
+    weighting_function = ConstantWeight(weight=1)
     probability_estimator = EmpiricalEstimator()
     probability_combiner = EmpiricalCombiner()
 
@@ -7,6 +7,14 @@ from joblib import Parallel, delayed
 
 from .modules.observation_selection import ExternalSQLDatabase
 from .modules.observation_selection import InMemoryDatabase
+from .modules.observation_selection.helper.database import Database
+from .modules.probability_estimation import EstimatorCache
+from .utils.checkpoint import save_checkpoint, load_checkpoint
+from .utils.instrumentation import NullInstrumentation
+from .utils.interning import Interner
+from .utils.memory import memory_report
+from .utils.observation_block import ObservationBlock, META_COLUMNS
+from .utils.validation import check_observations
 
 
 class SequentialAnalyzer(metaclass=abc.ABCMeta):
@@ -40,7 +48,18 @@ class SequentialAnalyzer(metaclass=abc.ABCMeta):
 
 class Analyzer(SequentialAnalyzer):
     def __init__(self, features_list, observation_selection, weighting_function, probability_estimator,
-                 probability_combiner, db_con=None, threshold=2, n_jobs=1):
+                 probability_combiner, db_con=None, threshold=2, n_jobs=1, top_k_tracker=None, instrumentation=None,
+                 memory_series=None):
+        """
+        :param db_con: Either a Database instance used to store the history, a dictionary with the connection
+        parameters (user, password, host, database, table_name) of an ExternalSQLDatabase, or None to keep the history
+        in memory.
+        :param top_k_tracker: A TopKTracker, which is fed with the p_values of every window by the (name, type) of the
+        vertices, or None.
+        :param instrumentation: An Instrumentation, which measures the stages of every window, or None to disable the
+        measurements.
+        :param memory_series: A MemoryTimeSeries, which records the memory report after every window, or None.
+        """
 
         self.features_list = features_list
         self.observation_selection = observation_selection
@@ -48,107 +67,258 @@ class Analyzer(SequentialAnalyzer):
         self.probability_estimator = probability_estimator
         self.probability_combiner = probability_combiner
 
+        # fit the estimator only once for observations shared by several vertices
+        self.estimator_cache = EstimatorCache(probability_estimator)
+
         self.threshold = threshold
         self.n_jobs = n_jobs
-
-        if db_con:
-            self.db = ExternalSQLDatabase(db_con, [name for f in features_list for name in f.names])
+        self.top_k_tracker = top_k_tracker
+        self.instrumentation = NullInstrumentation() if instrumentation is None else instrumentation
+        self.memory_series = memory_series
+
+        # the names and types of the vertices are interned to int32 codes at ingestion. The codes are only used to
+        # deduplicate the vertices of a window and to join them to their feature values. The features, the weighting
+        # functions (which factorize the types of a block) and the databases with their cohort indexes keep the names
+        # and types as strings, so the codes do not reduce the memory of the history.
+        self.vertex_names = Interner()
+        self.vertex_types = Interner()
+
+        if isinstance(db_con, Database):
+            self.db = db_con
+        elif db_con:
+            self.db = ExternalSQLDatabase(feature_names=[name for f in features_list for name in f.names], **db_con)
         else:
             self.db = InMemoryDatabase([name for f in features_list for name in f.names])
-        self.db = InMemoryDatabase([name for f in features_list for name in f.names])
 
         self.time_window = int(0)
 
     def fit_transform(self, df_edges):
-        feature_df_list = [f.process_vertices(df_edges, self.n_jobs) for f in self.features_list]
+        instrumentation = self.instrumentation
+
+        with instrumentation.window(self.time_window):
+            time = df_edges['TIMESTAMP'].max()
+
+            # Calculate every feature for every vertex and return a list of dataframes with columns
+            # (name, Feature1, ...)
+            feature_df_list = []
+            for f in self.features_list:
+                with instrumentation.stage('features/' + type(f).__name__):
+                    feature_df_list.append(f.process_vertices(df_edges, self.n_jobs))
+
+            # List of all unique vertices in the current edge dataframe
+            with instrumentation.stage('encode_vertices'):
+                complete_df, name_codes = self.encode_vertices(df_edges)
+            instrumentation.count('vertices', len(complete_df))
+
+            # Start p_value calculation for every vertex of the current dataframe
+            with instrumentation.stage('transform_vertices'):
+                p_values_list, p_f_values_list = self.transform_vertices(complete_df, feature_df_list)
+
+            # Add the feature values (joined by the codes of the names) and the feature p_values (in the order of the
+            # vertices) to the complete_df
+            with instrumentation.stage('merge'):
+                p_f_df = pd.DataFrame(p_f_values_list, columns=['name'] + ['p_' + f_name for f in self.features_list
+                                                                           for f_name in f.names])
+                complete_df = pd.concat([complete_df, self.align_features(name_codes, feature_df_list),
+                                         p_f_df.drop(columns='name')], axis=1)
+
+            # Add Time and Time Window
+            complete_df['time'] = time
+            complete_df['time_window'] = self.time_window
+
+            # Feed the p_values to the tracker of the most anomalous vertices (identified by name and type)
+            if self.top_k_tracker is not None:
+                self.top_k_tracker.update_many(zip(complete_df['name'], complete_df['type']), self.time_window,
+                                               (row['p_value'] for row in p_values_list))
+
+            # Save to Database and increase the time window counter
+            with instrumentation.stage('insert_records'):
+                self.update_history(complete_df)
+
+            if self.memory_series is not None:
+                self.memory_series.record(self.time_window, self)
+            self.time_window += 1
+
+        return pd.DataFrame(p_values_list, columns=['name', 'time_window', 'p_value'])
+
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of the internal structures of the analyzer, its
+        features, its database and its estimators.
+        :return: dictionary with the report of every component (e.g. 'features/HotSpotFeatures', 'db'), which is a
+        dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        report = {'analyzer': memory_report(self, ['vertex_names.codes', 'vertex_names.values', 'vertex_types.codes',
+                                                   'vertex_types.values'])}
+
+        for i, f in enumerate(self.features_list):
+            component = 'features/' + type(f).__name__
+            if component in report:
+                component += '/%d' % i
+            report[component] = f.memory_report()
 
-        time = df_edges['TIMESTAMP'].max()
+        report['db'] = self.db.memory_report()
+        report['estimator'] = self.probability_estimator.memory_report()
+        report['estimator_cache'] = self.estimator_cache.memory_report()
 
-        # Calculate every feature for every vertex and return a list of dataframes with columns (name, Feature1, ...)
-        feature_df_list = [f.process_vertices(df_edges, self.n_jobs) for f in self.features_list]
+        if self.top_k_tracker is not None:
+            report['top_k_tracker'] = memory_report(self.top_k_tracker, ['buckets'])
 
-        # List of all unique vertices in the current edge dataframe
-        # complete_df = pd.DataFrame(unique_vertices(df_edges), columns=['name', 'type', 'age'])
-        # complete_df['age'] = self.db.calculate_age(complete_df, self.time_window)
+        return report
 
-        complete_df = pd.DataFrame(unique_vertices(df_edges), columns=['name', 'type'])
+    def save_checkpoint(self, path, incremental=False):
+        """
+        Writes the state of the analyzer (history, first occurrences, time window and feature states) to a checkpoint.
+        :param path: The checkpoint directory.
+        :param incremental: True, if only the changes since the last snapshot in the directory should be written.
+        """
+        save_checkpoint(self, path, incremental=incremental)
+
+    def load_checkpoint(self, path):
+        """
+        Restores the state of the analyzer from a checkpoint written by an analyzer with the same features.
+        :param path: The checkpoint directory.
+        """
+        load_checkpoint(self, path)
 
-        # Start p_value calculation for every vertex of the current dataframe
-        # The p_value calculation might be split into separated processes
+    def update_history(self, records):
+        """
+        Saves the records of the current window to the database.
+        :param records: Dataframe with the meta information, feature values and feature p_values of every vertex.
+        """
+        self.db.insert_records(records)
+
+    def transform_vertices(self, vertices, feature_df_list):
+        """
+        Calculates the p_values of all given vertices. The calculation might be split into separated processes, whose
+        measurements are added to the instrumentation.
+        :param vertices: Dataframe with the columns (name, type) of the vertices to analyse.
+        :param feature_df_list: List of dataframes with the columns (name, Feature1, ...) of the current window.
+        :return: tuple of the row entries for the p_value dataframe and for the feature p_value dataframe.
+        """
         if self.n_jobs > 1:
-            vertices_split = np.array_split(complete_df, self.n_jobs)
+            vertices_split = np.array_split(vertices, self.n_jobs)
 
             results = Parallel(n_jobs=self.n_jobs)(
-                delayed(self.transform_vertices_list)(vertices, feature_df_list)
+                delayed(self.transform_vertices_worker)(vertices, feature_df_list)
                 for vertices in vertices_split)
 
-            p_values_list, p_f_values_list = zip(*list(results))
+            p_values_list, p_f_values_list, totals_list = zip(*list(results))
             p_values_list = list(itertools.chain.from_iterable(p_values_list))
             p_f_values_list = list(itertools.chain.from_iterable(p_f_values_list))
+            for totals in totals_list:
+                self.instrumentation.merge(totals)
         else:
-            p_values_list, p_f_values_list = self.transform_vertices_list(complete_df, feature_df_list)
+            p_values_list, p_f_values_list = self.transform_vertices_list(vertices, feature_df_list)
 
-        # Add the data frames from feature calculation to the complete_df
-        for index, feature_df in enumerate(feature_df_list):
-            complete_df = pd.merge(complete_df, feature_df, on='name')
-
-        p_f_df = pd.DataFrame(p_f_values_list,
-                              columns=['name'] + ['p_' + f_name for f in self.features_list for f_name in f.names])
-        complete_df = pd.merge(complete_df, p_f_df, on='name')
-
-        # Add Time and Time Window
-        complete_df['time'] = time
-        complete_df['time_window'] = self.time_window
+        return p_values_list, p_f_values_list
 
-        # Save to Database and increase the time window counter
-        self.db.insert_records(complete_df)
-        self.time_window += 1
+    def transform_vertices_worker(self, vertices, feature_df_list):
+        """
+        Calculates the p_values of the given vertices in a worker process, which measures its stages with a new
+        instrumentation, as the instrumentation of the analyzer is a copy without sinks in the worker.
+        :param vertices: Dataframe with the columns (name, type) of the vertices to analyse.
+        :param feature_df_list: List of dataframes with the columns (name, Feature1, ...) of the current window.
+        :return: tuple of the row entries for the p_value dataframe, for the feature p_value dataframe and the totals
+        of the instrumentation.
+        """
+        instrumentation = self.instrumentation.fork()
+        p_values_list, p_f_values_list = self.transform_vertices_list(vertices, feature_df_list, instrumentation)
 
-        return pd.DataFrame(p_values_list, columns=['name', 'time_window', 'p_value'])
+        return p_values_list, p_f_values_list, instrumentation.totals()
 
-    def transform_vertices_list(self, vertices, feature_df_list):
+    def transform_vertices_list(self, vertices, feature_df_list, instrumentation=None):
 
         # A list to hold the row entries for the final p_value dataframe
         p_values_list = []
         p_f_values_list = []
 
-        features = vertices[['name']]
-
-        # Add the data frames from feature calculation to the feature dataframe
-        for index, feature_df in enumerate(feature_df_list):
-            features = pd.merge(features, feature_df, on='name')
-
-        features_grouped = features.groupby('name')
-
-        # Get dataframe with all relevant rows from database
-        for v in vertices.itertuples(index=False):
-            observations = self.observation_selection.gather(v.name, v.type, self.time_window, self.db)
+        # The stages of the modules are named by their classes
+        if instrumentation is None:
+            instrumentation = self.instrumentation
+        gather_stage = 'gather/' + type(self.observation_selection).__name__
+        weighting_stage = 'weighting/' + type(self.weighting_function).__name__
+        estimation_stage = 'estimation/' + type(self.probability_estimator).__name__
+        combination_stage = 'combination/' + type(self.probability_combiner).__name__
+
+        feature_names = [name for f in self.features_list for name in f.names]
+        p_feature_names = ['p_' + name for name in feature_names]
+
+        # The feature values of all vertices are joined by the codes of their names and validated once per window
+        features = self.align_features(self.vertex_names.encode(vertices['name']), feature_df_list)
+        current_features = check_observations(features[feature_names], n_features=len(feature_names))
+
+        # Rules with a block of observations shared by several vertices are estimated with one fit per block, all other
+        # rules get the relevant rows from database for all vertices at once. The observations are converted to typed
+        # blocks once and only sliced per vertex.
+        shared_blocks = hasattr(self.observation_selection, 'reference_block')
+        if not shared_blocks:
+            with instrumentation.stage(gather_stage):
+                gathered = self.observation_selection.gather_many(vertices, self.time_window, self.db)
+                gathered_block = self.observation_block(gathered.rows, feature_names, p_feature_names)
+        observation_blocks = {}
+        block_weights = {}
+
+        for i, v in enumerate(vertices.itertuples(index=False)):
+            current_meta_info = pd.Series({'time_window': self.time_window, 'type': v.type})
+
+            if shared_blocks:
+                with instrumentation.stage(gather_stage):
+                    block, mask = self.observation_selection.reference_block(v.name, v.type, self.time_window,
+                                                                             self.db)
+                n_observations = int(np.count_nonzero(mask))
+            else:
+                start, end = gathered.offsets[i], gathered.offsets[i + 1]
+                n_observations = int(end - start)
+            instrumentation.count('gathered_rows', n_observations)
+            instrumentation.observe('gathered_rows', n_observations)
 
-            if observations.shape[0] < self.threshold:
+            if n_observations < self.threshold:
                 p_value = np.nan
-                feature_probabilities = [np.nan for f in self.features_list for name in f.names]
+                feature_probabilities = [np.nan for name in feature_names]
             else:
-                reference_features = observations[
-                    [name for f in self.features_list for name in f.names]]
-
-                # Get list of weights for every window
-                weights = self.weighting_function.compute(reference_features,
-                                                          pd.Series({'time_window': self.time_window, 'type': v.type}))
-
-                # Get a list of calculated p_values for every feature
-                feature_probabilities = self.probability_estimator.estimate(
-                    features_grouped.get_group(v.name)[[name for f in self.features_list for name in f.names]],
-                    reference_features, weights)
-
-                reference_feature_probabilities = observations[
-                    ['name', 'time_window'] + ['p_' + name for f in self.features_list for name in f.names]]
+                if shared_blocks:
+                    # Convert every block only once
+                    if id(block) not in observation_blocks or observation_blocks[id(block)][0] is not block:
+                        observation_blocks[id(block)] = (block, self.observation_block(block, feature_names,
+                                                                                       p_feature_names))
+                    features_block, p_features_block = observation_blocks[id(block)][1]
+
+                    # Get list of weights for every window (once per block and type)
+                    key = (id(block), v.type)
+                    if key not in block_weights or block_weights[key][0] is not block:
+                        with instrumentation.stage(weighting_stage):
+                            block_weights[key] = (block, np.asarray(self.weighting_function.compute(
+                                features_block, current_meta_info), dtype=np.float64))
+
+                    # Get a list of calculated p_values for every feature
+                    with instrumentation.stage(estimation_stage):
+                        feature_probabilities = self.estimator_cache.estimate(
+                            current_features[i:i + 1], features_block, feature_names, block_weights[key][1], mask)[0]
+
+                    reference_feature_probabilities = p_features_block[mask]
+                else:
+                    features_block, p_features_block = gathered_block
+                    reference_features = features_block[start:end]
+
+                    # Get list of weights for every window
+                    with instrumentation.stage(weighting_stage):
+                        weights = self.weighting_function.compute(reference_features, current_meta_info)
+
+                    # Get a list of calculated p_values for every feature
+                    with instrumentation.stage(estimation_stage):
+                        feature_probabilities = self.probability_estimator.estimate(current_features[i:i + 1],
+                                                                                    reference_features, weights)[0]
+
+                    reference_feature_probabilities = p_features_block[start:end]
 
                 # Combine the multiple p_values into a single p_value for the vertex
-                p_value = self.probability_combiner.combine(feature_probabilities, reference_feature_probabilities)[0]
+                with instrumentation.stage(combination_stage):
+                    p_value = self.probability_combiner.combine(feature_probabilities,
+                                                                reference_feature_probabilities)[0]
 
-            p_f_df_row = dict({'name': v.name}, **{'p_' + f: p_f_value for f, p_f_value in
-                                                   zip([f_name for f in self.features_list for f_name in f.names],
-                                                       feature_probabilities)})
+            p_f_df_row = dict({'name': v.name}, **{p_name: p_f_value for p_name, p_f_value in
+                                                   zip(p_feature_names, feature_probabilities)})
             p_f_values_list.append(p_f_df_row)
 
             # Generate a new row entry
@@ -157,17 +327,61 @@ class Analyzer(SequentialAnalyzer):
 
         return p_values_list, p_f_values_list
 
+    def encode_vertices(self, df_edges):
+        """
+        Interns the names and types of all vertices of the given edges and returns the unique vertices in the order of
+        their first occurrence.
+        :param df_edges: The edge_frame of the current window.
+        :return: tuple of a dataframe with the columns (name, type) of the unique vertices and the codes of their names.
+        """
+        name_codes = self.vertex_names.encode(np.concatenate([df_edges['SRC_NAME'].values,
+                                                              df_edges['DST_NAME'].values]))
+        type_codes = self.vertex_types.encode(np.concatenate([df_edges['SRC_TYPE'].values,
+                                                              df_edges['DST_TYPE'].values]))
 
-## HELPER
+        # deduplicate the vertices by a single integer key of their name and type
+        keys = name_codes.astype(np.int64) * len(self.vertex_types) + type_codes
+        first = np.sort(np.unique(keys, return_index=True)[1])
 
-def unique_vertices(df_edges):
-    df_src = df_edges[['SRC_NAME', 'SRC_TYPE']]
-    df_dst = df_edges[['DST_NAME', 'DST_TYPE']]
+        vertices = pd.DataFrame({'name': self.vertex_names.decode(name_codes[first]),
+                                 'type': self.vertex_types.decode(type_codes[first])})
 
-    df_src.columns = ['name', 'type']
-    df_dst.columns = ['name', 'type']
+        return vertices, name_codes[first]
 
-    df_vertices = pd.concat([df_src, df_dst])
-    df_vertices = df_vertices.drop_duplicates()
+    def align_features(self, name_codes, feature_df_list):
+        """
+        Joins the feature values of the current window to the vertices with the given codes of their names. Vertices of
+        different types may have the same name and thereby the same feature values.
+        :param name_codes: The codes of the names of the vertices.
+        :param feature_df_list: List of dataframes with the columns (name, Feature1, ...) of the current window.
+        :return: Dataframe with the feature values (columns Feature1, ...) of every vertex.
+        """
+        aligned = []
+        for feature_df in feature_df_list:
+            # look up the row of every vertex by the codes of the names in the feature dataframe (the last row of a
+            # name wins)
+            codes = pd.Index(self.vertex_names.encode(feature_df['name']))
+            if not codes.is_unique:
+                feature_df = feature_df[~codes.duplicated(keep='last')]
+                codes = codes[~codes.duplicated(keep='last')]
+            rows = codes.get_indexer(name_codes)
+
+            aligned.append(feature_df.drop(columns='name').reset_index(drop=True).reindex(rows)
+                           .reset_index(drop=True))
+
+        return pd.concat(aligned, axis=1)
+
+    @staticmethod
+    def observation_block(observations, feature_names, p_feature_names):
+        """
+        Converts the given observations to typed blocks of their feature values and of their feature p_values.
+        :param observations: Dataframe with the meta information, feature values and feature p_values of observations.
+        :param feature_names: The names of the features.
+        :param p_feature_names: The names of the feature p_values.
+        :return: tuple of the block of feature values and the block of feature p_values.
+        """
+        # the feature p_values are missing, as long as the database is empty
+        block = ObservationBlock.from_frame(observations.reindex(columns=META_COLUMNS + feature_names + p_feature_names),
+                                           feature_names + p_feature_names)
 
-    return df_vertices
+        return block.select(feature_names), block.select(p_feature_names)
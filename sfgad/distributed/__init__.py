@@ -0,0 +1,2 @@
+from .coordinator import DistributedAnalyzer
+from .worker import Worker, start_local_workers
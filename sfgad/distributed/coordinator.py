@@ -0,0 +1,137 @@
+import itertools
+import socket
+
+import numpy as np
+
+from sfgad.analyzer import Analyzer
+from .protocol import INIT, WINDOW, RESULT, INSERT, SHUTDOWN, ERROR, ACK, send_message, receive_message
+
+
+class DistributedAnalyzer(Analyzer):
+    """
+    An analyzer, which acts as coordinator for several workers on (possibly) different hosts.
+    The features are computed by the coordinator. The vertices of every window are split into shards and the p_values
+    of every shard are calculated by a separate worker. Afterwards, the records of the window are broadcast to all
+    workers, so that every worker holds a replica of the history. Every request is answered by the worker, so that a
+    failure of a worker is raised by the coordinator. The messages are authenticated by a key shared with the workers.
+    """
+
+    def __init__(self, features_list, observation_selection, weighting_function, probability_estimator,
+                 probability_combiner, workers, key, db_con=None, threshold=2, n_jobs=1, top_k_tracker=None,
+                 instrumentation=None, memory_series=None):
+        """
+        :param workers: List of (host, port) tuples of running workers.
+        :param key: The key (bytes) shared with the workers.
+        :param n_jobs: Number of jobs used by the coordinator and by every worker.
+        :param instrumentation: An Instrumentation, which measures the stages of every window (including the stages of
+        the workers), or None to disable the measurements.
+        """
+        super().__init__(features_list, observation_selection, weighting_function, probability_estimator,
+                         probability_combiner, db_con=db_con, threshold=threshold, n_jobs=n_jobs,
+                         top_k_tracker=top_k_tracker, instrumentation=instrumentation, memory_series=memory_series)
+
+        if len(workers) == 0:
+            raise ValueError("The distributed analyzer needs at least one worker.")
+        if not key:
+            raise ValueError("The distributed analyzer needs a non-empty shared key.")
+
+        self.workers = list(workers)
+        self.key = key
+        self.connections = []
+
+    def connect(self):
+        """
+        Connects to all workers and initializes them with the pipeline modules and the current history.
+        """
+
+        config = {'features_list': self.features_list,
+                  'observation_selection': self.observation_selection,
+                  'weighting_function': self.weighting_function,
+                  'probability_estimator': self.probability_estimator,
+                  'probability_combiner': self.probability_combiner,
+                  'threshold': self.threshold,
+                  'n_jobs': self.n_jobs,
+                  'instrumentation': self.instrumentation.fork(),
+                  'history': self.db.select_all()}
+
+        for host, port in self.workers:
+            conn = socket.create_connection((host, port))
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            send_message(conn, self.key, INIT, config)
+            self.connections.append(conn)
+
+        for conn in self.connections:
+            self.receive_reply(conn, ACK)
+
+    def close(self, shutdown_workers=False):
+        """
+        Closes the connections to all workers.
+        :param shutdown_workers: True, if the workers should terminate after the connection is closed.
+        """
+
+        for conn in self.connections:
+            if shutdown_workers:
+                send_message(conn, self.key, SHUTDOWN)
+            conn.close()
+
+        self.connections = []
+
+    def update_history(self, records):
+        """
+        Saves the records of the current window to the database and broadcasts them to all workers.
+        :param records: Dataframe with the meta information, feature values and feature p_values of every vertex.
+        """
+        super().update_history(records)
+
+        # all workers insert the records in parallel
+        for conn in self.connections:
+            send_message(conn, self.key, INSERT, records)
+        for conn in self.connections:
+            self.receive_reply(conn, ACK)
+
+    def transform_vertices(self, vertices, feature_df_list):
+        """
+        Calculates the p_values of all given vertices by distributing them over the workers.
+        :param vertices: Dataframe with the columns (name, type) of the vertices to analyse.
+        :param feature_df_list: List of dataframes with the columns (name, Feature1, ...) of the current window.
+        :return: tuple of the row entries for the p_value dataframe and for the feature p_value dataframe.
+        """
+
+        if not self.connections:
+            self.connect()
+
+        vertices_split = np.array_split(vertices, len(self.connections))
+
+        # send all shards first, so that the workers compute in parallel
+        for conn, shard in zip(self.connections, vertices_split):
+            shard_names = shard['name']
+            shard_feature_df_list = [feature_df[feature_df['name'].isin(shard_names)] for feature_df in
+                                     feature_df_list]
+            send_message(conn, self.key, WINDOW, (self.time_window, shard, shard_feature_df_list))
+
+        results = [self.receive_reply(conn, RESULT) for conn in self.connections]
+
+        p_values_list, p_f_values_list, totals_list = zip(*results)
+        p_values_list = list(itertools.chain.from_iterable(p_values_list))
+        p_f_values_list = list(itertools.chain.from_iterable(p_f_values_list))
+        for totals in totals_list:
+            self.instrumentation.merge(totals)
+
+        return p_values_list, p_f_values_list
+
+    def receive_reply(self, conn, expected_type):
+        """
+        Receives the reply of a single worker to a request.
+        :param conn: The connection to the worker.
+        :param expected_type: The type of the reply to a successful request, i.e. RESULT or ACK.
+        :return: the payload of the reply.
+        """
+
+        message_type, payload = receive_message(conn, self.key)
+
+        if message_type == ERROR:
+            raise RuntimeError("A worker failed to process a request:\n%s" % payload)
+        if message_type != expected_type:
+            raise ConnectionError("The connection to a worker was lost.")
+
+        return payload
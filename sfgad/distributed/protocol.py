@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+import pickle
+import struct
+
+# message types exchanged between the coordinator and the workers
+INIT = 1
+WINDOW = 2
+RESULT = 3
+INSERT = 4
+SHUTDOWN = 5
+ERROR = 6
+ACK = 7
+
+# every message starts with a fixed-size header: the message type and the length of the payload in bytes
+HEADER = struct.Struct('!BQ')
+
+# the header is followed by its HMAC-SHA256 digest under the shared key (so that the length is only trusted after it was
+# authenticated) and the payload by the digest of the header and the payload
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+class AuthenticationError(ConnectionError):
+    """
+    Raised, if a received message is not authenticated by the shared key.
+    """
+
+
+def encode_message(key, message_type, payload=None):
+    """
+    Encodes a message into its binary representation.
+    The payload is serialized with the highest pickle protocol, so numpy arrays and dataframes are written as raw
+    buffers. As unpickling can run arbitrary code, every message is authenticated by an HMAC under a key shared by the
+    coordinator and the workers, which is checked before the payload is unpickled.
+    :param key: The shared key (bytes).
+    :param message_type: The type of the message.
+    :param payload: The payload of the message.
+    :return: the encoded message.
+    """
+
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    header = HEADER.pack(message_type, len(data))
+
+    return header + digest(key, header) + data + digest(key, header + data)
+
+
+def send_message(sock, key, message_type, payload=None):
+    """
+    Sends a message over the given socket.
+    :param sock: The connected socket.
+    :param key: The shared key (bytes).
+    :param message_type: The type of the message.
+    :param payload: The payload of the message.
+    """
+
+    sock.sendall(encode_message(key, message_type, payload))
+
+
+def receive_message(sock, key):
+    """
+    Receives a single message from the given socket.
+    :param sock: The connected socket.
+    :param key: The shared key (bytes).
+    :return: tuple (message_type, payload), or (None, None) if the connection was closed by the other side.
+    """
+
+    header = receive_exactly(sock, HEADER.size)
+    if header is None:
+        return None, None
+
+    header = bytes(header)
+    authenticate(key, header, receive_exactly(sock, DIGEST_SIZE))
+    message_type, length = HEADER.unpack(header)
+
+    data = receive_exactly(sock, length)
+    if data is None:
+        raise ConnectionError("The connection was closed in the middle of a message.")
+    data = bytes(data)
+    authenticate(key, header + data, receive_exactly(sock, DIGEST_SIZE))
+
+    return message_type, pickle.loads(data)
+
+
+def digest(key, data):
+    """
+    Returns the HMAC-SHA256 digest of the given data under the given key.
+    :param key: The shared key (bytes).
+    :param data: The data.
+    :return: the digest.
+    """
+
+    return hmac.new(key, data, hashlib.sha256).digest()
+
+
+def authenticate(key, data, received_digest):
+    """
+    Checks the received digest of the given data.
+    :param key: The shared key (bytes).
+    :param data: The data.
+    :param received_digest: The received digest or None, if the connection was closed before it arrived.
+    """
+
+    if received_digest is None:
+        raise ConnectionError("The connection was closed in the middle of a message.")
+    if not hmac.compare_digest(bytes(received_digest), digest(key, data)):
+        raise AuthenticationError("The message is not authenticated by the shared key.")
+
+
+def receive_exactly(sock, n_bytes):
+    """
+    Reads exactly n_bytes from the given socket.
+    :param sock: The connected socket.
+    :param n_bytes: The number of bytes to read.
+    :return: the bytes read, or None if the connection was closed before the first byte arrived.
+    """
+
+    buffer = bytearray(n_bytes)
+    view = memoryview(buffer)
+    n_received = 0
+
+    while n_received < n_bytes:
+        n = sock.recv_into(view[n_received:], n_bytes - n_received)
+        if n == 0:
+            if n_received == 0:
+                return None
+            raise ConnectionError("The connection was closed in the middle of a message.")
+        n_received += n
+
+    return buffer
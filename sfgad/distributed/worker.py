@@ -0,0 +1,189 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import traceback
+
+from sfgad.analyzer import Analyzer
+from .protocol import INIT, WINDOW, RESULT, INSERT, SHUTDOWN, ERROR, ACK, send_message, receive_message
+
+# the environment variable, from which the command line worker reads the shared key
+KEY_VARIABLE = 'SFGAD_WORKER_KEY'
+
+
+class Worker:
+    """
+    A worker runs the per-vertex pipeline (observation selection, weighting, probability estimation and probability
+    combination) for the vertex shards assigned by a coordinator. It keeps a replica of the history database, which is
+    kept up to date by the records the coordinator broadcasts after every window.
+    Only messages authenticated by the key shared with the coordinator are accepted, a connection sending any other
+    message is closed.
+    """
+
+    def __init__(self, key, host='127.0.0.1', port=0):
+        """
+        :param key: The key (bytes) shared with the coordinator.
+        :param host: The host the worker listens on.
+        :param port: The port the worker listens on. If 0, a free port is chosen.
+        """
+        if not key:
+            raise ValueError("The worker needs a non-empty shared key.")
+
+        self.key = key
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(1)
+
+        # the address the worker is listening on (the port is assigned by the OS if port=0)
+        self.address = self.socket.getsockname()
+
+        self.analyzer = None
+
+    def serve(self):
+        """
+        Serves coordinator sessions one after another until a coordinator requests the shutdown of the worker.
+        """
+
+        try:
+            while True:
+                conn, _ = self.socket.accept()
+                with conn:
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    try:
+                        if not self.handle_session(conn):
+                            break
+                    except ConnectionError:
+                        # e.g. a message, which is not authenticated, or a broken connection ends only the session
+                        continue
+        finally:
+            self.socket.close()
+
+    def handle_session(self, conn):
+        """
+        Handles the messages of a single coordinator session.
+        :param conn: The connection to the coordinator.
+        :return: False, if the coordinator requested the shutdown of the worker, True otherwise.
+        """
+
+        while True:
+            message_type, payload = receive_message(conn, self.key)
+
+            if message_type is None:
+                return True
+            elif message_type == SHUTDOWN:
+                return False
+
+            # every request is answered by exactly one message, so that the replies stay in order
+            try:
+                if message_type == INIT:
+                    self.init_analyzer(payload)
+                    send_message(conn, self.key, ACK)
+                elif message_type == WINDOW:
+                    send_message(conn, self.key, RESULT, self.transform_window(*payload))
+                elif message_type == INSERT:
+                    self.insert_records(payload)
+                    send_message(conn, self.key, ACK)
+                else:
+                    raise ValueError("Received a message of unknown type %d." % message_type)
+            except Exception:
+                send_message(conn, self.key, ERROR, traceback.format_exc())
+
+    def init_analyzer(self, config):
+        """
+        Creates the local analyzer from the configuration sent by the coordinator.
+        :param config: Dictionary with the pipeline modules, the parameters, the (forked) instrumentation and the history
+        of the coordinator.
+        """
+
+        history = config.pop('history')
+
+        self.analyzer = Analyzer(**config)
+
+        if len(history) > 0:
+            self.analyzer.update_history(history)
+
+    def insert_records(self, records):
+        """
+        Adds the records broadcast by the coordinator to the replica of the history.
+        :param records: Dataframe with the meta information, feature values and feature p_values of every vertex.
+        """
+
+        if self.analyzer is None:
+            raise ValueError("The worker has not been initialized by a coordinator.")
+
+        self.analyzer.update_history(records)
+
+    def transform_window(self, time_window, vertices, feature_df_list):
+        """
+        Calculates the p_values of the given vertex shard.
+        :param time_window: The current time window of the coordinator.
+        :param vertices: Dataframe with the columns (name, type) of the vertices to analyse.
+        :param feature_df_list: List of dataframes with the feature values of the given vertices.
+        :return: tuple of the row entries for the p_value dataframe, for the feature p_value dataframe and the totals
+        of the instrumentation, which are added to the window of the coordinator.
+        """
+
+        if self.analyzer is None:
+            raise ValueError("The worker has not been initialized by a coordinator.")
+
+        self.analyzer.time_window = time_window
+
+        # every window is measured by a new instrumentation, whose totals are returned to the coordinator
+        self.analyzer.instrumentation = self.analyzer.instrumentation.fork()
+        p_values_list, p_f_values_list = self.analyzer.transform_vertices(vertices, feature_df_list)
+
+        return p_values_list, p_f_values_list, self.analyzer.instrumentation.totals()
+
+
+def run_worker(key, host, port, queue=None):
+    """
+    Runs a worker until it is shut down by a coordinator.
+    :param key: The key (bytes) shared with the coordinator.
+    :param host: The host the worker listens on.
+    :param port: The port the worker listens on. If 0, a free port is chosen.
+    :param queue: Optional queue, the address of the worker is reported to.
+    """
+
+    worker = Worker(key, host, port)
+
+    if queue is not None:
+        queue.put(worker.address)
+
+    worker.serve()
+
+
+def start_local_workers(n_workers, key, host='127.0.0.1'):
+    """
+    Starts the given number of workers as separate processes on the local machine.
+    :param n_workers: The number of workers to start.
+    :param key: The key (bytes) shared with the coordinator, e.g. os.urandom(32).
+    :param host: The host the workers listen on.
+    :return: tuple (processes, addresses) of the started worker processes and their addresses.
+    """
+
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+
+    processes = [context.Process(target=run_worker, args=(key, host, 0, queue), daemon=True) for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+
+    # the workers report their addresses in the order they are ready, so they are sorted by port
+    addresses = sorted(queue.get(timeout=60) for _ in range(n_workers))
+
+    return processes, addresses
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs a SFGAD worker. The key shared with the coordinator is read from '
+                                                 'the environment variable %s.' % KEY_VARIABLE)
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='the host the worker listens on, e.g. 0.0.0.0 to accept coordinators on other hosts')
+    parser.add_argument('--port', type=int, default=5400, help='the port the worker listens on')
+    args = parser.parse_args()
+
+    if not os.environ.get(KEY_VARIABLE):
+        parser.error("The environment variable %s with the shared key is not set." % KEY_VARIABLE)
+
+    run_worker(os.environ[KEY_VARIABLE].encode(), args.host, args.port)
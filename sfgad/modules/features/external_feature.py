@@ -14,6 +14,9 @@ class ExternalFeature(Feature):
     nodes as keys and lists of measured data (time, value) as values.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self, values_dict):
         self.names = ['ExternalFeature']
 
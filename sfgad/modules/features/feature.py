@@ -1,7 +1,14 @@
 import abc
 
+from sfgad.utils.memory import memory_report
+
 
 class Feature(metaclass=abc.ABCMeta):
+    # the version of the state, which a stateful feature increases whenever its state changes (i.e. in process_vertices
+    # and reset), so that incremental checkpoints only write the features, whose state changed. The state of a feature
+    # without version (None) is compared by a digest of the pickled feature.
+    version = None
+
     @abc.abstractmethod
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
         """
@@ -30,3 +37,11 @@ class Feature(metaclass=abc.ABCMeta):
         Resets the feature to its initial state.
         This is especially relevant for dynamic features that preserve an internal state.
         """
+
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of every internal structure of the feature. By
+        default, all attributes holding containers, arrays or dataframes are reported.
+        :return: dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        return memory_report(self, exclude=['names'])
@@ -3,6 +3,8 @@ from collections import defaultdict, deque
 
 import pandas as pd
 
+from sfgad.utils.memory import memory_report
+
 
 class HotSpotInterpreter:
     """
@@ -36,6 +38,14 @@ class HotSpotInterpreter:
         self.fit_buffer = deque(maxlen=2)
         self.fit_buffer.append((pd.Timestamp.min, 0, {}, defaultdict(list)))
 
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of the node mappings, the frequencies, the
+        neighbors and the fit buffer.
+        :return: dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        return memory_report(self)
+
     def interpret(self, df_edges):
         """
         Interprets the given edge_frame by: registering new nodes; updating the node neighbors; updating the edge
@@ -54,7 +64,7 @@ class HotSpotInterpreter:
 
         # update the current time
         if not df_edges.empty:
-            assert (min(df_edges["TIMESTAMP"]) - current_time).total_seconds() >= 0
+            assert min(df_edges["TIMESTAMP"]) >= current_time
             current_time = max(df_edges["TIMESTAMP"])
 
         # interpret the new edges
@@ -17,6 +17,8 @@ class HotSpotFeatures(Feature):
     matrix.
     """
 
+    version = 0
+
     def __init__(self, half_life=3, window_size=10):
         # the names of the features
         self.names = ["CorrelationChange", "MagnitudeChange"]
@@ -37,6 +39,7 @@ class HotSpotFeatures(Feature):
         self.prev_timestamps = deque(maxlen=self.half_life)
 
     def reset(self):
+        self.version += 1
         self.interpreter = HotSpotInterpreter(self.decay_lambda, self.half_life)
 
         # the age of the nodes
@@ -48,6 +51,13 @@ class HotSpotFeatures(Feature):
 
         self.prev_timestamps = deque(maxlen=self.half_life)
 
+    def memory_report(self):
+        report = super().memory_report()
+        report.update({'interpreter.' + name: structure_footprint
+                       for name, structure_footprint in self.interpreter.memory_report().items()})
+
+        return report
+
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
         """
         Iterates over the current data frame and calculates for each vertex the features CorrelationChange and
@@ -60,6 +70,9 @@ class HotSpotFeatures(Feature):
             feature values for all vertices in the given df_edges.
         """
 
+        # the state changes with every window
+        self.version += 1
+
         self.update_activity = update_activity
 
         # interpret the edges and return the names of the active nodes in df_edges and the current time
@@ -10,6 +10,9 @@ class IncidentTriangles(Feature):
     The feature IncidentTriangles of a single vertex is defined as the count of edges between the adjacent vertices.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self):
         self.names = ['IncidentTriangles']
 
@@ -14,6 +14,9 @@ class IncidentTrianglesByType(Feature):
     type in the current time step.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self, edge_types):
         self.names = ['IncidentTrianglesBy' + str(edge_type) for edge_type in edge_types]
         self.edge_types = edge_types
@@ -11,6 +11,9 @@ class TwoHopReach(Feature):
     vertex.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self):
         self.names = ['TwoHopReach']
 
@@ -14,6 +14,9 @@ class TwoHopReachByType(Feature):
     type in the current time step.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self, vertex_types):
         self.names = ['TwoHopReachBy' + str(vertex_type) for vertex_type in vertex_types]
         self.vertex_types = vertex_types
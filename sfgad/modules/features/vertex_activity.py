@@ -9,11 +9,14 @@ class VertexActivity(Feature):
     least 1 incident edge, and 0 otherwise.
     """
 
+    version = 0
+
     def __init__(self):
         self.names = ['VertexActivity']
         self.nodes = []
 
     def reset(self):
+        self.version += 1
         self.nodes = []
 
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
@@ -27,6 +30,9 @@ class VertexActivity(Feature):
             existing vertices.
         """
 
+        # the state changes with every window
+        self.version += 1
+
         active_nodes = list(pd.unique(df_edges[['SRC_NAME', 'DST_NAME']].values.ravel()))
 
         result_df = pd.DataFrame(data={'name': active_nodes, 'VertexActivity': 1},
@@ -12,11 +12,14 @@ class VertexActivityByType(Feature):
     in the current time step.
     """
 
+    version = 0
+
     def __init__(self, edge_types):
         self.names = ['VertexActivityBy' + str(edge_type) for edge_type in edge_types]
         self.nodes = []
 
     def reset(self):
+        self.version += 1
         self.nodes = []
 
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
@@ -30,6 +33,9 @@ class VertexActivityByType(Feature):
             and the calculated vertex activity for all vertices and edge types in the given df_edges.
         """
 
+        # the state changes with every window
+        self.version += 1
+
         # determine the active nodes
         active_nodes = list(pd.unique(df_edges[['SRC_NAME', 'DST_NAME']].values.ravel()))
 
@@ -7,6 +7,9 @@ class VertexDegree(Feature):
     the edges of the current time window
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self):
         self.names = ['VertexDegree']
 
@@ -10,6 +10,9 @@ class VertexDegreeByType(Feature):
     in the current time step.
     """
 
+    # the feature keeps no state between windows
+    version = 0
+
     def __init__(self, edge_types):
         self.names = ['VertexDegreeBy' + str(edge_type) for edge_type in edge_types]
 
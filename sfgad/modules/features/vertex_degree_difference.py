@@ -11,12 +11,15 @@ class VertexDegreeDifference(Feature):
     It calculates the vertex degree difference only for the active nodes.
     """
 
+    version = 0
+
     def __init__(self, only_active_nodes=False):
         self.names = ['VertexDegreeDifference']
         self.previous_count_df = pd.DataFrame(columns=['name', 'VertexDegree'])
         self.only_active_nodes = only_active_nodes
 
     def reset(self):
+        self.version += 1
         self.previous_count_df = pd.DataFrame(columns=['name', 'VertexDegree'])
 
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
@@ -30,6 +33,9 @@ class VertexDegreeDifference(Feature):
             difference for all vertices in the given df_edges.
         """
 
+        # the state changes with every window
+        self.version += 1
+
         src_counts = df_edges.SRC_NAME.value_counts()
         dst_counts = df_edges.DST_NAME.value_counts()
 
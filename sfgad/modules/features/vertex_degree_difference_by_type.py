@@ -12,6 +12,8 @@ class VertexDegreeDifferenceByType(Feature):
     in the current time step.
     """
 
+    version = 0
+
     def __init__(self, edge_types, only_active_nodes=False):
         self.names = ['VertexDegreeDifferenceBy' + str(edge_type) for edge_type in edge_types]
         self.only_active_nodes = only_active_nodes
@@ -19,6 +21,7 @@ class VertexDegreeDifferenceByType(Feature):
         self.previous_count_df = pd.DataFrame(columns=['name'] + self.names)
 
     def reset(self):
+        self.version += 1
         self.previous_count_df = pd.DataFrame(columns=['name'] + self.names)
 
     def process_vertices(self, df_edges, n_jobs, update_activity=True):
@@ -32,6 +35,9 @@ class VertexDegreeDifferenceByType(Feature):
             and the calculated vertex degree difference for all vertices and edge types in the given df_edges.
         """
 
+        # the state changes with every window
+        self.version += 1
+
         src_counts = df_edges.groupby(['SRC_NAME', 'E_TYPE']).size()
         dst_counts = df_edges.groupby(['DST_NAME', 'E_TYPE']).size()
 
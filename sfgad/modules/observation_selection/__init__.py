@@ -7,6 +7,7 @@ from .current_similar_selection import CurrentSimilarSelection
 from .fallback_selection import FallbackSelection
 from .helper.external_sql_database import ExternalSQLDatabase
 from .helper.in_memory_database import InMemoryDatabase
+from .helper.sqlite_database import SQLiteDatabase
 from .historic_age_all_selection import HistoricAgeAllSelection
 from .historic_age_similar_selection import HistoricAgeSimilarSelection
 from .historic_all_selection import HistoricAllSelection
@@ -1,3 +1,6 @@
+import numpy as np
+
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -40,9 +43,31 @@ class AdditionalSelection(ObservationSelection):
         result.drop_duplicates(inplace=True)
 
         # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        result = result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
 
         if self.limit is not None:
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        segments = np.arange(len(vertices))
+
+        # get the results from both rules
+        result_first_rule = self.first_rule.gather_many(vertices, current_time_window, database)
+        result_second_rule = self.second_rule.gather_many(vertices, current_time_window, database)
+
+        # combine the results of each vertex and drop duplicates
+        result = SegmentedFrame.combine([(result_first_rule, segments), (result_second_rule, segments)],
+                                        len(vertices)).drop_duplicates()
+
+        return result.sort_by_time_window().head(self.limit)
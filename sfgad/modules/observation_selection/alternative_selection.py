@@ -1,3 +1,6 @@
+import numpy as np
+
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -48,3 +51,27 @@ class AlternativeSelection(ObservationSelection):
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # get the results from the first rule
+        result = self.first_rule.gather_many(vertices, current_time_window, database)
+
+        # replace the results by the ones of the second rule for the vertices, for which the first rule fails to
+        # provide enough observations
+        deficient = np.flatnonzero(result.sizes() < self.threshold)
+        if len(deficient) > 0:
+            sufficient = np.flatnonzero(result.sizes() >= self.threshold)
+            result_second_rule = self.second_rule.gather_many(vertices.iloc[deficient], current_time_window, database)
+            result = SegmentedFrame.combine([(result.take_segments(sufficient), sufficient),
+                                             (result_second_rule, deficient)], len(vertices))
+
+        return result.head(self.limit)
@@ -1,3 +1,7 @@
+import numpy as np
+
+from .helper.cohorts import vertex_ages
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -34,7 +38,7 @@ class CurrentAgeAllSelection(ObservationSelection):
         result = database.select_by_time_step(current_time_window)
 
         # keep only relevant vertices
-        relevant_rows = [x in relevant_vertices for x in zip(result['name'], result['type'])]
+        relevant_rows = np.array([x in relevant_vertices for x in zip(result['name'], result['type'])], dtype=bool)
 
         # subset the results and reset index
         result = result[relevant_rows].reset_index(drop=True)
@@ -43,3 +47,36 @@ class CurrentAgeAllSelection(ObservationSelection):
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # group the current observations by the age of their vertex
+        result = database.select_by_time_step(current_time_window).reset_index(drop=True)
+        result['age'] = vertex_ages(database.first_occurrences, result['name'], result['type'])
+        result = SegmentedFrame.by_key(result, 'age', vertex_ages(database.first_occurrences, vertices['name'],
+                                                                  vertices['type'], missing=-2))
+
+        return exclude_vertices(result, vertices).head(self.limit)
+
+
+def exclude_vertices(result, vertices):
+    """
+    Removes the rows of every vertex from its own segment.
+    :param result: SegmentedFrame with one segment per vertex and the columns 'name' and 'type'.
+    :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+    :return: the segmented frame without the rows of the vertices themselves
+    """
+    segment_ids = result.segment_ids()
+    own_rows = (result.rows['name'].values == vertices['name'].values[segment_ids]) & \
+               (result.rows['type'].values == vertices['type'].values[segment_ids])
+    result = result.filter(~own_rows)
+
+    return SegmentedFrame(result.rows.drop(columns=['age'], errors='ignore'), result.offsets)
@@ -1,3 +1,8 @@
+import numpy as np
+
+from .current_age_all_selection import exclude_vertices
+from .helper.cohorts import vertex_ages, age_type_keys
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -27,16 +32,14 @@ class CurrentAgeSimilarSelection(ObservationSelection):
         :return: Dataframe of the relevant entries in the database
         """
 
-        # determine vertices with the same age ...
-        relevant_vertices = database.get_vertices_same_age(vertex_name, vertex_type)
-        # ... and type
-        relevant_vertices = [t for t in relevant_vertices if t[1] == vertex_type]
+        # determine vertices with the same age and type
+        relevant_vertices = database.get_vertices_same_age(vertex_name, vertex_type, same_type=True)
 
         # select all current observations
         result = database.select_by_time_step(current_time_window)
 
         # keep only relevant vertices
-        relevant_rows = [x in relevant_vertices for x in zip(result['name'], result['type'])]
+        relevant_rows = np.array([x in relevant_vertices for x in zip(result['name'], result['type'])], dtype=bool)
 
         # subset the results and reset index
         result = result[relevant_rows].reset_index(drop=True)
@@ -45,3 +48,22 @@ class CurrentAgeSimilarSelection(ObservationSelection):
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # group the current observations by the age and type of their vertex
+        result = database.select_by_time_step(current_time_window).reset_index(drop=True)
+        result['age'], keys = age_type_keys(
+            vertex_ages(database.first_occurrences, result['name'], result['type']), result['type'],
+            vertex_ages(database.first_occurrences, vertices['name'], vertices['type'], missing=-2), vertices['type'])
+        result = SegmentedFrame.by_key(result, 'age', keys)
+
+        return exclude_vertices(result, vertices).head(self.limit)
@@ -1,3 +1,5 @@
+from .helper.block_cache import BlockCache, limit_mask
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -5,9 +7,10 @@ class CurrentAllSelection(ObservationSelection):
     """
     This observation selection gathers all current observations of all vertices.
     The results can be limited by providing a limit parameter.
+    The observations, which are shared by several vertices, are cached up to cache_size bytes.
     """
 
-    def __init__(self, limit=None):
+    def __init__(self, limit=None, cache_size=64 * 2 ** 20):
         # check whether limit is given and set self.limit if thats the case
         if limit is not None:
             if not isinstance(limit, int) or not limit >= 1:
@@ -15,6 +18,9 @@ class CurrentAllSelection(ObservationSelection):
 
         self.limit = limit
 
+        # cache the shared blocks of observations up to cache_size bytes
+        self.cache = BlockCache(max_bytes=cache_size)
+
     def gather(self, vertex_name, vertex_type, current_time_window, database):
         """
         Takes a vertex and a reference to the database.
@@ -26,12 +32,42 @@ class CurrentAllSelection(ObservationSelection):
         :return: Dataframe of the relevant entries in the database
         """
 
-        result = database.select_by_time_step(current_time_window).reset_index(drop=True)
+        block, mask = self.reference_block(vertex_name, vertex_type, current_time_window, database)
+
+        return block[mask].reset_index(drop=True)
+
+    def reference_block(self, vertex_name, vertex_type, current_time_window, database):
+        """
+        Returns the block of observations, which is shared by all vertices of the window, and a mask, which selects the
+        relevant entries of the given vertex from the block. The block is cached until records are inserted into the
+        database and must not be modified.
+        :param vertex_name: The name of the vertex
+        :param vertex_type: The type of the vertex
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: Tuple of the shared dataframe and a boolean array with an entry per row of the dataframe
+        """
+
+        block = self.cache.get((None, current_time_window), database,
+                               lambda: database.select_by_time_step(current_time_window).reset_index(drop=True))
 
         # filter the given vertex from the results
-        result = result[result['name'] != vertex_name].reset_index(drop=True)
+        return block, limit_mask(block['name'].values != vertex_name, self.limit)
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        block, _ = self.reference_block(None, None, current_time_window, database)
+        result = SegmentedFrame.repeat(block, len(vertices))
 
-        if self.limit is not None:
-            result = result.head(self.limit)
+        # filter the given vertex from the results of its segment
+        result = result.filter(result.rows['name'].values != vertices['name'].values[result.segment_ids()])
 
-        return result
+        return result.head(self.limit)
@@ -1,3 +1,6 @@
+import numpy as np
+
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -51,6 +54,32 @@ class FallbackSelection(ObservationSelection):
             result = result.head(self.limit)
 
         # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        result = result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # get the results from the first rule
+        result = self.first_rule.gather_many(vertices, current_time_window, database)
+
+        # get and append the results from the second rule for the vertices, for which the first rule fails to provide
+        # enough observations
+        deficient = np.flatnonzero(result.sizes() < self.threshold)
+        if len(deficient) > 0:
+            result_second_rule = self.second_rule.gather_many(vertices.iloc[deficient], current_time_window, database)
+            result = SegmentedFrame.combine([(result, np.arange(len(vertices))), (result_second_rule, deficient)],
+                                            len(vertices))
+
+            # drop duplicate results
+            result = result.drop_duplicates(segments=deficient)
+
+        return result.head(self.limit).sort_by_time_window()
@@ -0,0 +1,102 @@
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+
+class BlockCache:
+    """
+    A least recently used cache for blocks of observations, which are shared by several vertices of the same window.
+    The cache belongs to a single database and is cleared as soon as records are inserted into this database. The
+    cached blocks are shared read-only, i.e. their arrays are not writeable. The least recently used blocks are evicted,
+    if the total memory usage of all blocks exceeds max_bytes. Blocks of a database without version are not cached.
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20):
+        # check whether max_bytes is a non-negative integer
+        if not isinstance(max_bytes, int) or not max_bytes >= 0:
+            raise ValueError("The given parameter 'max_bytes' should be an integer and >= 0!")
+
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        """
+        Removes all blocks from the cache.
+        """
+        self.blocks = OrderedDict()
+        self.n_bytes = 0
+        self.database = None
+        self.version = None
+
+    def get(self, key, database, select):
+        """
+        Returns the cached block for the given key or selects and caches it, if it is not cached yet.
+        :param key: The key of the block (e.g. the type and time window).
+        :param database: The reference to the Database the block is selected from.
+        :param select: Function without parameters, which selects the block from the database.
+        :return: the shared block.
+        """
+        # without a version, new records cannot be detected
+        version = getattr(database, 'version', None)
+        if version is None:
+            return select()
+
+        # a different database or new records invalidate all cached blocks
+        if self.database is None or self.database() is not database or self.version != version:
+            self.clear()
+            self.database = weakref.ref(database)
+            self.version = version
+
+        if key in self.blocks:
+            self.blocks.move_to_end(key)
+            return self.blocks[key][0]
+
+        # freeze the block before any column is accessed, as pandas keeps the accessed columns as views
+        block = select()
+        freeze(block)
+
+        n_bytes = int(block.memory_usage(index=True, deep=True).sum())
+        if n_bytes <= self.max_bytes:
+            self.blocks[key] = (block, n_bytes)
+            self.n_bytes += n_bytes
+
+            # evict the least recently used blocks
+            while self.n_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self.blocks.popitem(last=False)
+                self.n_bytes -= evicted_bytes
+
+        return block
+
+    def __getstate__(self):
+        # the cached blocks are not part of the state, e.g. when the selection rule is sent to another process
+        return {'max_bytes': self.max_bytes}
+
+    def __setstate__(self, state):
+        self.max_bytes = state['max_bytes']
+        self.clear()
+
+
+def freeze(block):
+    """
+    Makes the arrays of the columns of a dataframe read-only, so that the columns of a shared block cannot be modified
+    in place. As pandas keeps the accessed columns, the columns are frozen once and stay read-only.
+    :param block: The dataframe.
+    """
+    for column in block.columns:
+        values = block[column].values
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+
+
+def limit_mask(mask, limit):
+    """
+    Limits the given mask to its first limit entries, which are True.
+    :param mask: Boolean array.
+    :param limit: The maximal number of True entries or None.
+    :return: the limited mask.
+    """
+    if limit is None:
+        return mask
+
+    return mask & (np.cumsum(mask) <= limit)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from .segmented_frame import SegmentedFrame, ranges
+
+
+class CohortIndex:
+    """
+    Index of the recorded vertices by their first occurrence (age) and by their first occurrence and type.
+    The members of every cohort are kept in the order of their first occurrence.
+    """
+
+    def __init__(self, first_occurrences=None):
+        self.by_age = {}
+        self.by_age_and_type = {}
+
+        if first_occurrences is not None:
+            for (vertex_name, vertex_type), time_window in first_occurrences.items():
+                self.add(vertex_name, vertex_type, time_window)
+
+    def add(self, vertex_name, vertex_type, first_occurrence):
+        """
+        Adds a newly recorded vertex to its cohorts.
+        :param vertex_name: The name of the vertex.
+        :param vertex_type: The type of the vertex.
+        :param first_occurrence: The time window of the first occurrence of the vertex.
+        """
+        self.by_age.setdefault(first_occurrence, []).append((vertex_name, vertex_type))
+        self.by_age_and_type.setdefault((first_occurrence, vertex_type), []).append((vertex_name, vertex_type))
+
+    def members(self, first_occurrence, vertex_type=None):
+        """
+        Returns all vertices of a cohort.
+        :param first_occurrence: The time window of the first occurrence of the cohort.
+        :param vertex_type: If given, only the vertices of this type are returned.
+        :return: list of (name, type) tuples of all vertices of the cohort, which is a copy of the index.
+        """
+        if vertex_type is None:
+            return list(self.by_age.get(first_occurrence, ()))
+        return list(self.by_age_and_type.get((first_occurrence, vertex_type), ()))
+
+
+def vertex_ages(first_occurrences, vertex_names, vertex_types, missing=-1):
+    """
+    Returns the first occurrence of every given vertex.
+    :param first_occurrences: Dictionary from (name, type) to the time window of the first occurrence.
+    :param vertex_names: The names of the vertices.
+    :param vertex_types: The types of the vertices.
+    :param missing: The value for vertices, which were not recorded yet.
+    :return: array with the first occurrence of every vertex.
+    """
+    return np.array([first_occurrences.get(key, missing) for key in zip(vertex_names, vertex_types)],
+                    dtype=np.int64)
+
+
+def age_type_keys(first_ages, first_types, second_ages, second_types):
+    """
+    Combines the ages and types of two groups of vertices to integer keys, which are equal iff age and type are equal.
+    :param first_ages: The ages of the vertices of the first group.
+    :param first_types: The types of the vertices of the first group.
+    :param second_ages: The ages of the vertices of the second group.
+    :param second_types: The types of the vertices of the second group.
+    :return: tuple with an array of keys for each group.
+    """
+    type_codes, all_types = pd.factorize(pd.Series(np.concatenate([np.asarray(first_types, dtype=object),
+                                                                   np.asarray(second_types, dtype=object)]),
+                                                   dtype=object))
+    keys = np.concatenate([first_ages, second_ages]).astype(np.int64) * max(len(all_types), 1) + type_codes
+
+    return keys[:len(first_ages)], keys[len(first_ages):]
+
+
+def cohort_lookup(database, vertices, same_type=False):
+    """
+    Looks up the cohort of every given vertex. Every cohort is looked up only once, no matter how many of its members
+    are given.
+    :param database: The reference to the Database.
+    :param vertices: Dataframe with the columns 'name' and 'type' of the vertices.
+    :param same_type: True, if the cohorts should only contain vertices of the same type.
+    :return: tuple with an array, which contains the index of the cohort of every vertex (-1 for vertices, which were
+    not recorded yet), and a list with the members of every cohort.
+    """
+    cohort_ids = {}
+    vertex_cohorts = np.full(len(vertices), -1, dtype=np.int64)
+    members = []
+
+    for i, (vertex_name, vertex_type) in enumerate(zip(vertices['name'], vertices['type'])):
+        age = database.first_occurrences.get((vertex_name, vertex_type))
+        if age is None:
+            continue
+
+        cohort = (age, vertex_type) if same_type else age
+        if cohort not in cohort_ids:
+            cohort_ids[cohort] = len(cohort_ids)
+            members.append(database.cohorts.members(age, vertex_type if same_type else None))
+        vertex_cohorts[i] = cohort_ids[cohort]
+
+    return vertex_cohorts, members
+
+
+def repeat_cohorts(cohort_sizes, vertex_cohorts):
+    """
+    Returns the row positions, which serve every vertex with the rows of its cohort, if the rows of all cohorts are
+    stored consecutively.
+    :param cohort_sizes: The number of rows of every cohort.
+    :param vertex_cohorts: The index of the cohort of every vertex (-1 for no cohort).
+    :return: tuple with the row positions and the number of rows of every vertex.
+    """
+    cohort_sizes = np.asarray(cohort_sizes, dtype=np.int64)
+    cohort_starts = np.concatenate([[0], np.cumsum(cohort_sizes)[:-1]]).astype(np.int64)
+
+    known = vertex_cohorts >= 0
+    sizes = np.where(known, cohort_sizes.take(vertex_cohorts, mode='clip') if len(cohort_sizes) else 0, 0)
+    starts = np.where(known, cohort_starts.take(vertex_cohorts, mode='clip') if len(cohort_sizes) else 0, 0)
+
+    return ranges(starts, sizes), sizes
+
+
+def same_age_vertices(database, vertices, same_type=False):
+    """
+    Returns the vertices with the same age (and type) as every given vertex, including the vertex itself.
+    :param database: The reference to the Database.
+    :param vertices: Dataframe with the columns 'name' and 'type' of the vertices.
+    :param same_type: True, if only vertices of the same type should be returned.
+    :return: SegmentedFrame with the columns 'name' and 'type' and one segment per given vertex.
+    """
+    vertex_cohorts, members = cohort_lookup(database, vertices, same_type)
+
+    # the members of the cohorts are stored consecutively, every vertex references the range of its cohort
+    rows = pd.DataFrame([member for cohort in members for member in cohort], columns=['name', 'type'])
+    positions, sizes = repeat_cohorts([len(cohort) for cohort in members], vertex_cohorts)
+
+    return SegmentedFrame(rows.iloc[positions].reset_index(drop=True),
+                          np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64))
@@ -1,7 +1,17 @@
 import abc
 
+from sfgad.utils.memory import memory_report
+
 
 class Database(metaclass=abc.ABCMeta):
+    # the version of the records, which an implementation increases with every insert, so that cached selections can
+    # be invalidated. The selections of a database without version (None) are not cached.
+    version = None
+
+    # the names of the structures, which an implementation keeps in memory (dotted for nested structures, e.g.
+    # 'cohorts.by_age'), and which are reported by memory_report. A database without such structures reports nothing.
+    memory_structures = ()
+
     @abc.abstractmethod
     def insert_record(self, vertex_name, vertex_type, time_window, feature_values):
         """
@@ -51,10 +61,55 @@ class Database(metaclass=abc.ABCMeta):
         """
 
     @abc.abstractmethod
-    def get_vertices_same_age(self, vertex_name, vertex_type):
+    def select_by_vertex_names(self, vertex_names, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertices at once with a single scan or query.
+        :param vertex_names: The given vertex names (one segment per name).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every vertex are selected.
+        :return a SegmentedFrame with a segment per given name, each sorted by time_window descending.
+        """
+
+    @abc.abstractmethod
+    def select_by_vertex_types(self, vertex_types, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertex types at once with a single scan or query.
+        :param vertex_types: The given vertex types (one segment per type).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every type are selected.
+        :return a SegmentedFrame with a segment per given type, each sorted by time_window descending.
+        """
+
+    @abc.abstractmethod
+    def get_vertices_same_age(self, vertex_name, vertex_type, same_type=False):
         """
         Returns a list with all existing vertices with same age as the given vertex (given vertex not included).
         :param vertex_name: The given vertex_name.
         :param vertex_type: The given vertex type.
+        :param same_type: True, if only vertices of the same type as the given vertex should be returned.
         :return a a list with all existing vertices with same age as the given vertex.
         """
+
+    def count_records(self):
+        """
+        Returns the number of rows in the database. By default, all rows are selected to count them.
+        :return the number of rows.
+        """
+        return len(self.select_all())
+
+    def select_from(self, offset):
+        """
+        Selects the rows in the order of their insertion, starting with the row at the given offset, e.g. the rows added
+        since a checkpoint. By default, all rows are selected.
+        :param offset: The number of rows, which are skipped.
+        :return a dataframe with the historic data from the given offset on.
+        """
+        return self.select_all().iloc[offset:].reset_index(drop=True)
+
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of the structures, which the database keeps in
+        memory, i.e. of the memory_structures.
+        :return: dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        return memory_report(self, self.memory_structures)
@@ -4,7 +4,9 @@ import mysql.connector
 import pandas as pd
 from mysql.connector import errorcode
 
+from .cohorts import CohortIndex
 from .database import Database
+from .segmented_frame import SegmentedFrame
 
 
 class ExternalSQLDatabase(Database):
@@ -13,6 +15,8 @@ class ExternalSQLDatabase(Database):
     The primary key is the tiple ('name', 'type', 'time_window')
     """
 
+    memory_structures = ('first_occurrences', 'cohorts.by_age', 'cohorts.by_age_and_type')
+
     def __init__(self, user, password, host, database, table_name, feature_names):
         # close any old MySQL connections
         gc.collect()
@@ -55,6 +59,12 @@ class ExternalSQLDatabase(Database):
         # create a dictionary with first occurrences information of vertices
         self.first_occurrences = {}
 
+        # index the vertices by their first occurrence and type
+        self.cohorts = CohortIndex()
+
+        # the version is increased with every insert, so that cached selections can be invalidated
+        self.version = 0
+
     def insert_record(self, vertex_name, vertex_type, time_window, feature_values):
         """
         Inserts a record to the database.
@@ -63,9 +73,12 @@ class ExternalSQLDatabase(Database):
         :param time_window: The time step.
         :param feature_values: The corresponding feature values in a list.
         """
+        self.version += 1
+
         # if first occurrence, add a new entry to self.first_occurrences
         if (vertex_name, vertex_type) not in self.first_occurrences:
             self.first_occurrences[(vertex_name, vertex_type)] = time_window
+            self.cohorts.add(vertex_name, vertex_type, time_window)
 
         try:
             values = [vertex_name, vertex_type, time_window] + feature_values
@@ -89,10 +102,13 @@ class ExternalSQLDatabase(Database):
         Inserts a record to the database.
         :param records: DataFrame where each row is a record with meta information about the vertex and its features.
         """
+        self.version += 1
+
         # for each entry: if first occurrence, add a new entry to self.first_occurrences
         for vertex_name, vertex_type, time_window in zip(records['name'], records['type'], records['time_window']):
             if (vertex_name, vertex_type) not in self.first_occurrences:
                 self.first_occurrences[(vertex_name, vertex_type)] = time_window
+                self.cohorts.add(vertex_name, vertex_type, time_window)
 
         records.to_sql(self.table_name, con=self.cnn, if_exists='append')
 
@@ -128,22 +144,65 @@ class ExternalSQLDatabase(Database):
         return pd.read_sql('SELECT * FROM ' + self.table_name + ' WHERE time_window=%s', con=self.cnn,
                            params=[time_window])
 
-    def get_vertices_same_age(self, vertex_name, vertex_type):
+    def select_by_vertex_names(self, vertex_names, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertices at once with a single scan or query.
+        :param vertex_names: The given vertex names (one segment per name).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every vertex are selected.
+        :return a SegmentedFrame with a segment per given name, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.select_by_keys('name', vertex_names, before_window), 'name', vertex_names,
+                                     limit_per_key=limit_per_vertex)
+
+    def select_by_vertex_types(self, vertex_types, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertex types at once with a single scan or query.
+        :param vertex_types: The given vertex types (one segment per type).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every type are selected.
+        :return a SegmentedFrame with a segment per given type, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.select_by_keys('type', vertex_types, before_window), 'type', vertex_types,
+                                     limit_per_key=limit_per_vertex)
+
+    def select_by_keys(self, key_column, keys, before_window=None):
+        """
+        Selects all rows in the database where the given key column is one of the given keys with a single query.
+        :param key_column: The key column (either 'name' or 'type').
+        :param keys: The given keys.
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :return a dataframe with all historic data of the given keys.
+        """
+        keys = list(set(keys))
+        if len(keys) == 0:
+            return self.select_all().head(0)
+
+        sql_query = 'SELECT * FROM ' + self.table_name + ' WHERE ' + key_column + ' IN (' + \
+                    ', '.join(['%s'] * len(keys)) + ')'
+        if before_window is not None:
+            sql_query += ' AND time_window < %s'
+            keys.append(int(before_window))
+
+        return pd.read_sql(sql_query, con=self.cnn, params=keys)
+
+    def get_vertices_same_age(self, vertex_name, vertex_type, same_type=False):
         """
         Returns a list with all existing vertices with same age as the given vertex (given vertex not included).
         :param vertex_name: The given vertex_name.
         :param vertex_type: The given vertex type.
+        :param same_type: True, if only vertices of the same type as the given vertex should be returned.
         :return a a list with all existing vertices with same age as the given vertex.
         """
-        age = self.first_occurrences[(vertex_name, vertex_type)]
-        vertices_same_age = []
+        # a vertex, which was not recorded yet, has no age
+        if (vertex_name, vertex_type) not in self.first_occurrences:
+            return []
 
-        # extract all vertices with the same age
-        for key, value in self.first_occurrences.items():
-            if value == age and key != (vertex_name, vertex_type):
-                vertices_same_age.append(key)
+        age = self.first_occurrences[(vertex_name, vertex_type)]
 
-        return vertices_same_age
+        # look up the cohort of the vertex and leave out the vertex itself
+        return [key for key in self.cohorts.members(age, vertex_type if same_type else None)
+                if key != (vertex_name, vertex_type)]
 
     def close_connection(self):
         """
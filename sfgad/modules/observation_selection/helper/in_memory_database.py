@@ -1,6 +1,8 @@
 import pandas as pd
 
+from .cohorts import CohortIndex
 from .database import Database
+from .segmented_frame import SegmentedFrame
 
 
 class InMemoryDatabase(Database):
@@ -8,6 +10,8 @@ class InMemoryDatabase(Database):
     The format of the data-table should be: ['name', 'type', 'time_window', 'feature_1', ..., 'feature_n']
     """
 
+    memory_structures = ('database', 'first_occurrences', 'cohorts.by_age', 'cohorts.by_age_and_type')
+
     def __init__(self, feature_names):
         # create a new dataframe
         self.database = pd.DataFrame(
@@ -23,6 +27,12 @@ class InMemoryDatabase(Database):
         # create a dictionary with first occurrences information of vertices
         self.first_occurrences = {}
 
+        # index the vertices by their first occurrence and type
+        self.cohorts = CohortIndex()
+
+        # the version is increased with every insert, so that cached selections can be invalidated
+        self.version = 0
+
     def insert_record(self, vertex_name, vertex_type, time_window, feature_values):
         """
         Inserts a record to the database.
@@ -31,9 +41,12 @@ class InMemoryDatabase(Database):
         :param time_window: The time step.
         :param feature_values: The corresponding feature values in a list.
         """
+        self.version += 1
+
         # if first occurrence, add a new entry to self.first_occurrences
         if (vertex_name, vertex_type) not in self.first_occurrences:
             self.first_occurrences[(vertex_name, vertex_type)] = time_window
+            self.cohorts.add(vertex_name, vertex_type, time_window)
 
         # insert
         self.database = self.database.append(
@@ -46,10 +59,13 @@ class InMemoryDatabase(Database):
         Inserts a record to the database.
         :param records: DataFrame where each row is a record with meta information about the vertex and its features.
         """
+        self.version += 1
+
         # for each entry: if first occurrence, add a new entry to self.first_occurrences
         for vertex_name, vertex_type, time_window in zip(records['name'], records['type'], records['time_window']):
             if (vertex_name, vertex_type) not in self.first_occurrences:
                 self.first_occurrences[(vertex_name, vertex_type)] = time_window
+                self.cohorts.add(vertex_name, vertex_type, time_window)
 
         # insert the records
         self.database = self.database.append(records, ignore_index=True)
@@ -61,6 +77,21 @@ class InMemoryDatabase(Database):
         """
         return self.database
 
+    def count_records(self):
+        """
+        Returns the number of rows in the database.
+        :return the number of rows.
+        """
+        return len(self.database)
+
+    def select_from(self, offset):
+        """
+        Selects the rows in the order of their insertion, starting with the row at the given offset.
+        :param offset: The number of rows, which are skipped.
+        :return a dataframe with the historic data from the given offset on.
+        """
+        return self.database.iloc[offset:].reset_index(drop=True)
+
     def select_by_vertex_name(self, vertex_name):
         """
         Selects all rows in the database where name=vertex_name.
@@ -85,19 +116,40 @@ class InMemoryDatabase(Database):
         """
         return self.database[self.database['time_window'] == time_window]
 
-    def get_vertices_same_age(self, vertex_name, vertex_type):
+    def select_by_vertex_names(self, vertex_names, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertices at once with a single scan or query.
+        :param vertex_names: The given vertex names (one segment per name).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every vertex are selected.
+        :return a SegmentedFrame with a segment per given name, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.database, 'name', vertex_names, before_window, limit_per_vertex)
+
+    def select_by_vertex_types(self, vertex_types, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertex types at once with a single scan or query.
+        :param vertex_types: The given vertex types (one segment per type).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every type are selected.
+        :return a SegmentedFrame with a segment per given type, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.database, 'type', vertex_types, before_window, limit_per_vertex)
+
+    def get_vertices_same_age(self, vertex_name, vertex_type, same_type=False):
         """
         Returns a list with all existing vertices with same age as the given vertex (given vertex not included).
         :param vertex_name: The given vertex_name.
         :param vertex_type: The given vertex type.
+        :param same_type: True, if only vertices of the same type as the given vertex should be returned.
         :return a a list with all existing vertices with same age as the given vertex.
         """
-        age = self.first_occurrences[(vertex_name, vertex_type)]
-        vertices_same_age = []
+        # a vertex, which was not recorded yet, has no age
+        if (vertex_name, vertex_type) not in self.first_occurrences:
+            return []
 
-        # extract all vertices with the same age
-        for key, value in self.first_occurrences.items():
-            if value == age and key != (vertex_name, vertex_type):
-                vertices_same_age.append(key)
+        age = self.first_occurrences[(vertex_name, vertex_type)]
 
-        return vertices_same_age
+        # look up the cohort of the vertex and leave out the vertex itself
+        return [key for key in self.cohorts.members(age, vertex_type if same_type else None)
+                if key != (vertex_name, vertex_type)]
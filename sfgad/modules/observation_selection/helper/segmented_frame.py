@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+
+class SegmentedFrame:
+    """
+    A dataframe, whose rows are split into consecutive segments (e.g. one segment per vertex).
+    The rows of segment i are rows[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, rows, offsets):
+        self.rows = rows
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def sizes(self):
+        """
+        Returns the number of rows of every segment.
+        :return: array with the size of every segment.
+        """
+        return np.diff(self.offsets)
+
+    def segment_ids(self):
+        """
+        Returns the segment of every row.
+        :return: array with the index of the segment of every row.
+        """
+        return np.repeat(np.arange(len(self)), self.sizes())
+
+    def segment(self, i):
+        """
+        Returns the rows of the given segment.
+        :param i: The index of the segment.
+        :return: dataframe with the rows of the segment.
+        """
+        return self.rows.iloc[self.offsets[i]:self.offsets[i + 1]].reset_index(drop=True)
+
+    def filter(self, mask):
+        """
+        Keeps only the rows, for which mask is True. The rows keep their segments.
+        :param mask: Boolean array with an entry per row.
+        :return: the filtered segmented frame.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        sizes = np.bincount(self.segment_ids()[mask], minlength=len(self))
+
+        return SegmentedFrame(self.rows[mask].reset_index(drop=True),
+                              np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64))
+
+    def head(self, n):
+        """
+        Keeps only the first n rows of every segment.
+        :param n: The maximal number of rows per segment.
+        :return: the limited segmented frame.
+        """
+        if n is None:
+            return self
+
+        ranks = np.arange(len(self.rows)) - np.repeat(self.offsets[:-1], self.sizes())
+
+        return self.filter(ranks < n)
+
+    def sort_by_time_window(self):
+        """
+        Sorts the rows of every segment by time_window descending. Rows with the same time_window keep their order.
+        :return: the sorted segmented frame.
+        """
+        order = np.lexsort((-np.asarray(self.rows['time_window'].values, dtype=np.int64), self.segment_ids()))
+
+        return SegmentedFrame(self.rows.iloc[order].reset_index(drop=True), self.offsets)
+
+    def drop_duplicates(self, segments=None):
+        """
+        Drops duplicate rows within every segment. The first occurrence of a row is kept.
+        :param segments: If given, only the rows of these segments are deduplicated.
+        :return: the segmented frame without duplicates.
+        """
+        segment_ids = self.segment_ids()
+        duplicated = self.rows.assign(segment_id=segment_ids).duplicated().values
+
+        if segments is not None:
+            duplicated &= np.isin(segment_ids, segments)
+
+        return self.filter(~duplicated)
+
+    def take_segments(self, indices):
+        """
+        Returns a segmented frame with the given segments in the given order.
+        :param indices: The indices of the segments.
+        :return: the segmented frame of the given segments.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        sizes = self.sizes()[indices]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+        rows = self.rows.iloc[ranges(self.offsets[indices], sizes)].reset_index(drop=True)
+
+        return SegmentedFrame(rows, offsets)
+
+    @classmethod
+    def combine(cls, parts, n_segments):
+        """
+        Combines the segments of several segmented frames. The rows of an output segment are the rows of all parts
+        mapped to this segment, in the order of the parts.
+        :param parts: List of tuples (segmented_frame, segment_indices), where segment_indices maps every segment of the
+        segmented frame to a segment of the result.
+        :param n_segments: The number of segments of the result.
+        :return: the combined segmented frame.
+        """
+        rows = pd.concat([part.rows for part, _ in parts], ignore_index=True, sort=False)
+        segment_ids = np.concatenate([np.asarray(indices, dtype=np.int64)[part.segment_ids()] for part, indices in
+                                      parts])
+
+        order = np.argsort(segment_ids, kind='mergesort')
+        sizes = np.bincount(segment_ids, minlength=n_segments)
+
+        return cls(rows.iloc[order].reset_index(drop=True), np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64))
+
+    @classmethod
+    def repeat(cls, rows, n_segments):
+        """
+        Creates a segmented frame, in which every segment consists of all given rows.
+        :param rows: The rows of every segment.
+        :param n_segments: The number of segments.
+        :return: the segmented frame.
+        """
+        return cls(rows.iloc[np.tile(np.arange(len(rows)), n_segments)].reset_index(drop=True),
+                   np.arange(n_segments + 1, dtype=np.int64) * len(rows))
+
+    @classmethod
+    def from_frames(cls, frames, columns=None):
+        """
+        Creates a segmented frame with one segment per given dataframe.
+        :param frames: List of dataframes.
+        :param columns: The columns of the result, if no dataframe is given.
+        :return: the segmented frame.
+        """
+        offsets = np.concatenate([[0], np.cumsum([len(frame) for frame in frames], dtype=np.int64)])
+
+        if len(frames) == 0:
+            return cls(pd.DataFrame(columns=columns), offsets)
+
+        return cls(pd.concat(frames, ignore_index=True, sort=False), offsets)
+
+    @classmethod
+    def by_key(cls, rows, key_column, keys, before_window=None, limit_per_key=None):
+        """
+        Splits the given rows into one segment per given key. The rows of every segment are sorted by time_window
+        descending (rows with the same time_window keep their order).
+        :param rows: Dataframe of rows, which contains the column key_column and the column time_window.
+        :param key_column: The column the rows are matched by.
+        :param keys: The keys (one segment per key). The same key may occur several times.
+        :param before_window: If given, only rows with time_window < before_window are kept.
+        :param limit_per_key: If given, only the limit_per_key most recent rows of every segment are kept.
+        :return: the segmented frame.
+        """
+        # without keys, the dtype of the series is given explicitly
+        key_positions, unique_keys = pd.factorize(pd.Series(keys, dtype=None if len(keys) else object))
+
+        time_windows = np.asarray(rows['time_window'].values, dtype=np.int64)
+        row_positions = pd.Index(unique_keys).get_indexer(rows[key_column].values)
+
+        mask = row_positions >= 0
+        if before_window is not None:
+            mask &= time_windows < before_window
+
+        # sort the matching rows by key and by time_window descending (lexsort is stable)
+        selected = np.flatnonzero(mask)
+        selected = selected[np.lexsort((-time_windows[selected], row_positions[selected]))]
+        row_positions = row_positions[selected]
+
+        sizes = np.bincount(row_positions, minlength=len(unique_keys))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+        if limit_per_key is not None:
+            ranks = np.arange(len(selected)) - starts[row_positions]
+            selected = selected[ranks < limit_per_key]
+            sizes = np.minimum(sizes, limit_per_key)
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+        # repeat the segments of keys that were requested several times
+        if len(unique_keys) != len(key_positions):
+            sizes = sizes[key_positions]
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+            selected = selected[ranges(starts[key_positions], sizes)]
+        else:
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+        return cls(rows.iloc[selected].reset_index(drop=True), offsets)
+
+
+def ranges(starts, lengths):
+    """
+    Concatenates the integer ranges [start, start + length) for all given starts and lengths.
+    :param starts: The starts of the ranges.
+    :param lengths: The lengths of the ranges.
+    :return: array with the concatenated ranges.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+    return np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
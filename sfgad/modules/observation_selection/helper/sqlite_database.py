@@ -0,0 +1,275 @@
+import sqlite3
+
+import pandas as pd
+
+from .cohorts import CohortIndex
+from .database import Database
+from .segmented_frame import SegmentedFrame
+
+
+class SQLiteDatabase(Database):
+    """
+    A durable database backed by a local SQLite file, which needs no external database server.
+    The format of the data-table is: ['name', 'type', 'time_window', 'feature_1', ..., 'feature_n', 'p_feature_1', ...,
+    'p_feature_n', 'time']
+    The time stamps are stored as nanoseconds since the epoch.
+    The records of a window are written with a single transaction. Lookups by name and by type are answered from
+    covering indexes on (name, time_window) and (type, time_window). An existing file is opened with its history.
+    The database can be sent to other processes (e.g. the workers of an analyzer with n_jobs > 1), which open their own
+    connection to the same file. Therefore, an in-memory database (path ':memory:') cannot be pickled.
+    """
+
+    memory_structures = ('first_occurrences', 'cohorts.by_age', 'cohorts.by_age_and_type')
+
+    def __init__(self, path, feature_names, table_name='historic_data'):
+        self.path = path
+        self.cnn = connect(path)
+        self.table_name = table_name
+        self.feature_names = feature_names
+        self.columns = ['name', 'type', 'time_window'] + feature_names + ['p_' + name for name in feature_names] + \
+                       ['time']
+
+        value_columns = ', '.join(quote(c) + ' REAL' for c in self.columns[3:-1])
+        other_columns = ', '.join(quote(c) for c in self.columns[3:])
+
+        with self.cnn:
+            self.cnn.execute('CREATE TABLE IF NOT EXISTS ' + quote(table_name) + ' ('
+                             'name TEXT NOT NULL, type TEXT NOT NULL, time_window INTEGER NOT NULL, ' +
+                             value_columns + ', time INTEGER)')
+            # the files of earlier versions have no time column
+            if 'time' not in [row[1] for row in self.cnn.execute('PRAGMA table_info(' + quote(table_name) + ')')]:
+                self.cnn.execute('ALTER TABLE ' + quote(table_name) + ' ADD COLUMN time INTEGER')
+            self.cnn.execute('CREATE INDEX IF NOT EXISTS ' + quote(table_name + '_by_name') + ' ON ' +
+                             quote(table_name) + ' (name, time_window, type, ' + other_columns + ')')
+            self.cnn.execute('CREATE INDEX IF NOT EXISTS ' + quote(table_name + '_by_type') + ' ON ' +
+                             quote(table_name) + ' (type, time_window, name, ' + other_columns + ')')
+            self.cnn.execute('CREATE INDEX IF NOT EXISTS ' + quote(table_name + '_by_time_window') + ' ON ' +
+                             quote(table_name) + ' (time_window)')
+            self.cnn.execute('CREATE TABLE IF NOT EXISTS ' + quote(table_name + '_first_occurrences') + ' ('
+                             'name TEXT NOT NULL, type TEXT NOT NULL, time_window INTEGER NOT NULL, '
+                             'PRIMARY KEY (name, type))')
+
+        # the statements are built once and reused, so that sqlite can serve them from its statement cache
+        select_columns = ', '.join(quote(c) for c in self.columns)
+        self.insert_query = 'INSERT INTO ' + quote(table_name) + ' (' + select_columns + ') VALUES (' + \
+                            ', '.join('?' * len(self.columns)) + ')'
+        self.insert_occurrence_query = 'INSERT INTO ' + quote(table_name + '_first_occurrences') + \
+                                       ' VALUES (?, ?, ?)'
+        self.select_query = 'SELECT ' + select_columns + ' FROM ' + quote(table_name)
+
+        # load the dictionary with first occurrences information of vertices
+        self.first_occurrences = {(name, vertex_type): time_window for name, vertex_type, time_window in
+                                  self.cnn.execute('SELECT name, type, time_window FROM ' +
+                                                   quote(table_name + '_first_occurrences') + ' ORDER BY rowid')}
+
+        # index the vertices by their first occurrence and type
+        self.cohorts = CohortIndex(self.first_occurrences)
+
+        # the version is increased with every insert, so that cached selections can be invalidated
+        self.version = 0
+
+    def __getstate__(self):
+        # the connection is not part of the state, a copy opens its own connection to the file
+        if self.path in (':memory:', ''):
+            raise TypeError("An in-memory SQLiteDatabase cannot be pickled, as its history is not shared.")
+
+        state = dict(self.__dict__)
+        del state['cnn']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cnn = connect(self.path)
+
+    def insert_record(self, vertex_name, vertex_type, time_window, feature_values):
+        """
+        Inserts a record to the database.
+        :param vertex_name: The name of the vertex.
+        :param vertex_type: The type of the vertex.
+        :param time_window: The time step.
+        :param feature_values: The corresponding feature values in a list.
+        """
+        self.insert_records(pd.DataFrame(data=[[vertex_name, vertex_type, time_window] + list(feature_values)],
+                                         columns=['name', 'type', 'time_window'] + self.feature_names))
+
+    def insert_records(self, records):
+        """
+        Inserts a record to the database.
+        :param records: DataFrame where each row is a record with meta information about the vertex and its features.
+        """
+        # collect the first occurrences of the new vertices
+        new_occurrences = {}
+        for vertex_name, vertex_type, time_window in zip(records['name'], records['type'],
+                                                         records['time_window'].tolist()):
+            key = (vertex_name, vertex_type)
+            if key not in self.first_occurrences and key not in new_occurrences:
+                new_occurrences[key] = time_window
+
+        # missing p_value columns and time stamps are stored as NULL
+        records = records.reindex(columns=self.columns)
+        times = [None if pd.isnull(t) else pd.Timestamp(t).value for t in records['time']]
+        rows = zip(*[records[c].tolist() for c in self.columns[:-1]] + [times])
+
+        # write all records of the window with a single transaction
+        with self.cnn:
+            self.cnn.executemany(self.insert_query, rows)
+            self.cnn.executemany(self.insert_occurrence_query,
+                                 [key + (time_window,) for key, time_window in new_occurrences.items()])
+
+        # the index in memory is only updated, after the transaction was committed
+        for (vertex_name, vertex_type), time_window in new_occurrences.items():
+            self.first_occurrences[(vertex_name, vertex_type)] = time_window
+            self.cohorts.add(vertex_name, vertex_type, time_window)
+        self.version += 1
+
+    def select_all(self):
+        """
+        Selects all rows in the database.
+        :return a dataframe with all historic data.
+        """
+        return self.read(self.select_query + ' ORDER BY rowid')
+
+    def count_records(self):
+        """
+        Returns the number of rows in the database.
+        :return the number of rows.
+        """
+        return self.cnn.execute('SELECT COUNT(*) FROM ' + quote(self.table_name)).fetchone()[0]
+
+    def select_from(self, offset):
+        """
+        Selects the rows in the order of their insertion, starting with the row at the given offset.
+        :param offset: The number of rows, which are skipped.
+        :return a dataframe with the historic data from the given offset on.
+        """
+        return self.read(self.select_query + ' ORDER BY rowid LIMIT -1 OFFSET ?', [int(offset)])
+
+    def select_by_vertex_name(self, vertex_name):
+        """
+        Selects all rows in the database where name=vertex_name.
+        :param vertex_name: The given vertex_name.
+        :return a dataframe with all historic data of the given vertex.
+        """
+        return self.read(self.select_query + ' WHERE name=? ORDER BY time_window, rowid', [vertex_name])
+
+    def select_by_vertex_type(self, vertex_type):
+        """
+        Selects all rows in the database where type=vertex_type.
+        :param vertex_type: The given vertex type.
+        :return a dataframe with all historic data of vertices, which are of the given type.
+        """
+        return self.read(self.select_query + ' WHERE type=? ORDER BY time_window, rowid', [vertex_type])
+
+    def select_by_time_step(self, time_window):
+        """
+        Selects all rows in the database where time_window=time_window.
+        :param time_window: The given time window.
+        :return a dataframe with all historic data of vertices, which have the same time window entry.
+        """
+        return self.read(self.select_query + ' WHERE time_window=? ORDER BY rowid', [int(time_window)])
+
+    def select_by_vertex_names(self, vertex_names, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertices at once with a single scan or query.
+        :param vertex_names: The given vertex names (one segment per name).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every vertex are selected.
+        :return a SegmentedFrame with a segment per given name, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.select_by_keys('name', vertex_names, before_window), 'name', vertex_names,
+                                     limit_per_key=limit_per_vertex)
+
+    def select_by_vertex_types(self, vertex_types, before_window=None, limit_per_vertex=None):
+        """
+        Selects the rows of several vertex types at once with a single scan or query.
+        :param vertex_types: The given vertex types (one segment per type).
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :param limit_per_vertex: If given, only the limit_per_vertex most recent rows of every type are selected.
+        :return a SegmentedFrame with a segment per given type, each sorted by time_window descending.
+        """
+        return SegmentedFrame.by_key(self.select_by_keys('type', vertex_types, before_window), 'type', vertex_types,
+                                     limit_per_key=limit_per_vertex)
+
+    def select_by_keys(self, key_column, keys, before_window=None):
+        """
+        Selects all rows in the database where the given key column is one of the given keys with a single query.
+        The keys are passed through a temporary table, so that the number of keys is not limited by sqlite.
+        :param key_column: The key column (either 'name' or 'type').
+        :param keys: The given keys.
+        :param before_window: If given, only rows with time_window < before_window are selected.
+        :return a dataframe with all historic data of the given keys.
+        """
+        with self.cnn:
+            self.cnn.execute('CREATE TEMP TABLE IF NOT EXISTS selection_keys (key TEXT PRIMARY KEY)')
+            self.cnn.execute('DELETE FROM temp.selection_keys')
+            self.cnn.executemany('INSERT OR IGNORE INTO temp.selection_keys VALUES (?)', ((key,) for key in keys))
+
+            query = self.select_query + ' WHERE ' + key_column + ' IN (SELECT key FROM temp.selection_keys)'
+            if before_window is None:
+                return self.read(query + ' ORDER BY rowid')
+            return self.read(query + ' AND time_window < ? ORDER BY rowid', [int(before_window)])
+
+    def get_vertices_same_age(self, vertex_name, vertex_type, same_type=False):
+        """
+        Returns a list with all existing vertices with same age as the given vertex (given vertex not included).
+        :param vertex_name: The given vertex_name.
+        :param vertex_type: The given vertex type.
+        :param same_type: True, if only vertices of the same type as the given vertex should be returned.
+        :return a a list with all existing vertices with same age as the given vertex.
+        """
+        # a vertex, which was not recorded yet, has no age
+        if (vertex_name, vertex_type) not in self.first_occurrences:
+            return []
+
+        age = self.first_occurrences[(vertex_name, vertex_type)]
+
+        # look up the cohort of the vertex and leave out the vertex itself
+        return [key for key in self.cohorts.members(age, vertex_type if same_type else None)
+                if key != (vertex_name, vertex_type)]
+
+    def read(self, query, params=()):
+        """
+        Executes the given select query and returns the rows as a dataframe with the column types of the data-table.
+        :param query: The select query.
+        :param params: The parameters of the query.
+        :return a dataframe with the selected rows.
+        """
+        result = pd.DataFrame.from_records(self.cnn.execute(query, params).fetchall(), columns=self.columns)
+
+        # define data types of the columns (NULL values are read as None)
+        result['time_window'] = result['time_window'].astype('int64')
+        for column in self.columns[3:-1]:
+            result[column] = result[column].astype('float64')
+        result['time'] = pd.to_datetime(result['time'], unit='ns')
+
+        return result
+
+    def close_connection(self):
+        """
+        Closes the database connection.
+        """
+        self.cnn.close()
+
+
+def connect(path):
+    """
+    Opens a connection to the given database file.
+    :param path: The path of the database file.
+    :return the connection.
+    """
+    cnn = sqlite3.connect(path, cached_statements=256)
+
+    # let readers proceed while a window is written and only sync the log at checkpoints
+    cnn.execute('PRAGMA journal_mode=WAL')
+    cnn.execute('PRAGMA synchronous=NORMAL')
+
+    return cnn
+
+
+def quote(identifier):
+    """
+    Quotes the given identifier for the use in a sql query.
+    :param identifier: The identifier (e.g. the name of a table or a column).
+    :return the quoted identifier.
+    """
+    return '"' + identifier.replace('"', '""') + '"'
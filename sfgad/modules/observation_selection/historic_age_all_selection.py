@@ -1,3 +1,8 @@
+import numpy as np
+
+from .current_age_all_selection import exclude_vertices
+from .helper.cohorts import same_age_vertices
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -41,9 +46,47 @@ class HistoricAgeAllSelection(ObservationSelection):
         result = result.loc[result['time_window'] < current_time_window]
 
         # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        result = result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
 
         if self.limit is not None:
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # determine the vertices with the same age
+        cohorts = same_age_vertices(database, vertices)
+
+        return historic_observations(exclude_vertices(cohorts, vertices), vertices, current_time_window,
+                                     database).head(self.limit)
+
+
+def historic_observations(cohorts, vertices, current_time_window, database):
+    """
+    Collects the historic observations of every vertex and of all vertices in its cohort.
+    :param cohorts: SegmentedFrame with the other vertices of the cohort of every vertex (column 'name').
+    :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+    :param current_time_window: The current time step
+    :param database: The reference to the Database
+    :return: SegmentedFrame with the observations of every vertex, sorted by time_window descending
+    """
+    # the observations of the vertex itself come first, then the ones of its cohort
+    entries = np.concatenate([np.arange(len(vertices)), cohorts.segment_ids()])
+    names = np.concatenate([np.asarray(vertices['name'].values, dtype=object),
+                            np.asarray(cohorts.rows['name'].values, dtype=object)])
+    order = np.argsort(entries, kind='mergesort')
+
+    # select the observations of all entries with a single scan and merge the ones of each vertex
+    result = database.select_by_vertex_names(names[order], before_window=current_time_window)
+    sizes = np.bincount(entries[order], weights=result.sizes(), minlength=len(vertices)).astype(np.int64)
+
+    return SegmentedFrame(result.rows, np.concatenate([[0], np.cumsum(sizes)])).sort_by_time_window()
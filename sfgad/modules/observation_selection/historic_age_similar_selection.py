@@ -1,3 +1,8 @@
+import numpy as np
+
+from .helper.block_cache import BlockCache
+from .helper.cohorts import cohort_lookup, repeat_cohorts
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -6,9 +11,11 @@ class HistoricAgeSimilarSelection(ObservationSelection):
     This observation selection gathers all historic observations of all vertices with the same age and same type.
     Age is defined as the difference between the current time window and the first occurrence of an observation.
     The results can be limited by providing a limit parameter.
+    When gathering for several vertices, the observations of every cohort are selected once and shared by its members.
+    The blocks of observations of the cohorts are cached up to cache_size bytes.
     """
 
-    def __init__(self, limit=None):
+    def __init__(self, limit=None, cache_size=64 * 2 ** 20):
         # check whether limit is given and set self.limit if thats the case
         if limit is not None:
             if not isinstance(limit, int) or not limit >= 1:
@@ -16,6 +23,9 @@ class HistoricAgeSimilarSelection(ObservationSelection):
 
         self.limit = limit
 
+        # cache the shared blocks of observations up to cache_size bytes
+        self.cache = BlockCache(max_bytes=cache_size)
+
     def gather(self, vertex_name, vertex_type, current_time_window, database):
         """
         Takes a vertex and a reference to the database.
@@ -27,24 +37,97 @@ class HistoricAgeSimilarSelection(ObservationSelection):
         :return: Dataframe of the relevant entries in the database
         """
 
-        # determine vertices with the same age
-        relevant_vertices = database.get_vertices_same_age(vertex_name, vertex_type)
+        # determine vertices with the same age and type
+        relevant_vertices = database.get_vertices_same_age(vertex_name, vertex_type, same_type=True)
 
         # add all historic observations of the given vertex
         result = database.select_by_vertex_name(vertex_name)
 
-        # add all historic observations of all vertices with the same age
+        # add all historic observations of all vertices with the same age and type
         for other_name, other_type in relevant_vertices:
-            if other_type == vertex_type:
-                result = result.append(database.select_by_vertex_name(other_name))
+            result = result.append(database.select_by_vertex_name(other_name))
 
         # keep only historic values
         result = result.loc[result['time_window'] < current_time_window]
 
         # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        result = result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
 
         if self.limit is not None:
             result = result.head(self.limit)
 
         return result
+
+    def reference_block(self, vertex_name, vertex_type, current_time_window, database):
+        """
+        Returns the block of historic observations, which is shared by all vertices with the same age and type, and a
+        mask, which selects the relevant entries of the given vertex from the block. The block is cached until records
+        are inserted into the database and must not be modified.
+        :param vertex_name: The name of the vertex
+        :param vertex_type: The type of the vertex
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: Tuple of the shared dataframe and a boolean array with an entry per row of the dataframe
+        """
+
+        age = database.first_occurrences.get((vertex_name, vertex_type))
+
+        def select():
+            # the vertex itself is a member of its cohort, a vertex without age has only its own observations
+            names = [vertex_name] if age is None else [name for name, _ in database.cohorts.members(age, vertex_type)]
+            result = database.select_by_vertex_names(names, before_window=current_time_window).rows
+
+            # sort the records by time_window descending AND reset index
+            return result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
+
+        if age is None:
+            block = select()
+        else:
+            block = self.cache.get((age, vertex_type, current_time_window), database, select)
+
+        mask = np.ones(len(block), dtype=bool)
+        if self.limit is not None and len(block) > self.limit:
+            time_windows = block['time_window'].values
+            boundary = time_windows[self.limit - 1]
+            mask = time_windows > boundary
+
+            # on ties at the last kept time window, the observations of the vertex itself come first like in gather()
+            ties = np.flatnonzero(time_windows == boundary)
+            own = block['name'].values[ties] == vertex_name
+            mask[np.concatenate([ties[own], ties[~own]])[:self.limit - np.count_nonzero(mask)]] = True
+
+        return block, mask
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        vertex_cohorts, members = cohort_lookup(database, vertices, same_type=True)
+
+        # materialize the historic observations of every cohort once (sorted by time_window descending)
+        cohort_sizes = np.array([len(cohort) for cohort in members], dtype=np.int64)
+        member_cohorts = np.repeat(np.arange(len(members)), cohort_sizes)
+        observations = database.select_by_vertex_names([name for cohort in members for name, _ in cohort],
+                                                       before_window=current_time_window)
+        row_cohorts = member_cohorts[observations.segment_ids()]
+        order = np.lexsort((-np.asarray(observations.rows['time_window'].values, dtype=np.int64), row_cohorts))
+        blocks = observations.rows.iloc[order].reset_index(drop=True)
+
+        # serve every vertex from the block of its cohort and exclude its own rows by mask
+        positions, sizes = repeat_cohorts(np.bincount(row_cohorts, minlength=len(members)), vertex_cohorts)
+        others = SegmentedFrame(blocks.iloc[positions].reset_index(drop=True),
+                                np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64))
+        others = others.filter(others.rows['name'].values != vertices['name'].values[others.segment_ids()])
+
+        # the historic observations of the vertex itself come first
+        own = database.select_by_vertex_names(vertices['name'].values, before_window=current_time_window)
+        segments = np.arange(len(vertices))
+        result = SegmentedFrame.combine([(own, segments), (others, segments)], len(vertices))
+
+        return result.sort_by_time_window().head(self.limit)
@@ -1,3 +1,4 @@
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -32,9 +33,24 @@ class HistoricAllSelection(ObservationSelection):
         result = result.loc[result['time_window'] < current_time_window]
 
         # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        result = result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
 
         if self.limit is not None:
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # all vertices share the same observations
+        result = self.gather(None, None, current_time_window, database)
+
+        return SegmentedFrame.repeat(result, len(vertices))
@@ -1,3 +1,6 @@
+import numpy as np
+
+from .helper.block_cache import BlockCache, limit_mask
 from .observation_selection import ObservationSelection
 
 
@@ -5,9 +8,10 @@ class HistoricSimilarSelection(ObservationSelection):
     """
     This observation selection gathers all historic observations of all recorded vertices of the same type.
     The results can be limited by providing a limit parameter.
+    The observations, which are shared by several vertices, are cached up to cache_size bytes.
     """
 
-    def __init__(self, limit=None):
+    def __init__(self, limit=None, cache_size=64 * 2 ** 20):
         # check whether limit is given and set self.limit if thats the case
         if limit is not None:
             if not isinstance(limit, int) or not limit >= 1:
@@ -15,6 +19,9 @@ class HistoricSimilarSelection(ObservationSelection):
 
         self.limit = limit
 
+        # cache the shared blocks of observations up to cache_size bytes
+        self.cache = BlockCache(max_bytes=cache_size)
+
     def gather(self, vertex_name, vertex_type, current_time_window, database):
         """
         Takes a vertex and a reference to the database.
@@ -26,15 +33,44 @@ class HistoricSimilarSelection(ObservationSelection):
         :return: Dataframe of the relevant entries in the database
         """
 
-        result = database.select_by_vertex_type(vertex_type)
+        block, mask = self.reference_block(vertex_name, vertex_type, current_time_window, database)
+
+        return block[mask].reset_index(drop=True)
 
-        # keep only historic values
-        result = result.loc[result['time_window'] < current_time_window]
+    def reference_block(self, vertex_name, vertex_type, current_time_window, database):
+        """
+        Returns the block of observations, which is shared by all vertices of the same type, and a mask, which selects
+        the relevant entries of the given vertex from the block. The block is cached until records are inserted into the
+        database and must not be modified.
+        :param vertex_name: The name of the vertex
+        :param vertex_type: The type of the vertex
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: Tuple of the shared dataframe and a boolean array with an entry per row of the dataframe
+        """
 
-        # sort the records by time_window descending AND reset index
-        result = result.sort_values(['time_window'], ascending=False).reset_index(drop=True)
+        def select():
+            result = database.select_by_vertex_type(vertex_type)
 
-        if self.limit is not None:
-            result = result.head(self.limit)
+            # keep only historic values
+            result = result.loc[result['time_window'] < current_time_window]
+
+            # sort the records by time_window descending AND reset index
+            return result.sort_values(['time_window'], ascending=False, kind='mergesort').reset_index(drop=True)
+
+        block = self.cache.get((vertex_type, current_time_window), database, select)
+
+        return block, limit_mask(np.ones(len(block), dtype=bool), self.limit)
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
 
-        return result
+        return database.select_by_vertex_types(vertices['type'].values, before_window=current_time_window,
+                                               limit_per_vertex=self.limit)
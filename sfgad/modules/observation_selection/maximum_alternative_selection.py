@@ -1,3 +1,6 @@
+import numpy as np
+
+from .helper.segmented_frame import SegmentedFrame
 from .observation_selection import ObservationSelection
 
 
@@ -45,3 +48,26 @@ class MaximumAlternativeSelection(ObservationSelection):
             result = result.head(self.limit)
 
         return result
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once (one segment per vertex).
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+
+        # get the results from both rules
+        result_first_rule = self.first_rule.gather_many(vertices, current_time_window, database)
+        result_second_rule = self.second_rule.gather_many(vertices, current_time_window, database)
+
+        # decide for each vertex which rule yielded more observations
+        use_second = result_second_rule.sizes() > result_first_rule.sizes()
+        first, second = np.flatnonzero(~use_second), np.flatnonzero(use_second)
+
+        result = SegmentedFrame.combine([(result_first_rule.take_segments(first), first),
+                                         (result_second_rule.take_segments(second), second)], len(vertices))
+
+        return result.head(self.limit)
@@ -1,5 +1,7 @@
 import abc
 
+from .helper.segmented_frame import SegmentedFrame
+
 
 class ObservationSelection:
     @abc.abstractmethod
@@ -13,3 +15,17 @@ class ObservationSelection:
         :param database: The reference to the Database
         :return: Dataframe of the relevant entries in the database
         """
+
+    def gather_many(self, vertices, current_time_window, database):
+        """
+        Takes several vertices and a reference to the database.
+        Returns the relevant entries of all vertices at once. Segment i of the result contains the same rows as
+        gather() for the i-th vertex. Rules should override this method with a vectorized implementation, the
+        default implementation calls gather() for every vertex.
+        :param vertices: Dataframe with the columns 'name' and 'type' of the vertices
+        :param current_time_window: The current time step
+        :param database: The reference to the Database
+        :return: SegmentedFrame with one segment per vertex
+        """
+        return SegmentedFrame.from_frames([self.gather(vertex_name, vertex_type, current_time_window, database)
+                                           for vertex_name, vertex_type in zip(vertices['name'], vertices['type'])])
@@ -1,6 +1,8 @@
 import numpy as np
+import pandas as pd
 
-from sfgad.utils.validation import check_p_values
+from sfgad.utils.observation_block import ObservationBlock
+from sfgad.utils.validation import check_p_values, check_weights
 from .probability_combiner import ProbabilityCombiner
 
 
@@ -13,72 +15,87 @@ class EmpiricalCombiner(ProbabilityCombiner):
 
         self.direction = direction
 
-    def combine(self, p_values, ref_p_values=None):
+    def combine(self, p_values, ref_p_values=None, ref_weights=None):
         """
-        Takes a list of p_values and combines them into a single p_value by calculating the average.
+        Takes a list of p_values and combines them into a single p_value by comparing the minimal p_value with the
+        minimal p_values of the reference observations.
         :param p_values: a list of p_values of features.
-        :param ref_p_values: p-values of reference observations.
+        :param ref_p_values: p-values of reference observations (array, block or dataframe). The columns 'name' and
+        'time_window' of a dataframe are ignored.
+        :param ref_weights: Optional weights of the reference observations. By default, all reference observations are
+        weighted equally.
         :return: The combined p-value.
         """
         ### INPUT VALIDATION
 
         p_values = check_p_values(p_values)
 
-        # # assert p_values is a list
-        # assert type(p_values) == list
-        #
-        # # check that p_values is not empty
-        # if len(p_values) == 0:
-        #     raise ValueError('The given list of p_values is empty')
-        #
-        # # check that all elements in p_values are floats
-        # if not all(isinstance(x, (int, float)) for x in p_values):
-        #     raise ValueError('The elements in p_values should all be of the type \'float\'')
-
         # check that ref_p_values are given
         if ref_p_values is None:
             raise ValueError('The empirical combiner needs reference p values to calculate the combined p value!')
 
-        # assert ref_p_values is a ndarray
-        assert type(ref_p_values) == np.ndarray
+        # assert ref_p_values is a ndarray, a dataframe or a block
+        assert isinstance(ref_p_values, (np.ndarray, pd.DataFrame, ObservationBlock))
+
+        if isinstance(ref_p_values, ObservationBlock):
+            ref_p_values = ref_p_values.values
+        elif isinstance(ref_p_values, pd.DataFrame):
+            ref_p_values = ref_p_values.drop(columns=['name', 'time_window'], errors='ignore').values
+
+        # check that the reference p_values of each reference observation are all floats (or integers), without
+        # converting other values like strings
+        ref_p_values = np.asarray(ref_p_values)
+        if ref_p_values.dtype.kind not in 'biuf' and not (
+                ref_p_values.dtype.kind == 'O' and all(isinstance(x, (int, float, np.number)) for x in ref_p_values.flat)):
+            raise ValueError('The p_values of each reference observation should all be of the type \'float\'')
+        ref_p_values = ref_p_values.astype(np.float64)
 
-        # check that the reference p_values of each reference observation are all floats (or integers)
-        for ref in ref_p_values:
-            if not all(isinstance(x, (int, float)) for x in ref):
-                raise ValueError('The p_values of each reference observation should all be of the type \'float\'')
+        if ref_p_values.ndim == 1:
+            ref_p_values = ref_p_values[:, None]
+
+        if ref_weights is None:
+            ref_weights = np.ones(len(ref_p_values))
+        else:
+            ref_weights = check_weights(ref_weights, ref_p_values)
 
         ### FUNCTION CODE
 
         min_ref_p_values = ref_p_values.min(axis=1)
 
-        combined_p_values = np.apply_along_axis(
-            lambda x: self.empirical(min(x), min_ref_p_values, weights=np.ones(len(min_ref_p_values)),
-                                     direction=self.direction), axis=1, arr=p_values)
-
-        return combined_p_values
+        return self.empirical(p_values.min(axis=1), min_ref_p_values, weights=ref_weights, direction=self.direction)
 
     def empirical(self, value, references, weights, direction):
         """
-        Execute the empirical p-value combination.
-        :param value: the given minimal p-value
+        Execute the empirical p-value combination. The references are sorted once and all values are looked up in the
+        cumulated weights of the sorted references.
+        :param value: the given minimal p-value or an array of minimal p-values
         :param references: the minimal p_values of the reference observations
         :param weights: weights for the reference observations
         :param direction: direction for the empirical calculation.
-        :return: the empirical p_value
+        :return: the empirical p_value or an array of empirical p-values
         """
+        if direction not in ['right-tailed', 'left-tailed']:
+            raise ValueError("The given direction for empirical calculation is not known.")
+
+        references = np.asarray(references, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
         isnan = np.isnan(references)
 
+        order = np.argsort(references[~isnan], kind='mergesort')
+        references = references[~isnan][order]
+        cum_weights = np.concatenate([[0.0], np.cumsum(weights[~isnan][order])])
+
         if direction == 'right-tailed':
-            conditions = references[~isnan] >= value
-        elif direction == 'left-tailed':
-            conditions = references[~isnan] <= value
+            # sum of the weights of all references >= value
+            conditional_weights = cum_weights[-1] - cum_weights[np.searchsorted(references, value, side='left')]
         else:
-            raise ValueError("The given direction for empirical calculation is not known.")
+            # sum of the weights of all references <= value
+            conditional_weights = cum_weights[np.searchsorted(references, value, side='right')]
 
-        sum_all_weights = weights[~isnan].sum()
-        sum_conditional_weights = (conditions * weights[~isnan]).sum()
+        # values, which are nan, are not comparable
+        conditional_weights = np.where(np.isnan(value), np.nan, conditional_weights)
 
-        if sum_all_weights == 0:
-            return np.nan
+        if cum_weights[-1] == 0:
+            return conditional_weights * np.nan
 
-        return sum_conditional_weights / sum_all_weights
+        return conditional_weights / cum_weights[-1]
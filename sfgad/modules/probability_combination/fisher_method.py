@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.stats import combine_pvalues
+from scipy.special import chdtrc
 
 from sfgad.utils.validation import check_p_values
 from .probability_combiner import ProbabilityCombiner
@@ -27,6 +27,9 @@ class FisherMethod(ProbabilityCombiner):
         # if not all(isinstance(x, (int, float)) for x in p_values):
         #     raise ValueError('The elements in p_values should all be of the type \'float\'')
 
-        combined_p_values = np.apply_along_axis(lambda x: combine_pvalues(x, method='fisher')[1], axis=1, arr=p_values)
+        # the statistic -2 * sum(log(p)) of every row follows a chi-square distribution with 2 * n degrees of freedom
+        with np.errstate(divide='ignore', invalid='ignore'):
+            statistics = -2 * np.sum(np.log(p_values), axis=1)
+        combined_p_values = chdtrc(2 * p_values.shape[1], statistics)
 
         return combined_p_values
@@ -1,11 +1,23 @@
 import numpy as np
-from scipy.stats import combine_pvalues
+from scipy.special import ndtr, ndtri
 
 from sfgad.utils.validation import check_p_values
 from .probability_combiner import ProbabilityCombiner
 
 
 class StoufferMethod(ProbabilityCombiner):
+    def __init__(self, weights=None):
+        """
+        :param weights: Optional weights of the features. By default, all features are weighted equally.
+        """
+        if weights is not None:
+            weights = np.array(weights, dtype=np.float64)
+
+            if weights.ndim != 1 or len(weights) == 0:
+                raise ValueError("The given parameter 'weights' should be a non-empty 1-d array!")
+
+        self.weights = weights
+
     def combine(self, p_values, ref_p_values=None):
         """
         Takes a list of p_values and combines them into a single p_value using the Stouffer’s Z-score method.
@@ -27,7 +39,14 @@ class StoufferMethod(ProbabilityCombiner):
         # if not all(isinstance(x, (int, float)) for x in p_values):
         #     raise ValueError('The elements in p_values should all be of the type \'float\'')
 
-        combined_p_values = np.apply_along_axis(lambda x: combine_pvalues(x, method='stouffer')[1], axis=1,
-                                                arr=p_values)
+        weights = np.ones(p_values.shape[1]) if self.weights is None else self.weights
+        if len(weights) != p_values.shape[1]:
+            raise ValueError("Length of supplied weights is not consistent with the number of features.")
+
+        # the weighted sum of the z-scores of every row is normally distributed
+        # z-scores of p_values 0 and 1 are infinite, their sum is nan like in scipy
+        z_scores = -ndtri(p_values)
+        with np.errstate(invalid='ignore'):
+            combined_p_values = ndtr(-(z_scores @ weights) / np.linalg.norm(weights))
 
         return combined_p_values
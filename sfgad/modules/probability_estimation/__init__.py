@@ -1,4 +1,5 @@
 from .empirical_estimator import EmpiricalEstimator
+from .estimator_cache import EstimatorCache
 from .exponential import Exponential
 from .gaussian import Gaussian
 from .uniform import Uniform
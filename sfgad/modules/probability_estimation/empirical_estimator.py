@@ -1,7 +1,10 @@
+import copy
+
 import numpy as np
 
-from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations
-from .probability_estimator import ProbabilityEstimator
+from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations, \
+    check_offsets
+from .probability_estimator import ProbabilityEstimator, check_segment_observations, segment_sums, segment_ids
 
 
 class EmpiricalEstimator(ProbabilityEstimator):
@@ -24,19 +27,48 @@ class EmpiricalEstimator(ProbabilityEstimator):
         # Insert a sentinel row with 0 to the beginning of the cumulated weights
         self.cum_weights = np.insert(self.cum_weights, 0, 0, axis=0)
 
+        # No reference observations are left out yet
+        self.left_out_observations = np.empty((0, reference_observations.shape[1]))
+        self.left_out_weights = np.empty(0)
+
+    def leave_out(self, reference_observations, weights, mask):
+        """
+        Returns a copy of the fitted estimator, which is fitted as if only the reference observations selected by mask
+        were given to the last fit. The sorted reference observations are kept and the cumulated weights of the left
+        out reference observations are subtracted during the transformation.
+        :param reference_observations: (m x n) array with the reference observations of the last fit.
+        :param weights: The weights of the last fit.
+        :param mask: Boolean array, which is True for the reference observations that are kept.
+        :return: the fitted estimator.
+        """
+        estimator = copy.copy(self)
+        estimator.left_out_observations = np.concatenate([self.left_out_observations, reference_observations[~mask]])
+        estimator.left_out_weights = np.concatenate([self.left_out_weights, weights[~mask]])
+
+        return estimator
+
     def transform(self, observations):
         check_is_fitted(self, ["reference_observations", "cum_weights"])
         observations = check_observations(observations, n_features=len(self.reference_observations.T))
 
+        # Weights of the left out reference observations are subtracted from the cumulated weights
+        left_out = getattr(self, 'left_out_observations', np.empty((0, observations.shape[1])))
+        left_out_weights = getattr(self, 'left_out_weights', np.empty(0))
+        total = self.cum_weights[-1] - np.sum(left_out_weights)
+
         p_values = np.empty_like(observations.T)
-        for i, (x, y, w) in enumerate(zip(self.reference_observations.T, observations.T, self.cum_weights.T)):
+        for i, (x, y, w, z) in enumerate(zip(self.reference_observations.T, observations.T, self.cum_weights.T,
+                                             left_out.T)):
+            less = w[np.searchsorted(x, y, side="left")] - (z[None, :] < y[:, None]) @ left_out_weights
+            less_equal = w[np.searchsorted(x, y, side="right")] - (z[None, :] <= y[:, None]) @ left_out_weights
+
             if self.direction == 'right-tailed':
-                p_values[i] = 1 - w[np.searchsorted(x, y, side="left")] / w[-1]
+                p_values[i] = 1 - less / total[i]
             elif self.direction == 'left-tailed':
-                p_values[i] = w[np.searchsorted(x, y, side="right")] / w[-1]
+                p_values[i] = less_equal / total[i]
             else:
-                p_values_right = 1 - w[np.searchsorted(x, y, side="left")] / w[-1]
-                p_values_left = w[np.searchsorted(x, y, side="right")] / w[-1]
+                p_values_right = 1 - less / total[i]
+                p_values_left = less_equal / total[i]
                 p_values[i] = np.clip(2 * np.minimum(p_values_right, p_values_left), 0.0, 1.0)
 
         # Fill all nan values with 1.0. This happens if the standard deviation is zero.
@@ -44,6 +76,53 @@ class EmpiricalEstimator(ProbabilityEstimator):
 
         return p_values.T
 
+    def fit_segments(self, reference_observations, weights, offsets):
+        """
+        Fits the estimator to several segments of reference observations at once. The reference observations of
+        segment i are reference_observations[offsets[i]:offsets[i + 1]].
+        :param reference_observations: (m x n) array with the reference observations of all segments.
+        :param weights: Array with a weight for every reference observation.
+        :param offsets: Array with the k + 1 offsets of the k segments.
+        """
+        reference_observations = check_reference_observations(reference_observations)
+        weights = check_weights(weights, reference_observations)
+
+        self.segment_offsets = check_offsets(offsets, reference_observations)
+        self.segment_reference_observations = reference_observations
+        self.segment_weights = weights
+
+    def transform_segments(self, observations):
+        """
+        Returns the p_values of one observation per segment fitted by fit_segments().
+        :param observations: (k x n) array with the observation of every segment.
+        :return: (k x n) array of p_values.
+        """
+        check_is_fitted(self, ["segment_offsets", "segment_reference_observations", "segment_weights"])
+        observations = check_segment_observations(observations, len(self.segment_offsets) - 1,
+                                                  self.segment_reference_observations.shape[1])
+
+        # Compare every reference observation with the observation of its segment and sum up the weights per segment
+        reference_observations, weights, offsets = \
+            self.segment_reference_observations, self.segment_weights[:, None], self.segment_offsets
+        segment_observations = observations[segment_ids(offsets)]
+
+        less = segment_sums(weights * (reference_observations < segment_observations), offsets)
+        less_equal = segment_sums(weights * (reference_observations <= segment_observations), offsets)
+        total = segment_sums(self.segment_weights, offsets)[:, None]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if self.direction == 'right-tailed':
+                p_values = 1 - less / total
+            elif self.direction == 'left-tailed':
+                p_values = less_equal / total
+            else:
+                p_values = np.clip(2 * np.minimum(1 - less / total, less_equal / total), 0.0, 1.0)
+
+        # Fill all nan values with 1.0. This happens if the standard deviation is zero.
+        p_values[np.isnan(p_values)] = 1.0
+
+        return p_values
+
     def estimate(self, features_values, reference_features_values, weights):
         """
         Takes a vertex and a reference to the database.
@@ -0,0 +1,86 @@
+import copy
+from collections import OrderedDict
+
+import numpy as np
+
+from sfgad.utils.memory import memory_report
+from sfgad.utils.validation import check_weights, check_reference_observations
+
+
+class EstimatorCache:
+    """
+    Fits a probability estimator only once for a block of reference observations, which is shared by several vertices,
+    and the corresponding weights. Blocks and weights are identified by identity, so both must not be modified while
+    they are in use. The rows, which are not relevant for a vertex (e.g. its own observation), are left out of the
+    fitted estimator with leave_out().
+    """
+
+    def __init__(self, estimator, max_entries=32):
+        # check whether max_entries is a positive integer
+        if not isinstance(max_entries, int) or not max_entries >= 1:
+            raise ValueError("The given parameter 'max_entries' should be an integer and >= 1!")
+
+        self.estimator = estimator
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def estimate(self, features_values, reference_block, columns, weights, mask):
+        """
+        Returns a p_value for each given feature value based on the rows of the reference block selected by mask.
+        :param features_values: (1 x n) dataframe with a value for each feature.
+        :param reference_block: Dataframe with the shared reference observations.
+        :param columns: The n feature columns of the reference block.
+        :param weights: Array with a weight for every row of the reference block.
+        :param mask: Boolean array, which is True for the rows of the reference block that are used.
+        :return: List of p_values.
+        """
+        key = (id(reference_block), id(weights))
+        entry = self.entries.get(key)
+
+        # the ids are only valid, while the cached objects are alive
+        if entry is None or entry[0] is not reference_block or entry[1] is not weights:
+            reference_observations = check_reference_observations(reference_block[columns])
+            weights_array = check_weights(weights, reference_observations)
+
+            estimator = copy.copy(self.estimator)
+            estimator.fit(reference_observations, weights_array)
+
+            entry = (reference_block, weights, reference_observations, weights_array, estimator)
+            self.entries[key] = entry
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+
+        _, _, reference_observations, weights_array, estimator = entry
+        mask = np.asarray(mask, dtype=bool)
+
+        if np.count_nonzero(~mask) > np.count_nonzero(mask):
+            # refitting is cheaper than leaving out most of the reference observations
+            estimator = copy.copy(self.estimator)
+            estimator.fit(reference_observations[mask], weights_array[mask])
+        elif not mask.all():
+            estimator = estimator.leave_out(reference_observations, weights_array, mask)
+
+        return estimator.transform(features_values)
+
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of the cached blocks and fitted estimators.
+        :return: dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        return memory_report(self, ['entries'])
+
+    def clear(self):
+        """
+        Removes all fitted estimators from the cache.
+        """
+        self.entries = OrderedDict()
+
+    def __getstate__(self):
+        # the fitted estimators are not part of the state, e.g. when the analyzer is sent to another process
+        return {'estimator': self.estimator, 'max_entries': self.max_entries}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.clear()
@@ -1,8 +1,12 @@
+import copy
+
 import numpy as np
+import scipy.special as sp
 import scipy.stats as st
 
-from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations
-from .probability_estimator import ProbabilityEstimator
+from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations, \
+    check_offsets
+from .probability_estimator import ProbabilityEstimator, check_segment_observations, segment_sums
 
 
 class Exponential(ProbabilityEstimator):
@@ -17,7 +21,33 @@ class Exponential(ProbabilityEstimator):
         reference_observations = check_reference_observations(reference_observations)
         weights = check_weights(weights, reference_observations)
 
-        self.means = np.average(reference_observations, axis=0, weights=weights)
+        self.sum_weights = np.sum(weights)
+        if self.sum_weights > 0:
+            self.means = np.average(reference_observations, axis=0, weights=weights)
+        else:
+            # reference observations without weights get nan parameters, like the segments in fit_segments()
+            self.means = np.full(reference_observations.shape[1], np.nan)
+
+    def leave_out(self, reference_observations, weights, mask):
+        """
+        Returns a copy of the fitted estimator, which is fitted as if only the reference observations selected by mask
+        were given to the last fit. The means are corrected by the contributions of the
+        left out reference observations.
+        :param reference_observations: (m x n) array with the reference observations of the last fit.
+        :param weights: The weights of the last fit.
+        :param mask: Boolean array, which is True for the reference observations that are kept.
+        :return: the fitted estimator.
+        """
+        left_out, left_out_weights = reference_observations[~mask], weights[~mask]
+        sum_weights = self.sum_weights - np.sum(left_out_weights)
+        if not sum_weights > 0:
+            return super().leave_out(reference_observations, weights, mask)
+
+        estimator = copy.copy(self)
+        estimator.means = (self.sum_weights * self.means - left_out_weights @ left_out) / sum_weights
+        estimator.sum_weights = sum_weights
+
+        return estimator
 
     def transform(self, observations):
         check_is_fitted(self, "means")
@@ -37,6 +67,49 @@ class Exponential(ProbabilityEstimator):
 
         return p_values
 
+    def fit_segments(self, reference_observations, weights, offsets):
+        """
+        Fits a mean for every segment of reference observations at once. The reference observations of segment i are
+        reference_observations[offsets[i]:offsets[i + 1]].
+        :param reference_observations: (m x n) array with the reference observations of all segments.
+        :param weights: Array with a weight for every reference observation.
+        :param offsets: Array with the k + 1 offsets of the k segments.
+        """
+        reference_observations = check_reference_observations(reference_observations)
+        weights = check_weights(weights, reference_observations)
+        offsets = check_offsets(offsets, reference_observations)
+
+        # empty segments and segments without weights get nan parameters
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sum_weights = segment_sums(weights, offsets)[:, None]
+            self.segment_means = segment_sums(weights[:, None] * reference_observations, offsets) / sum_weights
+
+    def transform_segments(self, observations):
+        """
+        Returns the p_values of one observation per segment fitted by fit_segments().
+        :param observations: (k x n) array with the observation of every segment.
+        :return: (k x n) array of p_values.
+        """
+        check_is_fitted(self, "segment_means")
+        observations = check_segment_observations(observations, *self.segment_means.shape)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cdf = -sp.expm1(-np.maximum(observations, 0) / self.segment_means)
+        # the distribution is undefined, if the mean is not positive
+        cdf[~(self.segment_means > 0)] = np.nan
+
+        if self.direction == 'right-tailed':
+            p_values = 1 - cdf
+        elif self.direction == 'left-tailed':
+            p_values = cdf
+        else:
+            p_values = 2 * np.minimum(1 - cdf, cdf)
+
+        # Fill all nan values with 1.0. This happens if the standard deviation is zero.
+        p_values[np.isnan(p_values)] = 1.0
+
+        return p_values
+
     def estimate(self, features_values, reference_features_values, weights):
         """
         Takes a vertex and a reference to the database.
@@ -1,4 +1,11 @@
 import abc
+import copy
+
+import numpy as np
+
+from sfgad.utils.memory import memory_report
+from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations, \
+    check_offsets
 
 
 class ProbabilityEstimator(metaclass=abc.ABCMeta):
@@ -14,3 +21,109 @@ class ProbabilityEstimator(metaclass=abc.ABCMeta):
         :param weights: (m x 2) dataframe with weights for the different windows.
         :return: List of p_values.
         """
+
+    def memory_report(self):
+        """
+        Returns the number of entries and the approximate memory usage of the fitted state of the estimator, e.g. the
+        kept reference observations or the estimators of the segments.
+        :return: dictionary with a dictionary (entries, bytes) for every structure.
+        """
+        return memory_report(self)
+
+    def leave_out(self, reference_observations, weights, mask):
+        """
+        Returns a copy of the fitted estimator, which is fitted as if only the reference observations selected by mask
+        were given to the last fit. By default, the estimator is refitted.
+        :param reference_observations: (m x n) array with the reference observations of the last fit.
+        :param weights: The weights of the last fit.
+        :param mask: Boolean array, which is True for the reference observations that are kept.
+        :return: the fitted estimator.
+        """
+        estimator = copy.copy(self)
+        estimator.fit(reference_observations[mask], weights[mask])
+
+        return estimator
+
+    def fit_segments(self, reference_observations, weights, offsets):
+        """
+        Fits the estimator to several groups (segments) of reference observations at once. The reference observations
+        of segment i are reference_observations[offsets[i]:offsets[i + 1]]. By default, a copy of the estimator is
+        fitted for every segment.
+        :param reference_observations: (m x n) array with the reference observations of all segments.
+        :param weights: Array with a weight for every reference observation.
+        :param offsets: Array with the k + 1 offsets of the k segments.
+        """
+        reference_observations = check_reference_observations(reference_observations)
+        weights = check_weights(weights, reference_observations)
+        offsets = check_offsets(offsets, reference_observations)
+
+        self.segment_estimators = []
+        for start, end in zip(offsets[:-1], offsets[1:]):
+            estimator = None
+            if end > start:
+                estimator = copy.copy(self)
+                estimator.fit(reference_observations[start:end], weights[start:end])
+            self.segment_estimators.append(estimator)
+        self.n_segment_features = reference_observations.shape[1]
+
+    def transform_segments(self, observations):
+        """
+        Returns the p_values of one observation per segment fitted by fit_segments(). The p_values of empty segments
+        are 1.0.
+        :param observations: (k x n) array with the observation of every segment.
+        :return: (k x n) array of p_values.
+        """
+        check_is_fitted(self, ["segment_estimators", "n_segment_features"])
+        observations = check_segment_observations(observations, len(self.segment_estimators),
+                                                  self.n_segment_features)
+
+        p_values = np.ones_like(observations)
+        for i, estimator in enumerate(self.segment_estimators):
+            if estimator is not None:
+                p_values[i] = estimator.transform(observations[i:i + 1])[0]
+
+        return p_values
+
+
+def check_segment_observations(observations, n_segments, n_features):
+    """
+    Checks the observations given to transform_segments().
+    :param observations: The observations with one row per segment.
+    :param n_segments: The number of fitted segments.
+    :param n_features: The number of features.
+    :return: (k x n) array of observations.
+    """
+    observations = check_observations(observations, n_features=n_features)
+
+    if len(observations) != n_segments:
+        raise ValueError("Found %d observations, but expected one observation for each of the %d segments."
+                         % (len(observations), n_segments))
+
+    return observations
+
+
+def segment_sums(values, offsets):
+    """
+    Sums up the rows of values for every segment. The sum of an empty segment is 0.
+    :param values: (m x ...) array.
+    :param offsets: Array with the k + 1 offsets of the k segments.
+    :return: (k x ...) array with the sums.
+    """
+    sizes = np.diff(offsets)
+    sums = np.zeros((len(sizes),) + values.shape[1:])
+
+    # reduceat does not support empty segments, but the rows of a non-empty segment end at the next non-empty segment
+    non_empty = sizes > 0
+    if np.any(non_empty):
+        sums[non_empty] = np.add.reduceat(values, offsets[:-1][non_empty], axis=0)
+
+    return sums
+
+
+def segment_ids(offsets):
+    """
+    Returns the segment of every row.
+    :param offsets: Array with the k + 1 offsets of the k segments.
+    :return: array with the index of the segment of every row.
+    """
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
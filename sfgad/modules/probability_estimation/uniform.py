@@ -1,8 +1,9 @@
 import numpy as np
 import scipy.stats as st
 
-from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations
-from .probability_estimator import ProbabilityEstimator
+from sfgad.utils.validation import check_is_fitted, check_weights, check_observations, check_reference_observations, \
+    check_offsets
+from .probability_estimator import ProbabilityEstimator, check_segment_observations
 
 
 class Uniform(ProbabilityEstimator):
@@ -20,6 +21,22 @@ class Uniform(ProbabilityEstimator):
         self.mins = np.min(reference_observations, axis=0)
         self.maxs = np.max(reference_observations, axis=0)
 
+    def leave_out(self, reference_observations, weights, mask):
+        """
+        Returns a copy of the fitted estimator, which is fitted as if only the reference observations selected by mask
+        were given to the last fit. The estimator is only refitted, if a minimum or
+        maximum is left out.
+        :param reference_observations: (m x n) array with the reference observations of the last fit.
+        :param weights: The weights of the last fit.
+        :param mask: Boolean array, which is True for the reference observations that are kept.
+        :return: the fitted estimator.
+        """
+        left_out = reference_observations[~mask]
+        if np.any(left_out == self.mins) or np.any(left_out == self.maxs):
+            return super().leave_out(reference_observations, weights, mask)
+
+        return self
+
     def transform(self, observations):
         check_is_fitted(self, ["mins", "maxs"])
         observations = check_observations(observations, n_features=len(self.mins))
@@ -38,6 +55,55 @@ class Uniform(ProbabilityEstimator):
 
         return p_values
 
+    def fit_segments(self, reference_observations, weights, offsets):
+        """
+        Fits a minimum and a maximum for every segment of reference observations at once. The reference observations
+        of segment i are reference_observations[offsets[i]:offsets[i + 1]].
+        :param reference_observations: (m x n) array with the reference observations of all segments.
+        :param weights: Array with a weight for every reference observation.
+        :param offsets: Array with the k + 1 offsets of the k segments.
+        """
+        reference_observations = check_reference_observations(reference_observations)
+        weights = check_weights(weights, reference_observations)
+        offsets = check_offsets(offsets, reference_observations)
+
+        # empty segments get nan parameters
+        n_segments, n_features = len(offsets) - 1, reference_observations.shape[1]
+        self.segment_mins = np.full((n_segments, n_features), np.nan)
+        self.segment_maxs = np.full((n_segments, n_features), np.nan)
+
+        non_empty = np.diff(offsets) > 0
+        if np.any(non_empty):
+            self.segment_mins[non_empty] = np.minimum.reduceat(reference_observations, offsets[:-1][non_empty], axis=0)
+            self.segment_maxs[non_empty] = np.maximum.reduceat(reference_observations, offsets[:-1][non_empty], axis=0)
+
+    def transform_segments(self, observations):
+        """
+        Returns the p_values of one observation per segment fitted by fit_segments().
+        :param observations: (k x n) array with the observation of every segment.
+        :return: (k x n) array of p_values.
+        """
+        check_is_fitted(self, ["segment_mins", "segment_maxs"])
+        observations = check_segment_observations(observations, *self.segment_mins.shape)
+
+        scales = self.segment_maxs - self.segment_mins
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cdf = np.clip((observations - self.segment_mins) / scales, 0.0, 1.0)
+        # the distribution is undefined, if the minimum equals the maximum
+        cdf[~(scales > 0)] = np.nan
+
+        if self.direction == 'right-tailed':
+            p_values = 1 - cdf
+        elif self.direction == 'left-tailed':
+            p_values = cdf
+        else:
+            p_values = 2 * np.minimum(1 - cdf, cdf)
+
+        # Fill all nan values with 1.0. This happens if the standard deviation is zero.
+        p_values[np.isnan(p_values)] = 1.0
+
+        return p_values
+
     def estimate(self, features_values, reference_features_values, weights):
         """
         Takes a vertex and a reference to the database.
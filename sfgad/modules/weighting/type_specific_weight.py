@@ -1,5 +1,7 @@
 import numpy as np
+import pandas as pd
 
+from sfgad.utils.observation_block import ObservationBlock
 from sfgad.utils.validation import check_meta_info_series, check_meta_info_dataframe
 from .weighting import Weighting
 
@@ -16,11 +18,14 @@ class TypeSpecificWeight(Weighting):
         check_meta_info_dataframe(reference_meta_info, required_columns=['type'])
         check_meta_info_series(current_meta_info, required_columns=[])
 
-        if not set(list(reference_meta_info['type'])).issubset(set(self.type_dict.keys())):
+        # look up the weight of every distinct type once
+        if isinstance(reference_meta_info, ObservationBlock):
+            type_codes, types = reference_meta_info.type_codes, reference_meta_info.types
+        else:
+            type_codes, types = pd.factorize(reference_meta_info['type'])
+
+        if not set(types).issubset(set(self.type_dict.keys())):
             raise ValueError("Found DataFrame with types %s that have no specified weight." % set(
-                list(reference_meta_info['type'])).difference(self.type_dict.keys()))
+                types).difference(self.type_dict.keys()))
 
-        if len(reference_meta_info['type']):
-            return np.vectorize(self.type_dict.__getitem__)(reference_meta_info['type'])
-        else:
-            np.array([])
+        return np.array([self.type_dict[t] for t in types], dtype=np.float64)[type_codes]
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from sfgad.aggregation.csr_graph import CSRGraph, union_find
+
+
+class TestCSRGraph(TestCase):
+    def setUp(self):
+        self.df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 4,
+                                      'E_NAME': ['0_1', '1_2', '2_0', '1_0'],
+                                      'E_TYPE': ['0_1', '1_0', '0_0', '1_0'],
+                                      'SRC_NAME': ['0', '1', '2', '1'],
+                                      'SRC_TYPE': ['0', '1', '0', '1'],
+                                      'DST_NAME': ['1', '2', '0', '0'],
+                                      'DST_TYPE': ['1', '0', '0', '0'],
+                                      })
+        self.df_p = pd.DataFrame({'name': ['0', '1', '2', '3'],
+                                  'p_value': [0.5, 0.1, 0.3, 0.0]
+                                  })
+
+    def test_from_frames(self):
+        graph = CSRGraph.from_frames(self.df_edges, self.df_p)
+
+        # the vertex 3 has no edges and the vertices are sorted by p-value
+        self.assertEqual(len(graph), 3)
+        np.testing.assert_array_equal(graph.names, ['1', '2', '0'])
+        np.testing.assert_array_equal(graph.types, ['1', '0', '0'])
+        np.testing.assert_array_equal(graph.p, [0.1, 0.3, 0.5])
+        np.testing.assert_array_equal(graph.type_order, ['0', '1'])
+
+        # duplicate edges are removed
+        np.testing.assert_array_equal(graph.indptr, [0, 2, 4, 6])
+        np.testing.assert_array_equal(graph.indices, [1, 2, 0, 2, 0, 1])
+
+    def test_neighbors(self):
+        graph = CSRGraph.from_frames(self.df_edges, self.df_p)
+
+        np.testing.assert_array_equal(graph.neighbors([2]), [0, 1])
+        np.testing.assert_array_equal(graph.neighbors([0, 1]), [1, 2, 0, 2])
+        np.testing.assert_array_equal(graph.neighbors([]), [])
+
+    def test_components(self):
+        graph = CSRGraph.from_frames(self.df_edges, self.df_p)
+
+        np.testing.assert_array_equal(graph.components(np.array([True, True, True])), [0, 0, 0])
+        np.testing.assert_array_equal(graph.components(np.array([True, False, True])), [0, -1, 0])
+        np.testing.assert_array_equal(graph.components(np.array([False, False, False])), [-1, -1, -1])
+
+    def test_union_find(self):
+        src = np.array([5, 1, 3, 6, 7])
+        dst = np.array([3, 4, 0, 8, 8])
+
+        np.testing.assert_array_equal(union_find(10, src, dst), [0, 1, 2, 0, 1, 0, 6, 6, 6, 9])
+        np.testing.assert_array_equal(union_find(3, np.array([], dtype=int), np.array([], dtype=int)), [0, 1, 2])
+
+    def test_unknown_vertex(self):
+        self.assertRaises(ValueError, CSRGraph.from_frames, self.df_edges, self.df_p.iloc[1:])
+
+    def test_shared_memory(self):
+        graph = CSRGraph.from_frames(self.df_edges, self.df_p)
+        blocks, spec = graph.to_shared_memory()
+
+        try:
+            shared_graph, shared_blocks = CSRGraph.from_shared_memory(spec)
+
+            np.testing.assert_array_equal(shared_graph.p, graph.p)
+            np.testing.assert_array_equal(shared_graph.neighbors([0, 2]), graph.neighbors([0, 2]))
+
+            del shared_graph
+            for block in shared_blocks:
+                block.close()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def test_import_without_shared_memory(self):
+        # e.g. on Python < 3.8, the scan with a single process does not need shared memory
+        code = ("import sys; sys.modules['multiprocessing.shared_memory'] = None; "
+                "import sfgad.aggregation.graph_scan")
+
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
@@ -1,8 +1,10 @@
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from sfgad.aggregation import graph_scan as gs
+from sfgad.aggregation.csr_graph import CSRGraph
 
 
 class TestGraphScan(TestCase):
@@ -76,3 +78,202 @@ class TestGraphScan(TestCase):
                              })
         subgraph, score = gs.scan(df_edges, df_p, alpha_max=0.2, K=5, Z=5)
         self.assertEqual(set(subgraph), {'0', '1', '2'})
+
+    def test_growth_per_iteration(self):
+        # the subgraph grows by one hop per iteration, but not beyond the vertex 4 with a p-value above alpha_max
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 6,
+                                 'E_NAME': ['0_1', '1_2', '2_3', '3_4', '4_5', '5_6'],
+                                 'E_TYPE': ['0_0'] * 6,
+                                 'SRC_NAME': ['0', '1', '2', '3', '4', '5'],
+                                 'SRC_TYPE': ['0'] * 6,
+                                 'DST_NAME': ['1', '2', '3', '4', '5', '6'],
+                                 'DST_TYPE': ['0'] * 6,
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4', '5', '6'],
+                             'p_value': [0.2, 0.2, 0.2, 0.1, 0.6, 0.2, 0.2]
+                             })
+        p_graph = gs.create_p_graph(df_edges, df_p)
+        vertices = gs.sort_by_ascending_p(p_graph.nodes(data=True))
+        seed = [v for v in vertices if v[0] == '1'][0]
+
+        subgraph, score = gs.grow_max_subgraph(p_graph, seed, vertices, alpha_max=0.5, Z=1)
+        self.assertEqual({v[0] for v in subgraph}, {'0', '1', '2'})
+
+        subgraph, score = gs.grow_max_subgraph(p_graph, seed, vertices, alpha_max=0.5, Z=10)
+        self.assertEqual({v[0] for v in subgraph}, {'0', '1', '2', '3'})
+
+    def test_get_neighbors(self):
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 3,
+                                 'E_NAME': ['0_1', '1_2', '2_3'],
+                                 'E_TYPE': ['0_0'] * 3,
+                                 'SRC_NAME': ['0', '1', '2'],
+                                 'SRC_TYPE': ['0'] * 3,
+                                 'DST_NAME': ['1', '2', '3'],
+                                 'DST_TYPE': ['0'] * 3,
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3'],
+                             'p_value': [0.4, 0.3, 0.2, 0.1]
+                             })
+        p_graph = gs.create_p_graph(df_edges, df_p)
+        vertices = gs.sort_by_ascending_p(p_graph.nodes(data=True))
+
+        neighbors = gs.get_neighbors(p_graph, vertices, [v for v in vertices if v[0] in ['1', '2']])
+        self.assertEqual([v[0] for v in neighbors], ['3', '0'])
+
+    def test_csr_backend(self):
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 7,
+                                 'E_NAME': ['0_1', '1_2', '2_3', '3_4', '4_5', '0_5', '1_4'],
+                                 'E_TYPE': ['0_1', '1_0', '0_1', '1_0', '0_1', '0_1', '1_0'],
+                                 'SRC_NAME': ['0', '1', '2', '3', '4', '0', '1'],
+                                 'SRC_TYPE': ['0', '1', '0', '1', '0', '0', '1'],
+                                 'DST_NAME': ['1', '2', '3', '4', '5', '5', '4'],
+                                 'DST_TYPE': ['1', '0', '1', '0', '1', '1', '0'],
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4', '5'],
+                             'p_value': [0.0, 0.05, 0.0, 0.15, 0.3, 0.1]
+                             })
+
+        for alpha_max, K, Z in [(0.2, 5, 5), (0.5, 1, 1), (0.5, 5, None), (0.01, 5, 5)]:
+            expected = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=alpha_max, K=K, Z=Z)
+            subgraph, score = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=alpha_max, K=K, Z=Z, backend='csr')
+            self.assertEqual(subgraph, expected[0])
+            self.assertAlmostEqual(score, expected[1])
+
+    def test_csr_backend_empty_graph(self):
+        df_edges = pd.DataFrame(
+            columns=['TIMESTAMP', 'E_NAME', 'E_TYPE', 'SRC_NAME', 'SRC_TYPE', 'DST_NAME', 'DST_TYPE'])
+        df_p = pd.DataFrame(columns=['name', 'p_value'])
+        subgraph, score = gs.scan(df_edges, df_p, alpha_max=0.1, K=5, backend='csr')
+        self.assertEqual(len(subgraph), 0)
+        self.assertEqual(score, 0)
+
+    def test_unknown_backend(self):
+        df_edges = pd.DataFrame(
+            columns=['TIMESTAMP', 'E_NAME', 'E_TYPE', 'SRC_NAME', 'SRC_TYPE', 'DST_NAME', 'DST_TYPE'])
+        df_p = pd.DataFrame(columns=['name', 'p_value'])
+        with self.assertRaises(ValueError):
+            gs.scan(df_edges, df_p, alpha_max=0.1, K=5, backend='igraph')
+
+    def test_parallel_seeds(self):
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 7,
+                                 'E_NAME': ['0_1', '1_2', '2_3', '3_4', '4_5', '0_5', '1_4'],
+                                 'E_TYPE': ['0_1', '1_0', '0_1', '1_0', '0_1', '0_1', '1_0'],
+                                 'SRC_NAME': ['0', '1', '2', '3', '4', '0', '1'],
+                                 'SRC_TYPE': ['0', '1', '0', '1', '0', '0', '1'],
+                                 'DST_NAME': ['1', '2', '3', '4', '5', '5', '4'],
+                                 'DST_TYPE': ['1', '0', '1', '0', '1', '1', '0'],
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4', '5'],
+                             'p_value': [0.0, 0.05, 0.0, 0.15, 0.3, 0.1]
+                             })
+
+        for alpha_max, K, Z in [(0.2, 5, 5), (0.5, 5, None)]:
+            expected = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=alpha_max, K=K, Z=Z)
+            subgraph, score = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=alpha_max, K=K, Z=Z, n_jobs=2)
+            self.assertEqual(subgraph, expected[0])
+            self.assertAlmostEqual(score, expected[1])
+
+        with self.assertRaises(ValueError):
+            gs.scan(df_edges, df_p, alpha_max=0.2, K=5, n_jobs=0)
+
+    def test_seed_pruning(self):
+        # the seeds 1 and 2 lie within the closed subgraph {0, 1, 2} of the seed 0, which scores 3 * log(1 / 0.3, 2),
+        # and score at most 2 * log(1 / 0.25, 2) and 1 * log(1 / 0.2, 2) respectively
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 3,
+                                 'E_NAME': ['0_1', '1_2', '2_3'],
+                                 'E_TYPE': ['0_1', '1_0', '0_0'],
+                                 'SRC_NAME': ['0', '1', '2'],
+                                 'SRC_TYPE': ['0', '1', '0'],
+                                 'DST_NAME': ['1', '2', '3'],
+                                 'DST_TYPE': ['1', '0', '0'],
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3'],
+                             'p_value': [0.3, 0.25, 0.2, 0.9]
+                             })
+        graph = CSRGraph.from_frames(df_edges, df_p)
+        seeds = [graph.names.tolist().index(name) for name in ['2', '1', '0']]
+
+        subgraphs = gs.grow_seeds(graph, seeds, alpha_max=0.5, Z=5)
+        self.assertIsNone(subgraphs[0])
+        self.assertIsNone(subgraphs[1])
+        self.assertEqual(set(graph.names[subgraphs[2][0]]), {'0', '1', '2'})
+
+    def test_bj_statistics(self):
+        alpha = np.array([0.0, 0.05, 0.05, 0.1, 0.5, 0.5, 0.9, 1.0])
+        n_alpha = np.array([3, 0, 2, 5, 1, 4, 4, 2])
+        n = np.array([5, 4, 2, 10, 4, 4, 0, 3])
+
+        expected = [gs.bj_statistic(alpha[i], n_alpha[i], n[i]) for i in range(len(alpha))]
+        np.testing.assert_allclose(gs.bj_statistics(alpha, n_alpha, n), expected, rtol=1e-12)
+
+    def test_relaxed_problem(self):
+        vertices = [('a', {'p': 0.05}), ('b', {'p': 0.1}), ('c', {'p': 0.2})]
+        neighbors = [('d', {'p': 0.01}), ('e', {'p': 0.1}), ('f', {'p': 0.15}), ('g', {'p': 0.3})]
+
+        subgraph, score = gs.relaxed_problem(0.25, vertices, neighbors)
+
+        # on ties the neighbors are merged first and the merge stops after the last vertex
+        self.assertEqual([v[0] for v in subgraph], ['d', 'a', 'e', 'b', 'f', 'c'])
+        expected = max(gs.bj_statistic(0.01, 1, 4), gs.bj_statistic(0.05, 2, 4), gs.bj_statistic(0.1, 3, 5),
+                       gs.bj_statistic(0.1, 4, 5), gs.bj_statistic(0.15, 5, 6), gs.bj_statistic(0.2, 6, 6))
+        self.assertAlmostEqual(score, expected)
+
+        self.assertEqual(gs.relaxed_problem(0.25, [], neighbors), ([], 0))
+
+    def test_multi_alpha(self):
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 7,
+                                 'E_NAME': ['0_1', '1_2', '2_3', '3_4', '4_5', '0_5', '1_4'],
+                                 'E_TYPE': ['0_1', '1_0', '0_1', '1_0', '0_1', '0_1', '1_0'],
+                                 'SRC_NAME': ['0', '1', '2', '3', '4', '0', '1'],
+                                 'SRC_TYPE': ['0', '1', '0', '1', '0', '0', '1'],
+                                 'DST_NAME': ['1', '2', '3', '4', '5', '5', '4'],
+                                 'DST_TYPE': ['1', '0', '1', '0', '1', '1', '0'],
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4', '5'],
+                             'p_value': [0.01, 0.05, 0.0, 0.15, 0.3, 0.1]
+                             })
+        alphas = [0.001, 0.05, 0.1, 0.2, 0.5]
+
+        results = gs.scan_multi_alpha(df_edges, df_p, alphas, K=5, Z=5)
+
+        self.assertEqual(len(results), len(alphas))
+        for alpha_max, (subgraph, score) in zip(alphas, results):
+            expected = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=alpha_max, K=5, Z=5)
+            self.assertEqual(subgraph, expected[0])
+            self.assertAlmostEqual(score, expected[1])
+
+    def test_multi_alpha_invalid_alphas(self):
+        df_edges = pd.DataFrame(
+            columns=['TIMESTAMP', 'E_NAME', 'E_TYPE', 'SRC_NAME', 'SRC_TYPE', 'DST_NAME', 'DST_TYPE'])
+        df_p = pd.DataFrame(columns=['name', 'p_value'])
+
+        self.assertEqual(gs.scan_multi_alpha(df_edges, df_p, [0.1, 0.2], K=5), [(set(), 0), (set(), 0)])
+        self.assertRaises(ValueError, gs.scan_multi_alpha, df_edges, df_p, [], K=5)
+        self.assertRaises(ValueError, gs.scan_multi_alpha, df_edges, df_p, [[0.1, 0.2]], K=5)
+
+    def test_component_bounds(self):
+        # the components {0, 1} and {2, 3} among the vertices with a p-value <= 0.5 and the insignificant vertex 4
+        df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 4,
+                                 'E_NAME': ['0_1', '1_4', '4_2', '2_3'],
+                                 'E_TYPE': ['0_0'] * 4,
+                                 'SRC_NAME': ['0', '1', '4', '2'],
+                                 'SRC_TYPE': ['0'] * 4,
+                                 'DST_NAME': ['1', '4', '2', '3'],
+                                 'DST_TYPE': ['0'] * 4,
+                                 })
+        df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4'],
+                             'p_value': [0.25, 0.5, 0.0, 0.125, 0.9]
+                             })
+        graph = CSRGraph.from_frames(df_edges, df_p)
+        bounds = gs.component_bounds(graph, graph.components(graph.p <= 0.5))
+
+        expected = {'0': 2.0, '1': 2.0, '2': 6.0, '3': 6.0, '4': 0.0}
+        for name, bound in zip(graph.names, bounds):
+            self.assertAlmostEqual(bound, expected[name])
+
+        # the seeds of the component {0, 1} cannot beat the seed 3
+        seeds = [graph.names.tolist().index(name) for name in ['3', '0', '1']]
+        subgraphs = gs.grow_seeds(graph, seeds, alpha_max=0.5, Z=5, bounds=bounds[seeds])
+        self.assertEqual(set(graph.names[subgraphs[0][0]]), {'2', '3'})
+        self.assertIsNone(subgraphs[1])
+        self.assertIsNone(subgraphs[2])
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from sfgad.aggregation import graph_scan as gs
+from sfgad.aggregation.incremental_scan import IncrementalScanner
+
+
+class TestIncrementalScanner(TestCase):
+    def setUp(self):
+        # two components, {0, 1, 2} and {3, 4, 5}, connected by the insignificant vertex 6
+        self.df_edges = pd.DataFrame({'TIMESTAMP': ['2018-01-01 00:00:00'] * 6,
+                                      'E_NAME': ['0_1', '1_2', '2_6', '6_3', '3_4', '4_5'],
+                                      'E_TYPE': ['0_0'] * 6,
+                                      'SRC_NAME': ['0', '1', '2', '6', '3', '4'],
+                                      'SRC_TYPE': ['0'] * 6,
+                                      'DST_NAME': ['1', '2', '6', '3', '4', '5'],
+                                      'DST_TYPE': ['0'] * 6,
+                                      })
+        self.df_p = pd.DataFrame({'name': ['0', '1', '2', '3', '4', '5', '6'],
+                                  'p_value': [0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.9]
+                                  })
+
+    def check_scan(self, scanner, df_edges, df_p):
+        subgraph, score = scanner.scan(df_edges.copy(), df_p.copy())
+        expected = gs.scan(df_edges.copy(), df_p.copy(), alpha_max=scanner.alpha_max, K=scanner.K, Z=scanner.Z)
+
+        self.assertEqual(subgraph, expected[0])
+        self.assertAlmostEqual(score, expected[1])
+
+    def test_unchanged_window(self):
+        scanner = IncrementalScanner(alpha_max=0.1, K=5, Z=5)
+
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual((scanner.n_grown, scanner.n_reused), (5, 0))
+
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual((scanner.n_grown, scanner.n_reused), (0, 5))
+
+    def test_changed_p_value(self):
+        scanner = IncrementalScanner(alpha_max=0.1, K=6, Z=5)
+        self.check_scan(scanner, self.df_edges, self.df_p)
+
+        # only the seeds of the component {3, 4, 5} are grown again
+        self.df_p.loc[5, 'p_value'] = 0.001
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual((scanner.n_grown, scanner.n_reused), (3, 3))
+
+    def test_insignificant_vertex(self):
+        scanner = IncrementalScanner(alpha_max=0.1, K=6, Z=5)
+        self.check_scan(scanner, self.df_edges, self.df_p)
+
+        # the vertex 1 splits its component, when it becomes insignificant
+        self.df_p.loc[1, 'p_value'] = 0.5
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual((scanner.n_grown, scanner.n_reused), (2, 3))
+
+    def test_changed_edges(self):
+        scanner = IncrementalScanner(alpha_max=0.1, K=6, Z=5)
+        self.check_scan(scanner, self.df_edges, self.df_p)
+
+        self.df_edges = self.df_edges.iloc[:5]
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual((scanner.n_grown, scanner.n_reused), (2, 3))
+
+    def test_empty_window(self):
+        scanner = IncrementalScanner(alpha_max=0.1, K=5)
+        self.check_scan(scanner, self.df_edges, self.df_p)
+
+        subgraph, score = scanner.scan(self.df_edges.iloc[:0], self.df_p.iloc[:0])
+        self.assertEqual(len(subgraph), 0)
+        self.assertEqual(score, 0)
+
+        self.check_scan(scanner, self.df_edges, self.df_p)
+        self.assertEqual(scanner.n_reused, 0)
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+
+from sfgad.aggregation.top_k_tracker import TopKTracker
+
+
+class TestTopKTracker(TestCase):
+    def test_top_k(self):
+        tracker = TopKTracker(k=3)
+        tracker.update_many(['A', 'B', 'C', 'D', 'E'], 0, [0.5, 0.1, 0.9, 0.3, np.nan])
+
+        self.assertEqual(tracker.top(), [('B', 0, 0.1), ('D', 0, 0.3), ('A', 0, 0.5)])
+
+        # C is less anomalous than all kept entries
+        tracker.update('C', 1, 0.6)
+        self.assertEqual(tracker.top(), [('B', 0, 0.1), ('D', 0, 0.3), ('A', 0, 0.5)])
+
+        tracker.update('E', 1, 0.2)
+        self.assertEqual(tracker.top(), [('B', 0, 0.1), ('E', 1, 0.2), ('D', 0, 0.3)])
+
+    def test_deduplication(self):
+        tracker = TopKTracker(k=3)
+        tracker.update_many(['A', 'B'], 0, [0.5, 0.1])
+
+        # only the most anomalous entry of a vertex is kept and on ties the newer one
+        tracker.update('A', 1, 0.6)
+        tracker.update('B', 1, 0.1)
+        tracker.update('A', 2, 0.2)
+        self.assertEqual(tracker.top(), [('B', 1, 0.1), ('A', 2, 0.2)])
+        self.assertEqual(len(tracker), 2)
+
+    def test_ties(self):
+        # on ties the older entry and then the earlier added one is the least anomalous one
+        tracker = TopKTracker(k=2)
+        tracker.update_many(['A', 'B'], 0, [0.5, 0.5])
+        tracker.update('C', 1, 0.5)
+
+        self.assertEqual(tracker.top(), [('C', 1, 0.5), ('B', 0, 0.5)])
+
+    def test_horizon(self):
+        tracker = TopKTracker(k=2, horizon=2)
+        tracker.update_many(['A', 'B'], 0, [0.1, 0.2])
+        tracker.update('C', 1, 0.3)
+        self.assertEqual(tracker.top(), [('A', 0, 0.1), ('B', 0, 0.2)])
+
+        # the entries of window 0 are beyond the horizon in window 2, so that C is restored
+        tracker.update('D', 2, 0.4)
+        self.assertEqual(tracker.top(), [('C', 1, 0.3), ('D', 2, 0.4)])
+
+        # entries of windows beyond the horizon are ignored
+        tracker.update('E', 0, 0.01)
+        tracker.advance(3)
+        self.assertEqual(tracker.top(), [('D', 2, 0.4)])
+        tracker.advance(4)
+        self.assertEqual(tracker.top(), [])
+
+    def test_horizon_restores_pushed_out_entries(self):
+        tracker = TopKTracker(k=2, horizon=2)
+        tracker.update_many(['A', 'B'], 0, [0.01, 0.02])
+        tracker.update_many(['C', 'D'], 1, [0.3, 0.4])
+        tracker.update('E', 2, 0.9)
+
+        # the top-2 of the windows 1 and 2
+        self.assertEqual(tracker.top(), [('C', 1, 0.3), ('D', 1, 0.4)])
+
+    def test_horizon_deduplication(self):
+        tracker = TopKTracker(k=2, horizon=3)
+        tracker.update(('A', 'PERSON'), 0, 0.1)
+        tracker.update(('A', 'POST'), 1, 0.3)
+        tracker.update(('A', 'PERSON'), 1, 0.2)
+
+        # the vertices are keyed by name and type and the older entry of a vertex is kept until it expires
+        self.assertEqual(tracker.top(), [(('A', 'PERSON'), 0, 0.1), (('A', 'POST'), 1, 0.3)])
+        tracker.advance(3)
+        self.assertEqual(tracker.top(), [(('A', 'PERSON'), 1, 0.2), (('A', 'POST'), 1, 0.3)])
+
+    def test_horizon_random(self):
+        tracker = TopKTracker(k=4, horizon=3)
+        random = np.random.RandomState(1)
+        history = []
+
+        for time_window in range(30):
+            vertices, p_values = random.randint(15, size=10), random.uniform(size=10)
+            tracker.update_many(vertices, time_window, p_values)
+            history.extend((vertex, time_window, p_value) for vertex, p_value in zip(vertices, p_values))
+
+            # the most anomalous entry of every vertex within the horizon
+            best = {}
+            for vertex, window, p_value in history:
+                if window > time_window - 3 and (vertex not in best or p_value < best[vertex][1]):
+                    best[vertex] = (window, p_value)
+            expected = sorted(((vertex, window, p_value) for vertex, (window, p_value) in best.items()),
+                              key=lambda entry: entry[2])[:4]
+
+            self.assertEqual(tracker.top(), expected)
+
+    def test_bounded_memory(self):
+        tracker = TopKTracker(k=5, horizon=10)
+        random = np.random.RandomState(0)
+
+        for time_window in range(50):
+            p_values = random.uniform(size=20)
+            tracker.update_many(random.randint(30, size=20), time_window, p_values)
+
+            self.assertLessEqual(len(tracker), 5)
+            self.assertLessEqual(len(tracker.buckets), 10)
+            for entries, heap in tracker.buckets.values():
+                self.assertLessEqual(len(entries), 5)
+                self.assertLessEqual(len(heap), 2 * 5 + 16)
+
+        # the kept entries are the most anomalous ones within the horizon
+        self.assertTrue(all(window > 39 for vertex, window, p_value in tracker.top()))
+        self.assertEqual(len({vertex for vertex, window, p_value in tracker.top()}), 5)
+
+    def test_invalid_parameters(self):
+        self.assertRaises(ValueError, TopKTracker, 0)
+        self.assertRaises(ValueError, TopKTracker, 3, 0)
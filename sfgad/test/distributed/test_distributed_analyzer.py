@@ -0,0 +1,130 @@
+import datetime as dt
+import os
+import socket
+from unittest import TestCase
+
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.analyzer import Analyzer
+from sfgad.aggregation.top_k_tracker import TopKTracker
+from sfgad.distributed import DistributedAnalyzer, start_local_workers
+from sfgad.distributed.protocol import INIT, INSERT, ERROR, send_message, receive_message
+from sfgad.modules.features import VertexDegree
+from sfgad.modules.observation_selection import HistoricSameSelection
+from sfgad.modules.probability_combination import AvgProbability
+from sfgad.modules.probability_estimation import Gaussian
+from sfgad.modules.weighting import ConstantWeight
+from sfgad.utils.instrumentation import Instrumentation, MemorySink
+
+KEY = os.urandom(32)
+
+
+class TestDistributedAnalyzer(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.processes, cls.addresses = start_local_workers(3, KEY)
+
+    @classmethod
+    def tearDownClass(cls):
+        # shut down the workers by a final session
+        analyzer = DistributedAnalyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(),
+                                       AvgProbability(), workers=cls.addresses, key=KEY)
+        analyzer.connect()
+        analyzer.close(shutdown_workers=True)
+
+        for process in cls.processes:
+            process.join(timeout=10)
+
+    def setUp(self):
+        self.dfs = [
+            pd.DataFrame({'TIMESTAMP': [dt.datetime.fromordinal(1).replace(year=2017) + dt.timedelta(days=i)] * 5,
+                          'SRC_NAME': ['A', 'A', 'B', 'D', 'E'],
+                          'SRC_TYPE': ['NODE'] * 5,
+                          'DST_NAME': ['B', 'C', 'C', 'E', ['A', 'B', 'C', 'D'][i % 4]],
+                          'DST_TYPE': ['NODE'] * 5}) for i in range(10)]
+
+    def create_analyzers(self, **kwargs):
+        local = Analyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(), AvgProbability())
+        distributed = DistributedAnalyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(),
+                                          AvgProbability(), workers=self.addresses, key=KEY, **kwargs)
+        return local, distributed
+
+    def test_no_workers(self):
+        with self.assertRaises(ValueError):
+            DistributedAnalyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(),
+                                AvgProbability(), workers=[], key=KEY)
+
+    def test_no_key(self):
+        with self.assertRaises(ValueError):
+            DistributedAnalyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(),
+                                AvgProbability(), workers=self.addresses, key=b'')
+
+    def test_same_results_as_local(self):
+        local, distributed = self.create_analyzers()
+
+        try:
+            for df in self.dfs:
+                assert_frame_equal(distributed.fit_transform(df), local.fit_transform(df))
+        finally:
+            distributed.close()
+
+        self.assertEqual(distributed.time_window, len(self.dfs))
+
+    def test_connect_with_existing_history(self):
+        local, distributed = self.create_analyzers()
+
+        # the first windows are processed before the workers are connected
+        for df in self.dfs[:5]:
+            local.fit_transform(df)
+        distributed.db.insert_records(local.db.select_all())
+        distributed.time_window = local.time_window
+
+        try:
+            for df in self.dfs[5:]:
+                assert_frame_equal(distributed.fit_transform(df), local.fit_transform(df))
+        finally:
+            distributed.close()
+
+    def test_options(self):
+        sink = MemorySink()
+        tracker = TopKTracker(k=2)
+        local, distributed = self.create_analyzers(top_k_tracker=tracker, instrumentation=Instrumentation([sink]))
+
+        try:
+            for df in self.dfs[:3]:
+                distributed.fit_transform(df)
+        finally:
+            distributed.close()
+
+        self.assertEqual(len(tracker), 2)
+        # the stages of the workers are added to the windows of the coordinator
+        self.assertEqual(sink.stage_calls['gather/HistoricSameSelection'], 3 * len(self.addresses))
+        self.assertEqual([summary['counters']['gathered_rows'] for summary in sink.windows], [0, 5, 10])
+
+    def test_reply_to_failed_insert(self):
+        with socket.create_connection(self.addresses[0]) as conn:
+            # every failed insert is answered by an error, so that the replies stay in order
+            for i in range(2):
+                send_message(conn, KEY, INSERT, None)
+                message_type, payload = receive_message(conn, KEY)
+                self.assertEqual(message_type, ERROR)
+
+    def test_unauthenticated_message(self):
+        with socket.create_connection(self.addresses[0]) as conn:
+            send_message(conn, b'other', INIT, {})
+
+            # the worker closes the session without unpickling the message (the unread rest of the message may reset
+            # the connection)
+            try:
+                reply = receive_message(conn, KEY)
+            except ConnectionResetError:
+                reply = (None, None)
+            self.assertEqual(reply, (None, None))
+
+        local, distributed = self.create_analyzers()
+        try:
+            for df in self.dfs[:2]:
+                assert_frame_equal(distributed.fit_transform(df), local.fit_transform(df))
+        finally:
+            distributed.close()
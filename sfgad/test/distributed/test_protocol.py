@@ -0,0 +1,79 @@
+import socket
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.distributed import protocol
+
+KEY = b'secret'
+
+
+class TestProtocol(TestCase):
+    def setUp(self):
+        self.sender, self.receiver = socket.socketpair()
+
+    def tearDown(self):
+        self.sender.close()
+        self.receiver.close()
+
+    def test_header(self):
+        message = protocol.encode_message(KEY, protocol.SHUTDOWN)
+        message_type, length = protocol.HEADER.unpack(message[:protocol.HEADER.size])
+
+        self.assertEqual(message_type, protocol.SHUTDOWN)
+        self.assertEqual(length, len(message) - protocol.HEADER.size - 2 * protocol.DIGEST_SIZE)
+
+    def test_round_trip(self):
+        df = pd.DataFrame({'name': ['A', 'B'], 'time_window': [1, 2], 'feature': [0.5, 1.5]},
+                          columns=['name', 'time_window', 'feature'])
+
+        protocol.send_message(self.sender, KEY, protocol.WINDOW, (3, df, [np.arange(5)]))
+        message_type, (time_window, result_df, arrays) = protocol.receive_message(self.receiver, KEY)
+
+        self.assertEqual(message_type, protocol.WINDOW)
+        self.assertEqual(time_window, 3)
+        assert_frame_equal(result_df, df)
+        np.testing.assert_array_equal(arrays[0], np.arange(5))
+
+    def test_multiple_messages(self):
+        protocol.send_message(self.sender, KEY, protocol.INSERT, 'first')
+        protocol.send_message(self.sender, KEY, protocol.INSERT, 'second')
+
+        self.assertEqual(protocol.receive_message(self.receiver, KEY), (protocol.INSERT, 'first'))
+        self.assertEqual(protocol.receive_message(self.receiver, KEY), (protocol.INSERT, 'second'))
+
+    def test_closed_connection(self):
+        self.sender.close()
+
+        self.assertEqual(protocol.receive_message(self.receiver, KEY), (None, None))
+
+    def test_truncated_message(self):
+        self.sender.sendall(protocol.encode_message(KEY, protocol.INSERT, 'payload')[:-2])
+        self.sender.close()
+
+        with self.assertRaises(ConnectionError):
+            protocol.receive_message(self.receiver, KEY)
+
+    def test_wrong_key(self):
+        protocol.send_message(self.sender, b'other', protocol.INSERT, 'payload')
+
+        with self.assertRaises(protocol.AuthenticationError):
+            protocol.receive_message(self.receiver, KEY)
+
+    def test_tampered_payload(self):
+        message = bytearray(protocol.encode_message(KEY, protocol.INSERT, 'payload'))
+        message[protocol.HEADER.size + protocol.DIGEST_SIZE + 5] ^= 1
+        self.sender.sendall(message)
+
+        with self.assertRaises(protocol.AuthenticationError):
+            protocol.receive_message(self.receiver, KEY)
+
+    def test_tampered_length(self):
+        # the length is not trusted before the header is authenticated
+        message = protocol.encode_message(KEY, protocol.INSERT, 'payload')
+        self.sender.sendall(protocol.HEADER.pack(protocol.INSERT, 2 ** 60) + message[protocol.HEADER.size:])
+
+        with self.assertRaises(protocol.AuthenticationError):
+            protocol.receive_message(self.receiver, KEY)
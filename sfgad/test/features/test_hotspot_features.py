@@ -56,6 +56,14 @@ class TestHotSpotFeatures(TestCase):
                                                                   np.nan, np.nan, np.nan]},
                                         columns=['name', 'CorrelationChange', 'MagnitudeChange'])
 
+    def test_memory_report(self):
+        report = HotSpotFeatures().memory_report()
+
+        for name in ['prev_product_matrices', 'activity_buffer', 'interpreter.frequencies', 'interpreter.fit_buffer']:
+            self.assertIn(name, report)
+        self.assertEqual(report['interpreter.fit_buffer']['entries'], 1)
+        self.assertNotIn('names', report)
+
     def test_init(self):
         self.assertEqual(self.hotspot_features.names, ["CorrelationChange", "MagnitudeChange"])
         self.assertEqual(self.hotspot_features.update_activity, True)
@@ -43,7 +43,7 @@ class TestHotSpotInterpreter(unittest.TestCase):
     def test_interpret(self):
         self.assertEqual(self.interpreter.interpret(self.df_1), (pd.Timestamp('2018-01-01 00:00:05'), ['A', 'B', 'C']))
 
-        fit_buffer = deque([(pd.Timestamp('1677-09-21 00:12:43.145225'), 0, {}, {}),
+        fit_buffer = deque([(pd.Timestamp.min, 0, {}, {}),
                             (pd.Timestamp('2018-01-01 00:00:05'),
                              3,
                              {(0, 1): (pd.Timestamp('2018-01-01 00:00:05'), 1),
@@ -35,6 +35,16 @@ class TestVertexActivity(TestCase):
     def test_init(self):
         self.assertEqual(self.feature.names, ['VertexActivity'])
 
+    def test_memory_report(self):
+        self.feature.process_vertices(self.df_1, 1)
+        self.feature.process_vertices(self.df_2, 1)
+
+        report = self.feature.memory_report()
+
+        self.assertEqual(list(report), ['nodes'])
+        self.assertEqual(report['nodes']['entries'], 4)
+        self.assertGreater(report['nodes']['bytes'], 0)
+
     def test_result_df_shape(self):
         result_df_1 = self.feature.process_vertices(self.df_1, 1)
 
@@ -0,0 +1,116 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from sfgad.modules.observation_selection.current_similar_selection import CurrentSimilarSelection
+from sfgad.modules.observation_selection.helper.block_cache import BlockCache, limit_mask
+from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
+
+
+class TestBlockCache(TestCase):
+    def setUp(self):
+        self.db = InMemoryDatabase(feature_names=['feature_A', 'feature_B'])
+        self.db.insert_record('Vertex_A', 'PERSON', 1, [24, 42])
+        self.db.insert_record('Vertex_B', 'PERSON', 1, [124, 142])
+        self.db.insert_record('Vertex_C', 'PICTURE', 1, [224, 242])
+
+        self.n_selects = 0
+
+    def select(self, time_window=1):
+        self.n_selects += 1
+        return self.db.select_by_time_step(time_window).reset_index(drop=True)
+
+    def test_get_cached(self):
+        cache = BlockCache()
+
+        block = cache.get(('PERSON', 1), self.db, self.select)
+
+        self.assertIs(cache.get(('PERSON', 1), self.db, self.select), block)
+        self.assertEqual(self.n_selects, 1)
+
+    def test_invalidate_on_insert(self):
+        cache = BlockCache()
+        cache.get(('PERSON', 1), self.db, self.select)
+
+        self.db.insert_record('Vertex_D', 'PERSON', 1, [1, 2])
+
+        self.assertEqual(len(cache.get(('PERSON', 1), self.db, self.select)), 4)
+        self.assertEqual(self.n_selects, 2)
+
+    def test_invalidate_on_other_database(self):
+        cache = BlockCache()
+        cache.get(('PERSON', 1), self.db, self.select)
+
+        self.db = InMemoryDatabase(feature_names=['feature_A', 'feature_B'])
+
+        self.assertEqual(len(cache.get(('PERSON', 1), self.db, self.select)), 0)
+        self.assertEqual(self.n_selects, 2)
+
+    def test_database_without_version(self):
+        cache = BlockCache()
+
+        # e.g. a custom Database, which does not increase the version inherited from the abstract class
+        self.db.version = None
+        cache.get(1, self.db, self.select)
+        cache.get(1, self.db, self.select)
+
+        self.assertEqual(self.n_selects, 2)
+        self.assertEqual(len(cache.blocks), 0)
+
+    def test_read_only(self):
+        cache = BlockCache()
+        block = cache.get(1, self.db, self.select)
+
+        for column in block.columns:
+            with self.assertRaises(ValueError):
+                block[column].values[0] = block[column].values[0]
+
+    def test_lru_eviction(self):
+        n_bytes = int(self.select().memory_usage(index=True, deep=True).sum())
+        cache = BlockCache(max_bytes=2 * n_bytes)
+
+        cache.get(1, self.db, self.select)
+        cache.get(2, self.db, self.select)
+        cache.get(1, self.db, self.select)
+        cache.get(3, self.db, self.select)
+
+        self.assertEqual(list(cache.blocks), [1, 3])
+        self.assertLessEqual(cache.n_bytes, cache.max_bytes)
+
+    def test_disabled(self):
+        cache = BlockCache(max_bytes=0)
+
+        cache.get(1, self.db, self.select)
+        cache.get(1, self.db, self.select)
+
+        self.assertEqual(self.n_selects, 2)
+        self.assertEqual(len(cache.blocks), 0)
+
+    def test_invalid_max_bytes(self):
+        with self.assertRaises(ValueError):
+            BlockCache(max_bytes=-1)
+
+    def test_pickle(self):
+        cache = BlockCache(max_bytes=1000)
+        cache.get(1, self.db, self.select)
+
+        cache = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual(cache.max_bytes, 1000)
+        self.assertEqual(len(cache.blocks), 0)
+
+    def test_limit_mask(self):
+        np.testing.assert_array_equal(limit_mask(np.array([True, False, True, True]), 2), [True, False, True, False])
+        np.testing.assert_array_equal(limit_mask(np.array([True, False]), None), [True, False])
+
+    def test_reference_block(self):
+        sel_rule = CurrentSimilarSelection()
+
+        block, mask = sel_rule.reference_block('Vertex_A', 'PERSON', 1, self.db)
+        other_block, other_mask = sel_rule.reference_block('Vertex_B', 'PERSON', 1, self.db)
+
+        self.assertIs(block, other_block)
+        self.assertEqual(list(block['name']), ['Vertex_A', 'Vertex_B'])
+        np.testing.assert_array_equal(mask, [False, True])
+        np.testing.assert_array_equal(other_mask, [True, False])
@@ -8,9 +8,10 @@ from sfgad.modules.observation_selection.fallback_selection import FallbackSelec
 from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
 from sfgad.modules.observation_selection.historic_same_selection import HistoricSameSelection
 from sfgad.modules.observation_selection.historic_similar_selection import HistoricSimilarSelection
+from sfgad.test.selection_rule_checks import GatherManyChecks
 
 
-class TestFallbackSelection(TestCase):
+class TestFallbackSelection(GatherManyChecks, TestCase):
     def setUp(self):
         # establish a connection to the database
         # self.db = ExternalSQLDatabase(user='root', password='root', host='localhost', database='sfgad',
@@ -6,9 +6,10 @@ from pandas.util.testing import assert_frame_equal
 # from sfgad.modules.observation_selection.helper.external_sql_database import ExternalSQLDatabase
 from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
 from sfgad.modules.observation_selection.historic_age_similar_selection import HistoricAgeSimilarSelection
+from sfgad.test.selection_rule_checks import GatherManyChecks
 
 
-class TestHistoricAgeAllSelection(TestCase):
+class TestHistoricAgeAllSelection(GatherManyChecks, TestCase):
     def setUp(self):
         # establish a connection to the database
         # self.db = ExternalSQLDatabase(user='root', password='root', host='localhost', database='sfgad',
@@ -45,3 +46,35 @@ class TestHistoricAgeAllSelection(TestCase):
 
         self.sel_rule = HistoricAgeSimilarSelection(limit=1)
         assert_frame_equal(self.sel_rule.gather('Vertex_B', 'PERSON', 3, self.db), target_df)
+
+    def test_gather_many_shared_cohort(self):
+        self.db.insert_record('Vertex_E', 'PERSON', 1, [2, 4])
+        self.db.insert_record('Vertex_E', 'PERSON', 2, [4, 2])
+        self.db.insert_record('Vertex_B', 'PERSON', 2, [1, 1])
+        vertices = pd.DataFrame(data={'name': ['Vertex_B', 'Vertex_E', 'Vertex_A', 'Vertex_B'],
+                                      'type': ['PERSON', 'PERSON', 'PERSON', 'PERSON']}, columns=['name', 'type'])
+
+        for limit in [None, 1, 2, 4]:
+            self.sel_rule = HistoricAgeSimilarSelection(limit=limit)
+            self.assert_gather_many(vertices, 3)
+
+    def test_reference_block(self):
+        self.db.insert_record('Vertex_E', 'PERSON', 1, [2, 4])
+        self.db.insert_record('Vertex_E', 'PERSON', 2, [4, 2])
+        self.db.insert_record('Vertex_B', 'PERSON', 2, [1, 1])
+        columns = ['time_window', 'name', 'feature_A']
+
+        for limit in [None, 1, 2, 3, 4]:
+            self.sel_rule = HistoricAgeSimilarSelection(limit=limit)
+            for vertex_name, vertex_type in [('Vertex_A', 'PERSON'), ('Vertex_B', 'PERSON'), ('Vertex_E', 'PERSON'),
+                                             ('Vertex_C', 'PICTURE'), ('Vertex_X', 'PERSON')]:
+                block, mask = self.sel_rule.reference_block(vertex_name, vertex_type, 3, self.db)
+
+                # the same observations as gather(), but in the order of the block
+                target_df = self.sel_rule.gather(vertex_name, vertex_type, 3, self.db)
+                assert_frame_equal(block[mask][columns].sort_values(columns).reset_index(drop=True),
+                                   target_df[columns].sort_values(columns).reset_index(drop=True))
+
+        # the members of a cohort share a block
+        self.assertIs(self.sel_rule.reference_block('Vertex_A', 'PERSON', 3, self.db)[0],
+                      self.sel_rule.reference_block('Vertex_E', 'PERSON', 3, self.db)[0])
@@ -6,9 +6,10 @@ from pandas.util.testing import assert_frame_equal
 # from sfgad.modules.observation_selection.helper.external_sql_database import ExternalSQLDatabase
 from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
 from sfgad.modules.observation_selection.historic_all_selection import HistoricAllSelection
+from sfgad.test.selection_rule_checks import GatherManyChecks
 
 
-class TestHistoricAllSelection(TestCase):
+class TestHistoricAllSelection(GatherManyChecks, TestCase):
     def setUp(self):
         # establish a connection to the database
         # self.db = ExternalSQLDatabase(user='root', password='root', host='localhost', database='sfgad',
@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+import numpy as np
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.modules.observation_selection.helper.database import Database
+from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
+from sfgad.modules.observation_selection.historic_same_selection import HistoricSameSelection
+from sfgad.modules.observation_selection.historic_similar_selection import HistoricSimilarSelection
+
+
+class TestInMemoryDatabase(TestCase):
+    def setUp(self):
+        self.db = InMemoryDatabase(feature_names=['feature_A', 'feature_B'])
+        self.db.insert_record('Vertex_A', 'PERSON', 1, [24, 42])
+        self.db.insert_record('Vertex_B', 'PERSON', 1, [124, 142])
+        self.db.insert_record('Vertex_C', 'PICTURE', 1, [224, 242])
+        self.db.insert_record('Vertex_D', 'POST', 2, [324, 342])
+        self.db.insert_record('Vertex_A', 'PERSON', 2, [12, 24])
+        self.db.insert_record('Vertex_A', 'PERSON', 3, [142, 24])
+
+    def test_select_from(self):
+        self.assertEqual(self.db.count_records(), 6)
+        self.assertEqual(list(self.db.select_from(4)['time_window']), [2, 3])
+        self.assertEqual(list(self.db.select_from(4).index), [0, 1])
+
+    def test_select_by_vertex_names(self):
+        result = self.db.select_by_vertex_names(['Vertex_A', 'Vertex_X', 'Vertex_C'])
+
+        self.assertEqual(len(result), 3)
+        np.testing.assert_array_equal(result.offsets, [0, 3, 3, 4])
+        self.assertEqual(list(result.rows['name']), ['Vertex_A', 'Vertex_A', 'Vertex_A', 'Vertex_C'])
+        self.assertEqual(list(result.rows['time_window']), [3, 2, 1, 1])
+
+    def test_select_by_vertex_names_before_window(self):
+        result = self.db.select_by_vertex_names(['Vertex_A', 'Vertex_D'], before_window=2)
+
+        np.testing.assert_array_equal(result.offsets, [0, 1, 1])
+        self.assertEqual(list(result.rows['time_window']), [1])
+
+    def test_select_by_vertex_names_with_limit(self):
+        result = self.db.select_by_vertex_names(['Vertex_A', 'Vertex_B'], limit_per_vertex=2)
+
+        np.testing.assert_array_equal(result.offsets, [0, 2, 3])
+        self.assertEqual(list(result.rows['time_window']), [3, 2, 1])
+
+    def test_select_by_vertex_names_repeated(self):
+        result = self.db.select_by_vertex_names(['Vertex_B', 'Vertex_A', 'Vertex_B'], limit_per_vertex=2)
+
+        np.testing.assert_array_equal(result.sizes(), [1, 2, 1])
+        np.testing.assert_array_equal(result.segment_ids(), [0, 1, 1, 2])
+        self.assertEqual(list(result.rows['name']), ['Vertex_B', 'Vertex_A', 'Vertex_A', 'Vertex_B'])
+
+    def test_select_by_vertex_names_empty(self):
+        result = self.db.select_by_vertex_names([])
+
+        self.assertEqual(len(result), 0)
+        self.assertEqual(len(result.rows), 0)
+
+    def test_select_by_vertex_names_matches_gather(self):
+        names = ['Vertex_A', 'Vertex_B', 'Vertex_C', 'Vertex_D']
+        result = self.db.select_by_vertex_names(names, before_window=3)
+
+        for i, name in enumerate(names):
+            assert_frame_equal(result.segment(i), HistoricSameSelection().gather(name, None, 3, self.db))
+
+    def test_select_by_vertex_types(self):
+        result = self.db.select_by_vertex_types(['POST', 'PERSON'], before_window=3, limit_per_vertex=2)
+
+        np.testing.assert_array_equal(result.offsets, [0, 1, 3])
+        self.assertEqual(list(result.rows['name']), ['Vertex_D', 'Vertex_A', 'Vertex_A'])
+
+    def test_select_by_vertex_types_matches_gather(self):
+        result = self.db.select_by_vertex_types(['PERSON', 'PICTURE', 'POST'], before_window=4)
+
+        # the order of rows with the same time_window is not defined by the selection rule
+        for i, vertex_type in enumerate(['PERSON', 'PICTURE', 'POST']):
+            assert_frame_equal(result.segment(i).sort_values(['time_window', 'name']).reset_index(drop=True),
+                               HistoricSimilarSelection().gather(None, vertex_type, 4, self.db).sort_values(
+                                   ['time_window', 'name']).reset_index(drop=True))
+
+    def test_get_vertices_same_age(self):
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_A', 'PERSON'),
+                         [('Vertex_B', 'PERSON'), ('Vertex_C', 'PICTURE')])
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_A', 'PERSON', same_type=True), [('Vertex_B', 'PERSON')])
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_D', 'POST'), [])
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_X', 'PERSON'), [])
+
+    def test_cohorts(self):
+        self.assertEqual(self.db.cohorts.members(1), [('Vertex_A', 'PERSON'), ('Vertex_B', 'PERSON'),
+                                                      ('Vertex_C', 'PICTURE')])
+        self.assertEqual(self.db.cohorts.members(1, 'PICTURE'), [('Vertex_C', 'PICTURE')])
+        self.assertEqual(self.db.cohorts.members(2, 'PERSON'), [])
+        self.assertEqual(self.db.cohorts.members(3), [])
+
+        # the members are a copy, which does not change the index
+        self.db.cohorts.members(1).clear()
+        self.assertEqual(len(self.db.cohorts.members(1)), 3)
+
+    def test_memory_report(self):
+        report = self.db.memory_report()
+
+        self.assertEqual(sorted(report), ['cohorts.by_age', 'cohorts.by_age_and_type', 'database', 'first_occurrences'])
+        self.assertEqual(report['database']['entries'], 6)
+        self.assertEqual(report['first_occurrences']['entries'], 4)
+
+    def test_memory_report_custom_database(self):
+        # a custom Database, which keeps none of the structures of the implementations in memory
+        custom_database = type('CustomDatabase', (Database,),
+                               {name: lambda self, *args, **kwargs: None for name in Database.__abstractmethods__})
+
+        self.assertEqual(custom_database().memory_report(), {})
@@ -8,9 +8,10 @@ from sfgad.modules.observation_selection.helper.in_memory_database import InMemo
 from sfgad.modules.observation_selection.historic_same_selection import HistoricSameSelection
 from sfgad.modules.observation_selection.historic_similar_selection import HistoricSimilarSelection
 from sfgad.modules.observation_selection.maximum_alternative_selection import MaximumAlternativeSelection
+from sfgad.test.selection_rule_checks import GatherManyChecks
 
 
-class TestMaximumAlternativeSelection(TestCase):
+class TestMaximumAlternativeSelection(GatherManyChecks, TestCase):
     def setUp(self):
         # establish a connection to the database
         # self.db = ExternalSQLDatabase(user='root', password='root', host='localhost', database='sfgad',
@@ -0,0 +1,186 @@
+import datetime as dt
+import os
+import pickle
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.analyzer import Analyzer
+from sfgad.modules.features import VertexDegree
+from sfgad.modules.observation_selection.helper.in_memory_database import InMemoryDatabase
+from sfgad.modules.observation_selection.helper.sqlite_database import SQLiteDatabase
+from sfgad.modules.observation_selection.historic_same_selection import HistoricSameSelection
+from sfgad.modules.probability_combination import AvgProbability
+from sfgad.modules.probability_estimation import EmpiricalEstimator
+from sfgad.modules.weighting import ConstantWeight
+
+
+class TestSQLiteDatabase(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'history.db')
+
+        self.db = SQLiteDatabase(self.path, feature_names=['feature_A', 'feature_B'])
+        self.db.insert_record('Vertex_A', 'PERSON', 1, [24, 42])
+        self.db.insert_record('Vertex_B', 'PERSON', 1, [124, 142])
+        self.db.insert_record('Vertex_C', 'PICTURE', 1, [224, 242])
+        self.db.insert_record('Vertex_D', 'POST', 2, [324, 342])
+        self.db.insert_record('Vertex_A', 'PERSON', 2, [12, 24])
+
+    def tearDown(self):
+        self.db.close_connection()
+        self.tmp_dir.cleanup()
+
+    def test_wal_mode(self):
+        self.assertEqual(self.db.cnn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+    def test_select_by_vertex_name(self):
+        target_df = pd.DataFrame(data={'name': ['Vertex_A', 'Vertex_A'], 'type': ['PERSON', 'PERSON'],
+                                       'time_window': [1, 2], 'feature_A': [24.0, 12.0], 'feature_B': [42.0, 24.0],
+                                       'p_feature_A': [np.nan] * 2, 'p_feature_B': [np.nan] * 2,
+                                       'time': pd.to_datetime([pd.NaT] * 2)},
+                                 columns=['name', 'type', 'time_window', 'feature_A', 'feature_B', 'p_feature_A',
+                                          'p_feature_B', 'time'])
+
+        assert_frame_equal(self.db.select_by_vertex_name('Vertex_A'), target_df)
+
+    def test_select_by_vertex_type(self):
+        result = self.db.select_by_vertex_type('PERSON')
+
+        self.assertEqual(list(result['name']), ['Vertex_A', 'Vertex_B', 'Vertex_A'])
+        self.assertEqual(list(result['time_window']), [1, 1, 2])
+
+    def test_select_by_time_step(self):
+        self.assertEqual(list(self.db.select_by_time_step(2)['name']), ['Vertex_D', 'Vertex_A'])
+
+    def test_select_from(self):
+        self.assertEqual(self.db.count_records(), 5)
+        self.assertEqual(list(self.db.select_from(3)['name']), ['Vertex_D', 'Vertex_A'])
+        self.assertEqual(len(self.db.select_from(5)), 0)
+
+    def test_select_empty(self):
+        result = self.db.select_by_vertex_name('Vertex_X')
+
+        self.assertEqual(result.shape, (0, 8))
+        self.assertEqual(result['time_window'].dtype, np.int64)
+        self.assertEqual(result['time'].dtype, 'datetime64[ns]')
+
+    def test_insert_records(self):
+        records = pd.DataFrame(data={'name': ['Vertex_E', 'Vertex_A'], 'type': ['POST', 'PERSON'],
+                                     'time_window': np.array([3, 3], dtype=np.int64), 'feature_A': [1.0, 2.0],
+                                     'feature_B': [3.0, 4.0], 'p_feature_A': [0.5, np.nan],
+                                     'p_feature_B': [0.25, 1.0], 'time': [dt.datetime(2018, 1, 1)] * 2})
+        self.db.insert_records(records)
+
+        result = self.db.select_by_time_step(3)
+        self.assertEqual(list(result['p_feature_B']), [0.25, 1.0])
+        self.assertTrue(np.isnan(result['p_feature_A'][1]))
+        self.assertEqual(self.db.first_occurrences[('Vertex_E', 'POST')], 3)
+        self.assertEqual(self.db.first_occurrences[('Vertex_A', 'PERSON')], 1)
+        self.assertEqual(list(result['time']), [pd.Timestamp(2018, 1, 1)] * 2)
+
+    def test_insert_records_failed(self):
+        records = pd.DataFrame(data={'name': ['Vertex_E', 'Vertex_F'], 'type': ['POST', None],
+                                     'time_window': np.array([3, 3], dtype=np.int64), 'feature_A': [1.0, 2.0],
+                                     'feature_B': [3.0, 4.0]})
+        version = self.db.version
+
+        # the type must not be NULL, so that the whole window is rolled back
+        self.assertRaises(sqlite3.IntegrityError, self.db.insert_records, records)
+        self.assertEqual(len(self.db.select_all()), 5)
+        self.assertNotIn(('Vertex_E', 'POST'), self.db.first_occurrences)
+        self.assertEqual(self.db.cohorts.members(3), [])
+        self.assertEqual(self.db.version, version)
+
+    def test_select_by_vertex_names(self):
+        result = self.db.select_by_vertex_names(['Vertex_D', 'Vertex_X', 'Vertex_A'], before_window=3,
+                                                limit_per_vertex=1)
+
+        self.assertEqual(list(result.offsets), [0, 1, 1, 2])
+        self.assertEqual(list(result.rows['name']), ['Vertex_D', 'Vertex_A'])
+        self.assertEqual(list(result.rows['time_window']), [2, 2])
+
+    def test_select_by_vertex_types(self):
+        result = self.db.select_by_vertex_types(['PERSON', 'POST'], before_window=2)
+
+        self.assertEqual(list(result.offsets), [0, 2, 2])
+        self.assertEqual(list(result.rows['name']), ['Vertex_A', 'Vertex_B'])
+
+    def test_get_vertices_same_age(self):
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_A', 'PERSON'),
+                         [('Vertex_B', 'PERSON'), ('Vertex_C', 'PICTURE')])
+
+    def test_reopen(self):
+        self.db.close_connection()
+        self.db = SQLiteDatabase(self.path, feature_names=['feature_A', 'feature_B'])
+
+        self.assertEqual(len(self.db.select_all()), 5)
+        self.assertEqual(self.db.first_occurrences[('Vertex_D', 'POST')], 2)
+        self.assertEqual(self.db.get_vertices_same_age('Vertex_A', 'PERSON', same_type=True), [('Vertex_B', 'PERSON')])
+
+    def test_reopen_without_time(self):
+        # a file of an earlier version, whose table has no time column
+        self.db.close_connection()
+        cnn = sqlite3.connect(self.path)
+        with cnn:
+            cnn.execute('CREATE TABLE old_data (name TEXT NOT NULL, type TEXT NOT NULL, time_window INTEGER NOT NULL, '
+                        '"feature_A" REAL, "feature_B" REAL, "p_feature_A" REAL, "p_feature_B" REAL)')
+            cnn.execute('INSERT INTO old_data VALUES (\'Vertex_A\', \'PERSON\', 1, 1.0, 2.0, NULL, NULL)')
+        cnn.close()
+
+        self.db = SQLiteDatabase(self.path, feature_names=['feature_A', 'feature_B'], table_name='old_data')
+
+        self.assertTrue(self.db.select_all()['time'].isnull().all())
+
+    def test_pickle(self):
+        copy = pickle.loads(pickle.dumps(self.db))
+
+        assert_frame_equal(copy.select_all(), self.db.select_all())
+        self.assertEqual(copy.first_occurrences, self.db.first_occurrences)
+        copy.close_connection()
+
+        self.assertRaises(TypeError, pickle.dumps, SQLiteDatabase(':memory:', feature_names=['feature_A']))
+
+    def test_selection_rule(self):
+        in_memory_db = InMemoryDatabase(feature_names=['feature_A', 'feature_B'])
+        in_memory_db.insert_records(self.db.select_all())
+
+        sel_rule = HistoricSameSelection()
+        assert_frame_equal(sel_rule.gather('Vertex_A', 'PERSON', 3, self.db),
+                           sel_rule.gather('Vertex_A', 'PERSON', 3, in_memory_db), check_dtype=False)
+
+    def test_analyzer(self):
+        dfs = [pd.DataFrame({'TIMESTAMP': [dt.datetime(2017, 1, 1) + dt.timedelta(days=i)] * 3,
+                             'SRC_NAME': ['A', 'A', 'B'], 'SRC_TYPE': ['NODE'] * 3,
+                             'DST_NAME': ['B', 'C', 'C'], 'DST_TYPE': ['NODE'] * 3}) for i in range(5)]
+
+        db = SQLiteDatabase(os.path.join(self.tmp_dir.name, 'analyzer.db'), feature_names=['VertexDegree'])
+        analyzers = [Analyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), EmpiricalEstimator(),
+                              AvgProbability(), db_con=database) for database in [db, None]]
+
+        self.assertIs(analyzers[0].db, db)
+        for df in dfs:
+            assert_frame_equal(analyzers[0].fit_transform(df), analyzers[1].fit_transform(df))
+
+        # both backends keep the same history
+        assert_frame_equal(db.select_all(), analyzers[1].db.select_all()[db.columns], check_dtype=False)
+        db.close_connection()
+
+    def test_analyzer_parallel(self):
+        dfs = [pd.DataFrame({'TIMESTAMP': [dt.datetime(2017, 1, 1) + dt.timedelta(days=i)] * 3,
+                             'SRC_NAME': ['A', 'A', 'B'], 'SRC_TYPE': ['NODE'] * 3,
+                             'DST_NAME': ['B', 'C', 'C'], 'DST_TYPE': ['NODE'] * 3}) for i in range(3)]
+
+        db = SQLiteDatabase(os.path.join(self.tmp_dir.name, 'analyzer.db'), feature_names=['VertexDegree'])
+        analyzers = [Analyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), EmpiricalEstimator(),
+                              AvgProbability(), db_con=database, n_jobs=n_jobs) for database, n_jobs in [(db, 2),
+                                                                                                       (None, 1)]]
+
+        # the workers open their own connections to the file
+        for df in dfs:
+            assert_frame_equal(analyzers[0].fit_transform(df), analyzers[1].fit_transform(df))
+        db.close_connection()
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 import numpy as np
+import pandas as pd
 
 from sfgad.modules.probability_combination.empirical_combiner import EmpiricalCombiner
 
@@ -54,6 +55,20 @@ class TestEmpiricalCombiner(TestCase):
         # expect an assertion error
         self.assertRaises(ValueError, self.combiner.combine, p_values, ref_p_values)
 
+    def test_combine_numeric_strings_reference(self):
+        p_values = [0.21, 0.12]
+        ref_p_values = np.array([['0.05', '0.5'], ['0.2', '0.7']])
+
+        self.assertRaises(ValueError, self.combiner.combine, p_values, ref_p_values)
+        self.assertRaises(ValueError, self.combiner.combine, p_values, ref_p_values.astype(object))
+
+    def test_combine_object_reference(self):
+        p_values = [0.21, 0.12]
+        ref_p_values = np.array([[0.05, 1], [0.2, 0.7]], dtype=object)
+
+        self.assertEqual(self.combiner.combine(p_values, ref_p_values),
+                         self.combiner.combine(p_values, ref_p_values.astype(np.float64)))
+
     def test_direction_change(self):
         self.combiner = EmpiricalCombiner(direction='right-tailed')
 
@@ -66,3 +81,34 @@ class TestEmpiricalCombiner(TestCase):
     def test_wrong_direction(self):
         # expect a value error
         self.assertRaises(ValueError, EmpiricalCombiner, direction='up')
+
+    def test_combine_multiple_rows(self):
+        p_values = [[0.21, 0.12], [0.5, 0.3], [0.001, 0.9], [0.2, 0.2]]
+        ref_p_values = np.array([[0.2, 0.4], [0.1, 0.5], [np.nan, 0.1], [0.3, 0.7]])
+
+        # the reference observation with a nan p_value is ignored
+        np.testing.assert_array_equal(self.combiner.combine(p_values, ref_p_values), [1 / 3, 1.0, 0, 2 / 3])
+
+    def test_combine_reference_weights(self):
+        p_values = [[0.21, 0.12], [0.5, 0.3], [0.001, 0.9]]
+        ref_p_values = np.array([[0.2, 0.4], [0.1, 0.5], [0.3, 0.7]])
+        ref_weights = np.array([1.0, 3.0, 4.0])
+
+        np.testing.assert_array_equal(self.combiner.combine(p_values, ref_p_values, ref_weights), [0.375, 1.0, 0])
+
+        self.combiner = EmpiricalCombiner(direction='right-tailed')
+        np.testing.assert_array_equal(self.combiner.combine(p_values, ref_p_values, ref_weights), [0.625, 0.5, 1.0])
+
+    def test_combine_inconsistent_reference_weights(self):
+        p_values = [0.21, 0.12]
+        ref_p_values = np.array([[0.2, 0.4], [0.1, 0.5]])
+
+        self.assertRaises(ValueError, self.combiner.combine, p_values, ref_p_values, [1.0, 2.0, 3.0])
+
+    def test_combine_reference_dataframe(self):
+        p_values = [0.21, 0.12, 0.021, 0.15, 0.067]
+        ref_p_values = pd.DataFrame({'name': ['A', 'B'], 'time_window': [1, 2], 'p_feature_A': [0.001, 0.21],
+                                     'p_feature_B': [0.12, 0.15]})
+
+        # the columns 'name' and 'time_window' are ignored
+        self.assertEqual(self.combiner.combine(p_values, ref_p_values), 0.5)
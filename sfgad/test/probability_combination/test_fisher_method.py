@@ -1,5 +1,8 @@
 from unittest import TestCase
 
+import numpy as np
+from scipy.stats import combine_pvalues
+
 from sfgad.modules.probability_combination.fisher_method import FisherMethod
 
 
@@ -30,3 +33,16 @@ class TestFisherMethod(TestCase):
 
         # expect an assertion error
         self.assertRaises(ValueError, self.combiner.combine, p_values)
+
+    def test_combine_multiple_rows(self):
+        p_values = np.random.RandomState(0).uniform(size=(100, 4))
+        expected = [combine_pvalues(x, method='fisher')[1] for x in p_values]
+
+        # test the same output as scipy for every row
+        np.testing.assert_allclose(self.combiner.combine(p_values), expected, rtol=1e-12)
+
+    def test_combine_edge_cases(self):
+        p_values = [[0.0, 0.5, 0.5], [1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.0, 1.0, 0.5], [np.nan, 0.5, 0.5]]
+        expected = [combine_pvalues(x, method='fisher')[1] for x in p_values]
+
+        np.testing.assert_allclose(self.combiner.combine(p_values), expected, equal_nan=True)
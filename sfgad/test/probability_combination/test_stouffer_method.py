@@ -1,5 +1,8 @@
 from unittest import TestCase
 
+import numpy as np
+from scipy.stats import combine_pvalues
+
 from sfgad.modules.probability_combination.stouffer_method import StoufferMethod
 
 
@@ -30,3 +33,32 @@ class TestStoufferMethod(TestCase):
 
         # expect an assertion error
         self.assertRaises(ValueError, self.combiner.combine, p_values)
+
+    def test_combine_multiple_rows(self):
+        p_values = np.random.RandomState(0).uniform(size=(100, 4))
+        expected = [combine_pvalues(x, method='stouffer')[1] for x in p_values]
+
+        # test the same output as scipy for every row
+        np.testing.assert_allclose(self.combiner.combine(p_values), expected, rtol=1e-12)
+
+    def test_combine_edge_cases(self):
+        p_values = [[0.0, 0.5, 0.5], [1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.0, 1.0, 0.5], [np.nan, 0.5, 0.5]]
+        expected = [combine_pvalues(x, method='stouffer')[1] for x in p_values]
+
+        np.testing.assert_allclose(self.combiner.combine(p_values), expected, equal_nan=True)
+
+    def test_combine_weights(self):
+        p_values = np.random.RandomState(0).uniform(size=(100, 3))
+        weights = [1.0, 2.0, 0.5]
+        expected = [combine_pvalues(x, method='stouffer', weights=weights)[1] for x in p_values]
+
+        np.testing.assert_allclose(StoufferMethod(weights=weights).combine(p_values), expected, rtol=1e-12)
+
+    def test_combine_inconsistent_weights(self):
+        self.combiner = StoufferMethod(weights=[1.0, 2.0])
+
+        self.assertRaises(ValueError, self.combiner.combine, [0.21, 0.12, 0.021])
+
+    def test_init_invalid_weights(self):
+        self.assertRaises(ValueError, StoufferMethod, [])
+        self.assertRaises(ValueError, StoufferMethod, [[1.0, 2.0]])
@@ -0,0 +1,101 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from sfgad.modules.probability_estimation.empirical_estimator import EmpiricalEstimator
+from sfgad.modules.probability_estimation.estimator_cache import EstimatorCache
+from sfgad.modules.probability_estimation.exponential import Exponential
+from sfgad.modules.probability_estimation.gaussian import Gaussian
+from sfgad.modules.probability_estimation.uniform import Uniform
+
+
+class CountingGaussian(Gaussian):
+    n_fits = 0
+
+    def fit(self, reference_observations, weights):
+        CountingGaussian.n_fits += 1
+        super().fit(reference_observations, weights)
+
+
+class TestEstimatorCache(TestCase):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.block = pd.DataFrame({'name': ['Vertex_%d' % i for i in range(20)],
+                                   'feature_A': random.exponential(size=20),
+                                   'feature_B': random.randint(5, size=20).astype(np.float64),
+                                   'feature_C': random.normal(3.0, size=20)})
+        self.columns = ['feature_A', 'feature_B', 'feature_C']
+        self.weights = random.uniform(0.5, 1.0, size=20)
+        self.observations = pd.DataFrame({'feature_A': [0.7], 'feature_B': [2.0], 'feature_C': [3.0]})
+
+        masks = [np.ones(20, dtype=bool), np.arange(20) != 3, np.arange(20) % 3 != 0, np.arange(20) < 2]
+        self.masks = masks + [np.asarray(self.block['feature_B'] != 2.0)]
+
+    def check_estimator(self, estimator):
+        cache = EstimatorCache(estimator)
+
+        for mask in self.masks:
+            expected = estimator.estimate(self.observations, self.block.loc[mask, self.columns], self.weights[mask])
+            np.testing.assert_allclose(cache.estimate(self.observations, self.block, self.columns, self.weights, mask),
+                                       expected, rtol=1e-10)
+
+    def test_gaussian(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Gaussian(direction=direction))
+
+    def test_exponential(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Exponential(direction=direction))
+
+    def test_uniform(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Uniform(direction=direction))
+
+    def test_empirical_estimator(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(EmpiricalEstimator(direction=direction))
+
+    def test_gaussian_constant_feature(self):
+        self.block['feature_C'] = 3.0
+        cache = EstimatorCache(Gaussian())
+
+        # the standard deviation of constant reference observations stays zero, so the p_value is 1.0
+        for mask in self.masks[:3]:
+            self.assertEqual(cache.estimate(self.observations, self.block, self.columns, self.weights, mask)[0][2], 1.0)
+
+    def test_fit_once_per_block(self):
+        cache = EstimatorCache(CountingGaussian())
+        CountingGaussian.n_fits = 0
+
+        for mask in self.masks[:3]:
+            cache.estimate(self.observations, self.block, self.columns, self.weights, mask)
+
+        self.assertEqual(CountingGaussian.n_fits, 1)
+
+        # other weights require another fit
+        cache.estimate(self.observations, self.block, self.columns, self.weights * 2, self.masks[0])
+        self.assertEqual(CountingGaussian.n_fits, 2)
+
+    def test_max_entries(self):
+        cache = EstimatorCache(Gaussian(), max_entries=1)
+        weights = self.weights * 2
+
+        cache.estimate(self.observations, self.block, self.columns, self.weights, self.masks[0])
+        cache.estimate(self.observations, self.block, self.columns, weights, self.masks[0])
+
+        self.assertEqual(len(cache.entries), 1)
+        self.assertIs(list(cache.entries.values())[0][1], weights)
+
+    def test_invalid_max_entries(self):
+        self.assertRaises(ValueError, EstimatorCache, Gaussian(), 0)
+
+    def test_pickle(self):
+        cache = EstimatorCache(Gaussian(direction='left-tailed'))
+        cache.estimate(self.observations, self.block, self.columns, self.weights, self.masks[0])
+
+        cache = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual(cache.estimator.direction, 'left-tailed')
+        self.assertEqual(len(cache.entries), 0)
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+import numpy as np
+
+from sfgad.modules.probability_estimation.empirical_estimator import EmpiricalEstimator
+from sfgad.modules.probability_estimation.exponential import Exponential
+from sfgad.modules.probability_estimation.gaussian import Gaussian
+from sfgad.modules.probability_estimation.probability_estimator import ProbabilityEstimator
+from sfgad.modules.probability_estimation.uniform import Uniform
+
+
+class DefaultSegmentsGaussian(Gaussian):
+    fit_segments = ProbabilityEstimator.fit_segments
+    transform_segments = ProbabilityEstimator.transform_segments
+
+
+class TestEstimatorSegments(TestCase):
+    def setUp(self):
+        random = np.random.RandomState(0)
+        # segments of different sizes, the fourth segment has a constant feature and the fifth one a single row
+        self.offsets = np.array([0, 5, 12, 13, 20, 21, 30])
+        self.reference_observations = np.column_stack([random.exponential(size=30),
+                                                       random.randint(5, size=30).astype(np.float64)])
+        self.reference_observations[13:20, 1] = 2.0
+        self.weights = random.uniform(0.5, 1.0, size=30)
+        self.observations = np.column_stack([random.exponential(size=6), random.randint(5, size=6)])
+
+    def check_estimator(self, estimator):
+        estimator.fit_segments(self.reference_observations, self.weights, self.offsets)
+        p_values = estimator.transform_segments(self.observations)
+
+        for i, (start, end) in enumerate(zip(self.offsets[:-1], self.offsets[1:])):
+            expected = estimator.estimate(self.observations[i:i + 1], self.reference_observations[start:end],
+                                          self.weights[start:end])
+            np.testing.assert_allclose(p_values[i:i + 1], expected, rtol=1e-10, atol=1e-12)
+
+    def test_gaussian(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Gaussian(direction=direction))
+
+    def test_exponential(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Exponential(direction=direction))
+
+    def test_uniform(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Uniform(direction=direction))
+
+    def test_empirical_estimator(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(EmpiricalEstimator(direction=direction))
+
+    def test_default_implementation(self):
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(DefaultSegmentsGaussian(direction=direction))
+
+    def test_empty_segments(self):
+        offsets = np.array([0, 0, 12, 12, 30, 30])
+        observations = self.observations[:5]
+
+        for estimator in [Gaussian(), Exponential(), Uniform(), EmpiricalEstimator(), DefaultSegmentsGaussian()]:
+            estimator.fit_segments(self.reference_observations, self.weights, offsets)
+            p_values = estimator.transform_segments(observations)
+
+            np.testing.assert_array_equal(p_values[[0, 2, 4]], np.ones((3, 2)))
+            self.assertFalse(np.any(np.isnan(p_values)))
+
+    def test_segments_without_weights(self):
+        # the weights of the second segment are all zero
+        self.weights[5:12] = 0.0
+
+        for direction in ['right-tailed', 'left-tailed', 'two-tailed']:
+            self.check_estimator(Uniform(direction=direction))
+            self.check_estimator(EmpiricalEstimator(direction=direction))
+
+            # the distributions of the parametric estimators are undefined
+            for estimator in [Gaussian(direction=direction), Exponential(direction=direction),
+                              DefaultSegmentsGaussian(direction=direction)]:
+                self.check_estimator(estimator)
+
+                np.testing.assert_array_equal(estimator.transform_segments(self.observations)[1], np.ones(2))
+
+    def test_invalid_offsets(self):
+        estimator = Gaussian()
+
+        for offsets in [[], [1, 30], [0, 29], [0, 20, 10, 30], [[0, 30]]]:
+            self.assertRaises(ValueError, estimator.fit_segments, self.reference_observations, self.weights, offsets)
+
+    def test_transform_segments_inconsistent_number_of_segments(self):
+        estimator = Exponential()
+        estimator.fit_segments(self.reference_observations, self.weights, self.offsets)
+
+        self.assertRaises(ValueError, estimator.transform_segments, self.observations[:5])
+
+    def test_transform_segments_without_fit(self):
+        for estimator in [Gaussian(), Exponential(), Uniform(), EmpiricalEstimator(), DefaultSegmentsGaussian()]:
+            self.assertRaises(ValueError, estimator.transform_segments, self.observations)
@@ -0,0 +1,26 @@
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+# vertices of all types with a name of two types (Vertex_C) and a vertex without history (Vertex_E)
+GATHER_MANY_VERTICES = pd.DataFrame(data={'name': ['Vertex_A', 'Vertex_B', 'Vertex_C', 'Vertex_D', 'Vertex_C',
+                                                   'Vertex_E'],
+                                          'type': ['PERSON', 'PERSON', 'PICTURE', 'POST', 'PERSON', 'PERSON']},
+                                    columns=['name', 'type'])
+
+
+class GatherManyChecks:
+    """
+    Checks of the test cases of the selection rules, whether gather_many() selects the same observations as gather()
+    for every vertex. The test case provides the selection rule sel_rule and the database db.
+    """
+
+    def assert_gather_many(self, vertices, time_window):
+        result = self.sel_rule.gather_many(vertices, time_window, self.db)
+
+        self.assertEqual(len(result), len(vertices))
+        for i, (vertex_name, vertex_type) in enumerate(zip(vertices['name'], vertices['type'])):
+            assert_frame_equal(result.segment(i), self.sel_rule.gather(vertex_name, vertex_type, time_window, self.db))
+
+    def test_gather_many(self):
+        for time_window in range(1, 5):
+            self.assert_gather_many(GATHER_MANY_VERTICES, time_window)
@@ -0,0 +1,40 @@
+import datetime as dt
+from unittest import TestCase
+
+import pandas as pd
+
+from sfgad import algorithms
+from sfgad.analyzer import Analyzer
+
+
+class TestAlgorithms(TestCase):
+    def setUp(self):
+        self.dfs = [
+            pd.DataFrame({'TIMESTAMP': [dt.datetime(2017, 1, 1) + dt.timedelta(days=i)] * 3,
+                          'E_NAME': ['A_B', 'A_C', 'B_C'],
+                          'E_TYPE': ['LIKE', 'POST', 'LIKE'],
+                          'SRC_NAME': ['A', 'A', 'B'],
+                          'SRC_TYPE': ['NODE', 'NODE', 'NODE'],
+                          'DST_NAME': ['B', 'C', 'C'],
+                          'DST_TYPE': ['NODE', 'NODE', 'NODE']}) for i in range(3)]
+
+    def test_presets(self):
+        presets = [algorithms.dapa(n_jobs=1), algorithms.dapa_modified(n_jobs=1), algorithms.hotspot(n_jobs=1),
+                   algorithms.hotspot_modified(n_jobs=1), algorithms.dnd_modified(n_jobs=1),
+                   algorithms.nphgs(edge_types=['LIKE', 'POST'], n_jobs=1),
+                   algorithms.nphgs_modified(edge_types=['LIKE', 'POST'], n_jobs=1)]
+
+        for analyzer in presets:
+            self.assertIsInstance(analyzer, Analyzer)
+
+    def test_hotspot_modes(self):
+        for mode in ['HC', 'HA', 'Fisher']:
+            self.assertIsInstance(algorithms.hotspot(mode=mode, n_jobs=1), Analyzer)
+        self.assertRaises(ValueError, algorithms.hotspot, mode='HB', n_jobs=1)
+
+    def test_constant_weight_presets(self):
+        for analyzer in [algorithms.dnd_modified(n_jobs=1), algorithms.nphgs(edge_types=['LIKE', 'POST'], n_jobs=1)]:
+            for df in self.dfs:
+                result = analyzer.fit_transform(df)
+
+            self.assertEqual(list(result['name']), ['A', 'B', 'C'])
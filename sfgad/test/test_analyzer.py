@@ -5,12 +5,15 @@ import numpy as np
 import pandas as pd
 from pandas.util.testing import assert_frame_equal
 
+from sfgad.aggregation.top_k_tracker import TopKTracker
 from sfgad.analyzer import Analyzer
 from sfgad.modules.features import VertexDegree
 from sfgad.modules.observation_selection import HistoricAllSelection
 from sfgad.modules.probability_combination import AvgProbability
 from sfgad.modules.probability_estimation import EmpiricalEstimator
 from sfgad.modules.weighting import ConstantWeight
+from sfgad.utils.instrumentation import Instrumentation, MemorySink
+from sfgad.utils.memory import MemoryTimeSeries
 
 
 class TestAnalyzer(TestCase):
@@ -79,3 +82,102 @@ class TestAnalyzer(TestCase):
         result = self.analyzer.fit_transform(self.dfs[0])
 
         self.assertEqual(result.dtypes.tolist(), [np.object_, np.int64, np.float64])
+
+    def test_same_name_different_types(self):
+        df = pd.DataFrame({'TIMESTAMP': [dt.datetime(2017, 1, 1)] * 2,
+                           'SRC_NAME': ['A', 'B'],
+                           'SRC_TYPE': ['NODE', 'NODE'],
+                           'DST_NAME': ['B', 'C'],
+                           'DST_TYPE': ['OTHER', 'OTHER']})
+
+        result = self.analyzer.fit_transform(df)
+
+        # every vertex is saved once, vertices with the same name share their feature values
+        self.assertEqual(result['name'].tolist(), ['A', 'B', 'B', 'C'])
+        self.assertEqual(self.analyzer.db.select_all()[['name', 'type', 'VertexDegree']].values.tolist(),
+                         [['A', 'NODE', 1], ['B', 'NODE', 2], ['B', 'OTHER', 2], ['C', 'OTHER', 1]])
+
+    def test_top_k_tracker(self):
+        tracker = TopKTracker(k=2, horizon=3)
+        self.analyzer.top_k_tracker = tracker
+
+        for df in self.dfs[:5]:
+            result = self.analyzer.fit_transform(df)
+
+        # the p_values of the windows 0 and 1 are missing or beyond the horizon
+        expected = result.sort_values('p_value', kind='mergesort')[:2]
+        self.assertEqual(len(tracker), 2)
+        self.assertTrue(all(window >= 2 for vertex, window, p_value in tracker.top()))
+        self.assertLessEqual(tracker.top()[1][2], expected['p_value'].max())
+        self.assertTrue(all(vertex in [('A', 'NODE'), ('B', 'NODE'), ('C', 'NODE')]
+                            for vertex, window, p_value in tracker.top()))
+
+    def test_align_features(self):
+        name_codes = self.analyzer.vertex_names.encode(['B', 'A', 'X', 'A'])
+        feature_df_list = [pd.DataFrame({'name': ['A', 'B', 'A'], 'VertexDegree': [1.0, 2.0, 3.0]}),
+                           pd.DataFrame({'name': ['B'], 'VertexActivity': [1]})]
+
+        result = self.analyzer.align_features(name_codes, feature_df_list)
+
+        # the last row of a name wins and missing vertices have no feature values
+        np.testing.assert_array_equal(result['VertexDegree'], [2.0, 3.0, np.nan, 3.0])
+        np.testing.assert_array_equal(result['VertexActivity'], [1, np.nan, np.nan, np.nan])
+
+    def test_instrumentation(self):
+        sink = MemorySink()
+        self.analyzer.instrumentation = Instrumentation([sink])
+
+        for df in self.dfs[:3]:
+            self.analyzer.fit_transform(df)
+
+        self.assertEqual([summary['time_window'] for summary in sink.windows], [0, 1, 2])
+        self.assertEqual(sink.stage_calls['features/VertexDegree'], 3)
+        self.assertEqual(sink.stage_calls['insert_records'], 3)
+        self.assertEqual(sink.stage_calls['gather/HistoricAllSelection'], 3)
+
+        # each of the vertices A, B and C gathers the 0, 3 and 6 records of the previous windows
+        self.assertEqual([summary['counters'] for summary in sink.windows],
+                         [{'vertices': 3, 'gathered_rows': 0}, {'vertices': 3, 'gathered_rows': 9},
+                          {'vertices': 3, 'gathered_rows': 18}])
+
+        # the modules are only called, if a vertex has enough observations
+        self.assertEqual(sink.stage_calls['estimation/EmpiricalEstimator'], 6)
+        self.assertEqual(sink.stage_calls['combination/AvgProbability'], 6)
+        self.assertNotIn('estimation/EmpiricalEstimator', sink.windows[0]['stages'])
+
+        # the distribution of the gathered rows per vertex of every window
+        self.assertEqual([summary['distributions']['gathered_rows']['max'] for summary in sink.windows], [0, 3, 6])
+
+    def test_instrumentation_parallel(self):
+        sink = MemorySink()
+        self.analyzer.instrumentation = Instrumentation([sink])
+        self.analyzer.n_jobs = 2
+
+        for df in self.dfs[:3]:
+            self.analyzer.fit_transform(df)
+
+        # the stages and counters of the worker processes are added to the windows
+        self.assertEqual(sink.stage_calls['gather/HistoricAllSelection'], 6)
+        self.assertEqual(sink.stage_calls['estimation/EmpiricalEstimator'], 6)
+        self.assertEqual([summary['counters']['gathered_rows'] for summary in sink.windows], [0, 9, 18])
+        self.assertEqual([summary['distributions']['gathered_rows']['count'] for summary in sink.windows], [3, 3, 3])
+
+    def test_memory_report(self):
+        series = MemoryTimeSeries()
+        self.analyzer.memory_series = series
+
+        for df in self.dfs[:3]:
+            self.analyzer.fit_transform(df)
+
+        report = self.analyzer.memory_report()
+
+        self.assertEqual(sorted(report), ['analyzer', 'db', 'estimator', 'estimator_cache', 'features/VertexDegree'])
+        self.assertEqual(report['db']['database']['entries'], 9)
+        self.assertEqual(report['db']['first_occurrences']['entries'], 3)
+        self.assertEqual(report['analyzer']['vertex_names.codes']['entries'], 3)
+
+        # the history grows with every window
+        history = series.to_frame().query("structure == 'database'")
+        self.assertEqual(list(history['time_window']), [0, 1, 2])
+        self.assertEqual(list(history['entries']), [3, 6, 9])
+        self.assertTrue(history['bytes'].is_monotonic_increasing)
@@ -0,0 +1,168 @@
+import datetime as dt
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.analyzer import Analyzer
+from sfgad.modules.features import VertexDegree, VertexDegreeDifference
+from sfgad.modules.observation_selection import HistoricSameSelection
+from sfgad.modules.observation_selection.helper.sqlite_database import SQLiteDatabase
+from sfgad.modules.probability_combination import AvgProbability
+from sfgad.modules.probability_estimation import Gaussian
+from sfgad.modules.weighting import ConstantWeight
+from sfgad.utils.checkpoint import write_frame, read_frame
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.dfs = [
+            pd.DataFrame({'TIMESTAMP': [dt.datetime.fromordinal(1).replace(year=2017) + dt.timedelta(days=i)] * 4,
+                          'SRC_NAME': ['A', 'A', 'B', ['D', 'E', 'F'][i % 3]],
+                          'SRC_TYPE': ['NODE'] * 4,
+                          'DST_NAME': ['B', 'C', 'C', 'A'],
+                          'DST_TYPE': ['NODE'] * 4}) for i in range(12)]
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'checkpoint')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def create_analyzer(self, db_con=None):
+        return Analyzer([VertexDegree(), VertexDegreeDifference()], HistoricSameSelection(), ConstantWeight(),
+                        Gaussian(), AvgProbability(), db_con=db_con)
+
+    def create_sqlite_analyzer(self, file_name='history.db'):
+        return self.create_analyzer(SQLiteDatabase(os.path.join(self.tmp_dir.name, file_name),
+                                                   ['VertexDegree', 'VertexDegreeDifference']))
+
+    def test_full_checkpoint(self):
+        analyzer = self.create_analyzer()
+        for df in self.dfs[:6]:
+            analyzer.fit_transform(df)
+        analyzer.save_checkpoint(self.path)
+
+        restored = self.create_analyzer()
+        restored.load_checkpoint(self.path)
+
+        self.assertEqual(restored.time_window, 6)
+        self.assertEqual(restored.db.first_occurrences, analyzer.db.first_occurrences)
+        assert_frame_equal(restored.db.select_all(), analyzer.db.select_all(), check_dtype=False)
+        assert_frame_equal(restored.features_list[1].previous_count_df, analyzer.features_list[1].previous_count_df)
+
+        for df in self.dfs[6:]:
+            assert_frame_equal(restored.fit_transform(df), analyzer.fit_transform(df))
+
+    def test_incremental_checkpoint(self):
+        analyzer = self.create_analyzer()
+        for i, df in enumerate(self.dfs[:9]):
+            analyzer.fit_transform(df)
+            if i % 3 == 2:
+                analyzer.save_checkpoint(self.path, incremental=True)
+
+        # the unchanged stateless feature is only written with the first snapshot
+        self.assertEqual(sorted(os.listdir(self.path))[:3],
+                         ['features-00000.pkl', 'features-00001.pkl', 'features-00002.pkl'])
+
+        restored = self.create_analyzer()
+        restored.load_checkpoint(self.path)
+
+        self.assertEqual(restored.time_window, 9)
+        self.assertEqual(restored.db.first_occurrences, analyzer.db.first_occurrences)
+        assert_frame_equal(restored.db.select_all(), analyzer.db.select_all(), check_dtype=False)
+
+        for df in self.dfs[9:]:
+            assert_frame_equal(restored.fit_transform(df), analyzer.fit_transform(df))
+
+    def test_incremental_checkpoint_writes_changes(self):
+        analyzer = self.create_analyzer()
+        for df in self.dfs[:3]:
+            analyzer.fit_transform(df)
+        analyzer.save_checkpoint(self.path, incremental=True)
+        analyzer.fit_transform(self.dfs[3])
+        analyzer.save_checkpoint(self.path, incremental=True)
+
+        # only the new records and the stateful feature are written with the second snapshot
+        self.assertEqual(len(read_frame(os.path.join(self.path, 'history-00001.npz'))), 4)
+        with open(os.path.join(self.path, 'features-00001.pkl'), 'rb') as file:
+            self.assertEqual(list(pickle.load(file)), [1])
+
+    def test_sqlite_checkpoint(self):
+        analyzer = self.create_sqlite_analyzer()
+        for df in self.dfs[:6]:
+            analyzer.fit_transform(df)
+        analyzer.save_checkpoint(self.path)
+        analyzer.db.close_connection()
+
+        # the database file holds all records of the checkpoint already
+        restored = self.create_sqlite_analyzer()
+        restored.load_checkpoint(self.path)
+
+        self.assertEqual(restored.db.count_records(), 24)
+        self.assertEqual(restored.time_window, 6)
+
+        reference = self.create_sqlite_analyzer('reference.db')
+        for df in self.dfs[:6]:
+            reference.fit_transform(df)
+        for df in self.dfs[6:]:
+            assert_frame_equal(restored.fit_transform(df), reference.fit_transform(df))
+        restored.db.close_connection()
+        reference.db.close_connection()
+
+    def test_sqlite_checkpoint_missing_records(self):
+        analyzer = self.create_sqlite_analyzer()
+        for i, df in enumerate(self.dfs[:6]):
+            analyzer.fit_transform(df)
+            if i % 2 == 1:
+                analyzer.save_checkpoint(self.path, incremental=True)
+
+        # a database with the records of the first three windows only gets the remaining records
+        partial = self.create_sqlite_analyzer('partial.db')
+        partial.db.insert_records(analyzer.db.select_from(0).iloc[:12])
+        partial.load_checkpoint(self.path)
+
+        assert_frame_equal(partial.db.select_all(), analyzer.db.select_all())
+        analyzer.db.close_connection()
+
+        # a database with more records than the checkpoint can not be restored
+        partial.db.insert_record('A', 'NODE', 6, [1, 0])
+        with self.assertRaises(ValueError):
+            partial.load_checkpoint(self.path)
+        partial.db.close_connection()
+
+    def test_full_checkpoint_replaces_snapshots(self):
+        analyzer = self.create_analyzer()
+        for df in self.dfs[:3]:
+            analyzer.fit_transform(df)
+            analyzer.save_checkpoint(self.path, incremental=True)
+        analyzer.save_checkpoint(self.path)
+
+        self.assertEqual(sorted(os.listdir(self.path)),
+                         ['features-00000.pkl', 'history-00000.npz', 'manifest.json', 'occurrences-00000.npz'])
+
+    def test_incompatible_features(self):
+        analyzer = self.create_analyzer()
+        analyzer.fit_transform(self.dfs[0])
+        analyzer.save_checkpoint(self.path)
+
+        other = Analyzer([VertexDegree()], HistoricSameSelection(), ConstantWeight(), Gaussian(), AvgProbability())
+        with self.assertRaises(ValueError):
+            other.load_checkpoint(self.path)
+
+    def test_missing_checkpoint(self):
+        with self.assertRaises(ValueError):
+            self.create_analyzer().load_checkpoint(self.path)
+
+    def test_frame_round_trip(self):
+        df = pd.DataFrame({'name': ['A', None, 'B', 'A'], 'count': [1, 2, 3, 4], 'value': [0.5, np.nan, 1.5, 2.0],
+                           'time': pd.to_datetime(['2018-01-01'] * 4)}, columns=['name', 'count', 'value', 'time'])
+        file_path = os.path.join(self.tmp_dir.name, 'frame.npz')
+
+        write_frame(file_path, df)
+
+        assert_frame_equal(read_frame(file_path), df)
@@ -0,0 +1,151 @@
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+from sfgad.utils.instrumentation import Instrumentation, NullInstrumentation, MemorySink, ChromeTraceSink, current_rss
+
+
+class TestInstrumentation(TestCase):
+    def setUp(self):
+        self.sink = MemorySink()
+        self.instrumentation = Instrumentation([self.sink])
+
+    def test_stages(self):
+        with self.instrumentation.window(0):
+            for i in range(3):
+                with self.instrumentation.stage('estimation/Gaussian'):
+                    pass
+            with self.instrumentation.stage('insert_records'):
+                pass
+
+        self.assertEqual(self.sink.stage_calls, {'estimation/Gaussian': 3, 'insert_records': 1})
+        self.assertEqual(self.sink.windows[0]['stages']['estimation/Gaussian']['calls'], 3)
+        self.assertGreaterEqual(self.sink.windows[0]['wall_time'], self.sink.stage_times['estimation/Gaussian'])
+
+    def test_one_span_per_stage_and_window(self):
+        spans = []
+        self.sink.record_span = lambda name, start, duration, calls: spans.append((name, calls))
+
+        for time_window in range(2):
+            with self.instrumentation.window(time_window):
+                for i in range(100):
+                    with self.instrumentation.stage('estimation/Gaussian'):
+                        pass
+
+        self.assertEqual(spans, [('estimation/Gaussian', 100), ('estimation/Gaussian', 100)])
+
+    def test_counters_per_window(self):
+        for time_window in range(2):
+            with self.instrumentation.window(time_window):
+                self.instrumentation.count('vertices', 3)
+                self.instrumentation.count('gathered_rows', 2 * time_window)
+                self.instrumentation.count('gathered_rows', 2 * time_window)
+
+        self.assertEqual([summary['counters'] for summary in self.sink.windows],
+                         [{'vertices': 3, 'gathered_rows': 0}, {'vertices': 3, 'gathered_rows': 4}])
+        self.assertEqual([summary['time_window'] for summary in self.sink.windows], [0, 1])
+        self.assertTrue(all(isinstance(summary['memory_delta'], int) for summary in self.sink.windows))
+
+    def test_distributions(self):
+        with self.instrumentation.window(0):
+            for value in range(101):
+                self.instrumentation.observe('gathered_rows', value)
+
+        self.assertEqual(self.sink.windows[0]['distributions'],
+                         {'gathered_rows': {'count': 101, 'max': 100, 'p50': 50.0, 'p90': 90.0, 'p99': 99.0}})
+
+    def test_merge(self):
+        worker = self.instrumentation.fork()
+        with worker.stage('estimation/Gaussian'):
+            pass
+        worker.count('gathered_rows', 3)
+        worker.observe('gathered_rows', 3)
+
+        with self.instrumentation.window(0):
+            with self.instrumentation.stage('estimation/Gaussian'):
+                pass
+            self.instrumentation.count('gathered_rows', 1)
+            self.instrumentation.observe('gathered_rows', 1)
+            self.instrumentation.merge(worker.totals())
+
+        summary = self.sink.windows[0]
+        self.assertEqual(summary['stages']['estimation/Gaussian']['calls'], 2)
+        self.assertEqual(summary['counters'], {'gathered_rows': 4})
+        self.assertEqual(summary['distributions']['gathered_rows']['count'], 2)
+        self.assertEqual(summary['distributions']['gathered_rows']['max'], 3)
+
+    def test_copy_without_sinks(self):
+        copy = pickle.loads(pickle.dumps(self.instrumentation))
+
+        self.assertEqual(copy.sinks, [])
+        self.assertEqual(self.instrumentation.sinks, [self.sink])
+
+    def test_stage_with_exception(self):
+        with self.assertRaises(KeyError):
+            with self.instrumentation.window(0):
+                with self.instrumentation.stage('merge'):
+                    raise KeyError()
+
+        self.assertEqual(self.sink.stage_calls['merge'], 1)
+
+    def test_stage_outside_of_windows(self):
+        with self.instrumentation.stage('merge'):
+            pass
+        self.instrumentation.close()
+
+        self.assertEqual(self.sink.stage_calls['merge'], 1)
+
+    def test_chrome_trace(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            instrumentation = Instrumentation([ChromeTraceSink(path)])
+
+            with instrumentation.window(0):
+                for i in range(3):
+                    with instrumentation.stage('features/VertexDegree'):
+                        pass
+                instrumentation.count('vertices', 3)
+
+            # the events of a window are written at its end
+            with open(path) as f:
+                self.assertEqual(f.read().count('features/VertexDegree'), 1)
+
+            instrumentation.close()
+            with open(path) as f:
+                trace = json.load(f)
+
+        spans = [event for event in trace if event['ph'] == 'X']
+        counters = [event for event in trace if event['ph'] == 'C']
+
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0]['name'], 'features/VertexDegree')
+        self.assertEqual(spans[0]['cat'], 'features')
+        self.assertEqual(spans[0]['args'], {'calls': 3})
+        self.assertGreaterEqual(spans[0]['dur'], 0)
+        self.assertEqual([event['name'] for event in counters], ['counters', 'memory_delta'])
+        self.assertEqual(counters[0]['args'], {'vertices': 3})
+
+    def test_null_instrumentation(self):
+        instrumentation = NullInstrumentation()
+
+        with instrumentation.window(0):
+            with instrumentation.stage('merge'):
+                instrumentation.count('vertices', 3)
+                instrumentation.observe('gathered_rows', 3)
+        instrumentation.merge(instrumentation.fork().totals())
+        instrumentation.close()
+
+        self.assertFalse(instrumentation.enabled)
+
+    def test_current_rss(self):
+        self.assertGreater(current_rss(), 0)
+
+    def test_import_without_resource(self):
+        # e.g. on Windows, which has no resource module
+        code = "import sys; sys.modules['resource'] = None; import sfgad.analyzer"
+
+        self.assertEqual(subprocess.run([sys.executable, '-c', code]).returncode, 0)
@@ -0,0 +1,48 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+
+from sfgad.utils.interning import Interner
+
+
+class TestInterner(TestCase):
+    def setUp(self):
+        self.interner = Interner(['Vertex_A', 'Vertex_B'])
+
+    def test_encode(self):
+        codes = self.interner.encode(['Vertex_B', 'Vertex_C', 'Vertex_A', 'Vertex_C'])
+
+        self.assertEqual(codes.dtype, np.int32)
+        np.testing.assert_array_equal(codes, [1, 2, 0, 2])
+        self.assertEqual(len(self.interner), 3)
+
+    def test_codes_are_stable(self):
+        self.interner.encode(['Vertex_C'])
+
+        np.testing.assert_array_equal(self.interner.encode(['Vertex_A', 'Vertex_C']), [0, 2])
+
+    def test_encode_empty(self):
+        self.assertEqual(len(self.interner.encode([])), 0)
+        self.assertEqual(len(Interner()), 0)
+
+    def test_decode(self):
+        codes = self.interner.encode(['Vertex_C', 'Vertex_A'])
+
+        np.testing.assert_array_equal(self.interner.decode(codes), ['Vertex_C', 'Vertex_A'])
+        np.testing.assert_array_equal(self.interner.decode(np.array([], dtype=np.int32)), [])
+
+    def test_grow(self):
+        values = ['Vertex_%d' % i for i in range(100)]
+
+        codes = self.interner.encode(values + ['Vertex_A'])
+
+        np.testing.assert_array_equal(codes[:2], [2, 3])
+        self.assertEqual(codes[-1], 0)
+        self.assertEqual(len(self.interner), 102)
+        np.testing.assert_array_equal(self.interner.decode(codes), values + ['Vertex_A'])
+
+    def test_pickle(self):
+        interner = pickle.loads(pickle.dumps(self.interner))
+
+        np.testing.assert_array_equal(interner.encode(['Vertex_B', 'Vertex_D']), [1, 2])
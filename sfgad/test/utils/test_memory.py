@@ -0,0 +1,78 @@
+from collections import deque
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from sfgad.utils.memory import approximate_size, footprint, memory_report, MemoryTimeSeries
+
+
+class State:
+    def __init__(self):
+        self.names = ['Feature_A']
+        self.nodes = ['Vertex_A', 'Vertex_B']
+        self.buffer = deque([np.zeros(100)], maxlen=2)
+        self.threshold = 2
+
+
+class Wrapper:
+    def __init__(self):
+        self.state = State()
+
+
+class Report:
+    def __init__(self, time_window):
+        self.time_window = time_window
+
+    def memory_report(self):
+        return {'feature': {'nodes': {'entries': self.time_window, 'bytes': 8 * self.time_window}}}
+
+
+class TestApproximateSize(TestCase):
+    def test_array(self):
+        array = np.zeros(1000)
+
+        self.assertGreaterEqual(approximate_size(array), array.nbytes)
+        self.assertGreaterEqual(approximate_size([array]), array.nbytes)
+
+    def test_shared_objects_are_counted_once(self):
+        array = np.zeros(1000)
+
+        self.assertLess(approximate_size([array, array]), approximate_size([array, np.zeros(1000)]))
+
+    def test_dataframe(self):
+        df = pd.DataFrame({'name': ['Vertex_A', 'Vertex_B'], 'VertexDegree': [1.0, 2.0]})
+
+        self.assertEqual(approximate_size(df), df.memory_usage(index=True, deep=True).sum())
+
+    def test_nested_objects(self):
+        self.assertGreater(approximate_size(Wrapper()), approximate_size(np.zeros(100)))
+
+
+class TestMemoryReport(TestCase):
+    def test_containers(self):
+        report = memory_report(State(), exclude=['names'])
+
+        self.assertEqual(sorted(report), ['buffer', 'nodes'])
+        self.assertEqual(report['nodes']['entries'], 2)
+        self.assertEqual(report['buffer']['entries'], 1)
+        self.assertGreaterEqual(report['buffer']['bytes'], 800)
+
+    def test_dotted_names(self):
+        report = memory_report(Wrapper(), ['state.nodes'])
+
+        self.assertEqual(report, {'state.nodes': footprint(['Vertex_A', 'Vertex_B'])})
+
+    def test_time_series(self):
+        series = MemoryTimeSeries(interval=2)
+        for time_window in range(5):
+            series.record(time_window, Report(time_window))
+
+        df = series.to_frame()
+
+        self.assertEqual(list(df.columns), ['time_window', 'component', 'structure', 'entries', 'bytes'])
+        self.assertEqual(list(df['time_window']), [0, 2, 4])
+        self.assertEqual(list(df['bytes']), [0, 16, 32])
+
+    def test_invalid_interval(self):
+        self.assertRaises(ValueError, MemoryTimeSeries, interval=0)
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
+
+from sfgad.modules.probability_combination.empirical_combiner import EmpiricalCombiner
+from sfgad.modules.probability_estimation.gaussian import Gaussian
+from sfgad.modules.weighting import ExponentialDecayWeight, TypeSpecificWeight
+from sfgad.utils.observation_block import ObservationBlock
+from sfgad.utils.validation import check_meta_info_dataframe, check_reference_observations
+
+
+class TestObservationBlock(TestCase):
+    def setUp(self):
+        self.frame = pd.DataFrame({'name': ['Vertex_A', 'Vertex_B', 'Vertex_C', 'Vertex_A'],
+                                   'type': ['PERSON', 'PICTURE', 'PERSON', 'PERSON'],
+                                   'time_window': [3, 3, 2, 1],
+                                   'feature_A': [1, 2, 3, 4],
+                                   'feature_B': [0.5, 0.25, 0.125, 1.0]})
+        self.block = ObservationBlock.from_frame(self.frame, ['feature_A', 'feature_B'])
+
+    def test_from_frame(self):
+        np.testing.assert_array_equal(self.block.values, [[1, 0.5], [2, 0.25], [3, 0.125], [4, 1.0]])
+        self.assertEqual(self.block.values.dtype, np.float64)
+        self.assertTrue(self.block.values.flags['C_CONTIGUOUS'])
+        self.assertEqual(self.block.type_codes.dtype, np.int32)
+        np.testing.assert_array_equal(self.block.types[self.block.type_codes], self.frame['type'])
+        np.testing.assert_array_equal(self.block.time_windows, [3, 3, 2, 1])
+        self.assertEqual(len(self.block), 4)
+
+    def test_from_frame_missing_columns(self):
+        self.assertRaises(ValueError, ObservationBlock.from_frame, self.frame.drop(columns='type'), ['feature_A'])
+        self.assertRaises(ValueError, ObservationBlock.from_frame, self.frame, ['feature_C'])
+
+    def test_from_frame_not_numeric(self):
+        self.frame['feature_A'] = ['A', 'B', 'C', 'D']
+
+        self.assertRaises(ValueError, ObservationBlock.from_frame, self.frame, ['feature_A'])
+
+    def test_getitem(self):
+        np.testing.assert_array_equal(self.block['type'], ['PERSON', 'PICTURE', 'PERSON', 'PERSON'])
+        np.testing.assert_array_equal(self.block['feature_B'], [0.5, 0.25, 0.125, 1.0])
+        self.assertRaises(KeyError, self.block.__getitem__, 'feature_C')
+
+        selected = self.block[['feature_B']]
+        np.testing.assert_array_equal(selected.values, [[0.5], [0.25], [0.125], [1.0]])
+        self.assertIs(selected.names, self.block.names)
+
+        np.testing.assert_array_equal(self.block[np.array([False, True, True, False])]['name'], ['Vertex_B', 'Vertex_C'])
+        np.testing.assert_array_equal(self.block[1:3]['time_window'], [3, 2])
+
+    def test_to_frame(self):
+        assert_frame_equal(self.block.to_frame(), self.frame.astype({'feature_A': np.float64}))
+
+    def test_validation(self):
+        self.assertIs(check_reference_observations(self.block), self.block.values)
+        self.assertIs(check_meta_info_dataframe(self.block, required_columns=['type', 'feature_A']), self.block)
+        self.assertRaises(ValueError, check_meta_info_dataframe, self.block, ['age'])
+
+    def test_stages(self):
+        current_meta_info = pd.Series({'time_window': 4, 'type': 'PERSON'})
+        frame = self.frame[['name', 'type', 'time_window']]
+
+        for weighting_function in [ExponentialDecayWeight(half_life=2),
+                                   TypeSpecificWeight({'PERSON': 0.5, 'PICTURE': 2.0})]:
+            np.testing.assert_allclose(weighting_function.compute(self.block, current_meta_info),
+                                       weighting_function.compute(frame, current_meta_info))
+
+        weights = np.array([1.0, 0.5, 0.25, 2.0])
+        np.testing.assert_allclose(Gaussian().estimate([[2, 0.5]], self.block, weights),
+                                   Gaussian().estimate([[2, 0.5]], self.frame[['feature_A', 'feature_B']], weights))
+
+        self.assertEqual(EmpiricalCombiner().combine([[0.3, 0.2]], self.block[['feature_B']])[0], 0.25)
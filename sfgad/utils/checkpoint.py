@@ -0,0 +1,243 @@
+import hashlib
+import itertools
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from sfgad.modules.observation_selection import InMemoryDatabase
+from sfgad.modules.observation_selection.helper.cohorts import CohortIndex
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 2
+
+
+def save_checkpoint(analyzer, path, incremental=False):
+    """
+    Writes the state of the given analyzer to the checkpoint directory at path.
+    A full checkpoint replaces all snapshots in the directory. An incremental checkpoint only reads and writes the
+    history records and first occurrences that were added since the last snapshot, and the features whose state has
+    changed (by their versions).
+    :param analyzer: The analyzer to save.
+    :param path: The checkpoint directory.
+    :param incremental: True, if only the changes since the last snapshot should be written. Falls back to a full
+    checkpoint if the directory contains no snapshot yet.
+    """
+
+    manifest = read_manifest(path) if incremental else None
+    n_history_rows = analyzer.db.count_records()
+    n_first_occurrences = len(analyzer.db.first_occurrences)
+    feature_states = [feature_state(f) for f in analyzer.features_list]
+
+    if manifest is None:
+        os.makedirs(path, exist_ok=True)
+        remove_snapshots(path)
+        manifest = {'version': FORMAT_VERSION,
+                    'feature_names': [name for f in analyzer.features_list for name in f.names],
+                    'snapshots': [], 'n_history_rows': 0, 'n_first_occurrences': 0,
+                    'feature_states': [None] * len(analyzer.features_list)}
+    else:
+        check_compatible(analyzer, manifest)
+        if n_history_rows < manifest['n_history_rows'] or n_first_occurrences < manifest['n_first_occurrences']:
+            raise ValueError("The analyzer is behind the last snapshot of the checkpoint at %s." % path)
+
+    snapshot_id = len(manifest['snapshots'])
+
+    # write the new history records and first occurrences (in the order of their insertion) in columnar form
+    write_frame(os.path.join(path, 'history-%05d.npz' % snapshot_id),
+                analyzer.db.select_from(manifest['n_history_rows']))
+    new_occurrences = itertools.islice(analyzer.db.first_occurrences.items(), manifest['n_first_occurrences'], None)
+    write_frame(os.path.join(path, 'occurrences-%05d.npz' % snapshot_id),
+                pd.DataFrame([(name, vertex_type, time_window) for (name, vertex_type), time_window in new_occurrences],
+                             columns=['name', 'type', 'time_window']))
+
+    # write the state of all features that changed since the last snapshot
+    changed_features = {i: f for i, (f, state) in enumerate(zip(analyzer.features_list, feature_states))
+                        if state != manifest['feature_states'][i]}
+    with open(os.path.join(path, 'features-%05d.pkl' % snapshot_id), 'wb') as file:
+        pickle.dump(changed_features, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    manifest['snapshots'].append({'time_window': analyzer.time_window,
+                                  'n_history_rows': n_history_rows - manifest['n_history_rows'],
+                                  'features': sorted(changed_features)})
+    manifest['n_history_rows'] = n_history_rows
+    manifest['n_first_occurrences'] = n_first_occurrences
+    manifest['feature_states'] = feature_states
+
+    write_manifest(path, manifest)
+
+
+def load_checkpoint(analyzer, path):
+    """
+    Restores the state of the given analyzer from the checkpoint directory at path by replaying all of its snapshots.
+    The analyzer has to be configured with the same features as the analyzer the checkpoint was written from.
+    The history of an InMemoryDatabase is replaced. Other (durable) databases usually hold the records already, e.g. the
+    SQLite file the analyzer wrote to. As the records are written in order, only the records of the checkpoint beyond
+    the records in the database are inserted.
+    :param analyzer: The analyzer to restore.
+    :param path: The checkpoint directory.
+    """
+
+    manifest = read_manifest(path)
+    if manifest is None:
+        raise ValueError("Found no checkpoint at %s." % path)
+    check_compatible(analyzer, manifest)
+
+    in_memory = isinstance(analyzer.db, InMemoryDatabase)
+    n_stored_rows = 0 if in_memory else analyzer.db.count_records()
+    if n_stored_rows > manifest['n_history_rows']:
+        raise ValueError("The database holds %d records, but the checkpoint at %s only %d." % (
+            n_stored_rows, path, manifest['n_history_rows']))
+
+    history_parts = []
+    first_occurrences = {}
+    features = {}
+    offset = 0
+
+    for snapshot_id, snapshot in enumerate(manifest['snapshots']):
+        # the snapshots of records, which the database holds already, are skipped
+        if offset + snapshot['n_history_rows'] > n_stored_rows:
+            history = read_frame(os.path.join(path, 'history-%05d.npz' % snapshot_id))
+            history_parts.append(history.iloc[max(n_stored_rows - offset, 0):])
+        offset += snapshot['n_history_rows']
+
+        if in_memory:
+            occurrences = read_frame(os.path.join(path, 'occurrences-%05d.npz' % snapshot_id))
+            first_occurrences.update(zip(zip(occurrences['name'], occurrences['type']),
+                                         occurrences['time_window'].tolist()))
+
+        with open(os.path.join(path, 'features-%05d.pkl' % snapshot_id), 'rb') as file:
+            features.update(pickle.load(file))
+
+    if in_memory:
+        analyzer.db.database = pd.concat(history_parts, ignore_index=True)
+        analyzer.db.first_occurrences = first_occurrences
+        analyzer.db.cohorts = CohortIndex(first_occurrences)
+        analyzer.db.version += 1
+    elif history_parts:
+        analyzer.db.insert_records(pd.concat(history_parts, ignore_index=True))
+
+    # update the features in place, so that references to them stay valid
+    for i, feature in features.items():
+        analyzer.features_list[i].__dict__.update(feature.__dict__)
+
+    analyzer.time_window = manifest['snapshots'][-1]['time_window']
+
+
+def feature_state(feature):
+    """
+    Returns the state of a feature, which is compared to find the features that changed since the last snapshot.
+    :param feature: The feature.
+    :return: list with the version of the feature, or with the digest of the pickled feature, if it has no version.
+    """
+
+    if feature.version is not None:
+        return ['version', feature.version]
+    return ['digest', hashlib.sha1(pickle.dumps(feature, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()]
+
+
+def check_compatible(analyzer, manifest):
+    """
+    Checks that the given analyzer has the same features as the analyzer the checkpoint was written from.
+    :param analyzer: The analyzer.
+    :param manifest: The manifest of the checkpoint.
+    """
+
+    if manifest['version'] != FORMAT_VERSION:
+        raise ValueError("Found checkpoint of version %d, but expected version %d." % (manifest['version'],
+                                                                                      FORMAT_VERSION))
+
+    feature_names = [name for f in analyzer.features_list for name in f.names]
+    if manifest['feature_names'] != feature_names:
+        raise ValueError("Found checkpoint with the features %s, but the analyzer has the features %s." % (
+            manifest['feature_names'], feature_names))
+
+
+def read_manifest(path):
+    """
+    Reads the manifest of the checkpoint directory at path.
+    :param path: The checkpoint directory.
+    :return: the manifest, or None if there is no checkpoint.
+    """
+
+    manifest_path = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path) as file:
+        return json.load(file)
+
+
+def write_manifest(path, manifest):
+    """
+    Writes the manifest of the checkpoint directory at path. The manifest is replaced atomically, so that an
+    interrupted checkpoint leaves the previous snapshots intact.
+    :param path: The checkpoint directory.
+    :param manifest: The manifest to write.
+    """
+
+    tmp_path = os.path.join(path, MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as file:
+        json.dump(manifest, file)
+    os.replace(tmp_path, os.path.join(path, MANIFEST))
+
+
+def remove_snapshots(path):
+    """
+    Removes the manifest and all snapshot files from the checkpoint directory at path.
+    :param path: The checkpoint directory.
+    """
+
+    for file_name in os.listdir(path):
+        if file_name == MANIFEST or file_name.split('-')[0] in ['history', 'occurrences', 'features']:
+            os.remove(os.path.join(path, file_name))
+
+
+def write_frame(file_path, df):
+    """
+    Writes the given dataframe column by column in a binary format. Numeric and datetime columns are stored as raw
+    arrays, all other columns are dictionary encoded.
+    :param file_path: The path of the file to write.
+    :param df: The dataframe to write.
+    """
+
+    arrays = {'columns': np.array([str(column) for column in df.columns])}
+
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if values.dtype.kind in 'biufcmM':
+            arrays['values_%d' % i] = values.values
+        else:
+            codes, uniques = pd.factorize(values)
+            arrays['codes_%d' % i] = codes.astype(np.int32)
+            arrays['uniques_%d' % i] = np.asarray(uniques)
+
+    with open(file_path, 'wb') as file:
+        np.savez(file, **arrays)
+
+
+def read_frame(file_path):
+    """
+    Reads a dataframe, which was written with write_frame.
+    :param file_path: The path of the file to read.
+    :return: the dataframe.
+    """
+
+    with np.load(file_path, allow_pickle=True) as arrays:
+        columns = list(arrays['columns'])
+        data = {}
+
+        for i, column in enumerate(columns):
+            if 'values_%d' % i in arrays:
+                data[column] = arrays['values_%d' % i]
+            else:
+                codes = arrays['codes_%d' % i]
+                uniques = arrays['uniques_%d' % i].astype(object)
+                values = uniques.take(codes, mode='clip') if len(uniques) else np.empty(len(codes), dtype=object)
+                # missing values are encoded with the code -1
+                values[codes < 0] = np.nan
+                data[column] = values
+
+    return pd.DataFrame(data, columns=columns)
@@ -0,0 +1,344 @@
+import abc
+import json
+import os
+import sys
+import threading
+from collections import defaultdict
+from contextlib import nullcontext
+from time import perf_counter
+
+import numpy as np
+
+
+class Sink(metaclass=abc.ABCMeta):
+    """
+    Receives the measurements of an Instrumentation.
+    """
+
+    @abc.abstractmethod
+    def record_span(self, name, start, duration, calls):
+        """
+        Records the executions of a stage within a time window.
+        :param name: The name of the stage.
+        :param start: The start of the first execution in seconds since the creation of the instrumentation.
+        :param duration: The total wall time of the executions in seconds.
+        :param calls: The number of executions.
+        """
+
+    @abc.abstractmethod
+    def record_window(self, summary):
+        """
+        Records the summary of a time window.
+        :param summary: Dictionary with the time_window, its start and wall_time, the wall time and calls per stage
+        (stages), the counters, the distributions of the observed values and the memory_delta in bytes.
+        """
+
+    def close(self):
+        """
+        Flushes the recorded measurements.
+        """
+
+
+class MemorySink(Sink):
+    """
+    Keeps the summaries of all windows and the total wall time and calls per stage in memory.
+    """
+
+    def __init__(self):
+        self.windows = []
+        self.stage_times = defaultdict(float)
+        self.stage_calls = defaultdict(int)
+
+    def record_span(self, name, start, duration, calls):
+        self.stage_times[name] += duration
+        self.stage_calls[name] += calls
+
+    def record_window(self, summary):
+        self.windows.append(summary)
+
+
+class ChromeTraceSink(Sink):
+    """
+    Writes the stages of every window as complete events (starting with the first execution of a stage and lasting its
+    total wall time) and the counters and memory of the windows as counter events to a JSON file in the array format of
+    the Chrome trace event format, which can be inspected in chrome://tracing or Perfetto. The events are written at
+    the end of every window, so that they are not kept in memory. The file is complete, once the sink is closed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pid = os.getpid()
+        self.file = open(path, 'w')
+        self.file.write('[')
+        self.n_events = 0
+
+    def record_span(self, name, start, duration, calls):
+        self.write({'name': name, 'cat': name.split('/')[0], 'ph': 'X', 'ts': start * 1e6, 'dur': duration * 1e6,
+                    'pid': self.pid, 'tid': threading.get_ident(), 'args': {'calls': calls}})
+
+    def record_window(self, summary):
+        ts = (summary['start'] + summary['wall_time']) * 1e6
+        self.write({'name': 'counters', 'ph': 'C', 'ts': ts, 'pid': self.pid, 'args': dict(summary['counters'])})
+        self.write({'name': 'memory_delta', 'ph': 'C', 'ts': ts, 'pid': self.pid,
+                    'args': {'bytes': summary['memory_delta']}})
+        self.file.flush()
+
+    def write(self, event):
+        self.file.write((',\n' if self.n_events else '\n') + json.dumps(event))
+        self.n_events += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.write('\n]\n')
+            self.file.close()
+
+
+class Span:
+    """
+    Measures the wall time of a stage as a context manager.
+    """
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.instrumentation.record(self.name, self.start, perf_counter() - self.start)
+        return False
+
+
+class Window:
+    """
+    Summarizes the stages, counters and memory of a time window as a context manager.
+    """
+
+    def __init__(self, instrumentation, time_window):
+        self.instrumentation = instrumentation
+        self.time_window = time_window
+
+    def __enter__(self):
+        self.instrumentation.begin_window()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.instrumentation.end_window(self.time_window)
+        return False
+
+
+class Instrumentation:
+    """
+    Records the wall time and calls of the stages of an analyzer (e.g. feature extraction, gather, weighting,
+    estimation, combination, merges and insert_records), counters (e.g. vertices and gathered rows) and distributions
+    (e.g. of the gathered rows per vertex) per time window and passes them to the given sinks. The executions of a
+    stage are summed up per window, so that the sinks receive one span per stage and window.
+    """
+
+    enabled = True
+
+    def __init__(self, sinks=()):
+        """
+        :param sinks: List of Sinks, which receive the measurements.
+        """
+        self.sinks = list(sinks)
+        self.origin = perf_counter()
+
+        self.window_start = None
+        self.window_rss = None
+        # the start of the first execution, the total wall time and the calls of every stage since the last flush
+        self.stages = {}
+        self.counters = defaultdict(int)
+        self.observations = defaultdict(list)
+
+    def __getstate__(self):
+        # copies (e.g. in the worker processes of an analyzer) do not pass their measurements to the sinks
+        state = dict(self.__dict__)
+        state['sinks'] = []
+        return state
+
+    def stage(self, name):
+        """
+        Returns a context manager, which measures a stage.
+        :param name: The name of the stage, e.g. 'estimation/Gaussian'.
+        :return: the context manager.
+        """
+        return Span(self, name)
+
+    def window(self, time_window):
+        """
+        Returns a context manager, which summarizes a time window.
+        :param time_window: The time window.
+        :return: the context manager.
+        """
+        return Window(self, time_window)
+
+    def count(self, name, value=1):
+        """
+        Increases a counter of the current time window.
+        :param name: The name of the counter.
+        :param value: The increment.
+        """
+        self.counters[name] += value
+
+    def observe(self, name, value):
+        """
+        Adds a value to a distribution of the current time window, which is summarized by its maximum and percentiles.
+        :param name: The name of the distribution.
+        :param value: The value.
+        """
+        self.observations[name].append(value)
+
+    def fork(self):
+        """
+        Returns a new instrumentation without sinks, e.g. for a worker process, whose totals are added to this
+        instrumentation by merge.
+        :return: the instrumentation.
+        """
+        return Instrumentation()
+
+    def totals(self):
+        """
+        Returns the measurements since the last flush, which can be added to another instrumentation by merge.
+        :return: dictionary with the total wall time and calls per stage (stages), the counters and the observations.
+        """
+        return {'stages': {name: (duration, calls) for name, (start, duration, calls) in self.stages.items()},
+                'counters': dict(self.counters),
+                'observations': {name: list(values) for name, values in self.observations.items()}}
+
+    def merge(self, totals):
+        """
+        Adds the totals of another instrumentation (e.g. of a worker process) to the current time window.
+        :param totals: The totals.
+        """
+        # the stages of the other instrumentation are placed at their first execution in this process or at the start
+        # of the window, as the clocks of processes are not comparable
+        start = (perf_counter() if self.window_start is None else self.window_start) - self.origin
+        for name, (duration, calls) in totals['stages'].items():
+            self.add(name, start, duration, calls)
+        for name, value in totals['counters'].items():
+            self.counters[name] += value
+        for name, values in totals['observations'].items():
+            self.observations[name].extend(values)
+
+    def record(self, name, start, duration):
+        self.add(name, start - self.origin, duration, 1)
+
+    def add(self, name, start, duration, calls):
+        stage = self.stages.get(name)
+        if stage is None:
+            self.stages[name] = [start, duration, calls]
+        else:
+            stage[1] += duration
+            stage[2] += calls
+
+    def flush(self):
+        """
+        Passes one span per stage with the total wall time and calls since the last flush to the sinks.
+        """
+        for name, (start, duration, calls) in self.stages.items():
+            for sink in self.sinks:
+                sink.record_span(name, start, duration, calls)
+        self.stages.clear()
+
+    def begin_window(self):
+        # stages outside of windows are passed to the sinks separately
+        self.flush()
+        self.window_start = perf_counter()
+        self.window_rss = current_rss()
+        self.counters.clear()
+        self.observations.clear()
+
+    def end_window(self, time_window):
+        summary = {'time_window': time_window,
+                   'start': self.window_start - self.origin,
+                   'wall_time': perf_counter() - self.window_start,
+                   'stages': {name: {'time': duration, 'calls': calls}
+                              for name, (start, duration, calls) in self.stages.items()},
+                   'counters': dict(self.counters),
+                   'distributions': {name: distribution(values) for name, values in self.observations.items()},
+                   'memory_delta': current_rss() - self.window_rss}
+
+        self.flush()
+        for sink in self.sinks:
+            sink.record_window(summary)
+        self.window_start = None
+
+    def close(self):
+        """
+        Passes the remaining stages to the sinks and closes all sinks.
+        """
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+class NullInstrumentation:
+    """
+    The disabled instrumentation, whose stages and windows do nothing.
+    """
+
+    enabled = False
+
+    def __init__(self):
+        self.context = nullcontext()
+
+    def stage(self, name):
+        return self.context
+
+    def window(self, time_window):
+        return self.context
+
+    def count(self, name, value=1):
+        pass
+
+    def observe(self, name, value):
+        pass
+
+    def fork(self):
+        return self
+
+    def totals(self):
+        return None
+
+    def merge(self, totals):
+        pass
+
+    def close(self):
+        pass
+
+
+def distribution(values):
+    """
+    Summarizes the values of a distribution.
+    :param values: List of the values.
+    :return: dictionary with the count, the maximum and the 50th, 90th and 99th percentiles.
+    """
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {'count': len(values), 'max': np.max(values).item(), 'p50': float(p50), 'p90': float(p90),
+            'p99': float(p99)}
+
+
+def current_rss():
+    """
+    Returns the current resident set size of the process in bytes. If it is unavailable (outside of Linux), the peak
+    resident set size is returned, or 0, if that is unavailable as well (e.g. on Windows).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+
+    # the resource module only exists on Unix
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    # ru_maxrss is given in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+
+class Interner:
+    """
+    Maps values (e.g. vertex names or types) to compact int32 codes. Codes are assigned in the order of the first
+    occurrence and never change, so that the codes of different windows can be compared and joined. The mapping grows
+    incrementally, so that encoding n values costs O(n) independent of the number of known values.
+    """
+
+    def __init__(self, values=()):
+        # the code of every known value and the known values by their codes (with spare capacity)
+        self.codes = {}
+        self.values = np.empty(16, dtype=object)
+
+        self.encode(values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def encode(self, values):
+        """
+        Returns the codes of the given values. Values, which are not known yet, get new codes.
+        :param values: Array-like of values.
+        :return: int32 array with the code of every value.
+        """
+        values = np.asarray(values, dtype=object)
+        if len(values) == 0:
+            return np.empty(0, dtype=np.int32)
+
+        # every distinct value is looked up once, new values get the next free code
+        uniques = pd.unique(values)
+        unique_codes = np.fromiter((self.codes.setdefault(value, len(self.codes)) for value in uniques),
+                                   dtype=np.int64, count=len(uniques))
+
+        # the array of values grows by doubling its capacity
+        if len(self.codes) > len(self.values):
+            self.values = np.concatenate([self.values, np.empty(max(len(self.codes), len(self.values)),
+                                                                dtype=object)])
+        self.values[unique_codes] = uniques
+
+        return unique_codes[pd.Index(uniques).get_indexer(values)].astype(np.int32)
+
+    def decode(self, codes):
+        """
+        Returns the values of the given codes.
+        :param codes: Array-like of codes.
+        :return: object array with the value of every code.
+        """
+        return self.values[np.asarray(codes, dtype=np.int64)]
@@ -0,0 +1,126 @@
+import sys
+import types
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# the types of attributes, which hold the state of a component
+CONTAINER_TYPES = (dict, list, tuple, set, frozenset, deque, np.ndarray, pd.DataFrame, pd.Series, pd.Index)
+
+# objects, whose attributes are not part of their size
+OPAQUE_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def approximate_size(obj):
+    """
+    Approximates the memory usage of an object including the objects it refers to, i.e. the items of containers, the
+    data of numpy arrays and pandas objects and the attributes of other objects. Objects referred to several times are
+    counted once.
+    :param obj: The object.
+    :return: the approximate number of bytes.
+    """
+    seen = set()
+    stack = [obj]
+    n_bytes = 0
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        if isinstance(current, (pd.DataFrame, pd.Series)):
+            n_bytes += int(np.sum(current.memory_usage(index=True, deep=True)))
+        elif isinstance(current, pd.Index):
+            n_bytes += current.memory_usage(deep=True)
+        elif isinstance(current, np.ndarray):
+            # a view does not own its data, and the items of object arrays are separate objects
+            n_bytes += sys.getsizeof(current) if current.base is None else current.nbytes
+            if current.dtype == object:
+                stack.extend(current.ravel())
+        else:
+            n_bytes += sys.getsizeof(current)
+
+            if isinstance(current, dict):
+                stack.extend(current.keys())
+                stack.extend(current.values())
+            elif isinstance(current, (list, tuple, set, frozenset, deque)):
+                stack.extend(current)
+            elif hasattr(current, '__dict__') and not isinstance(current, OPAQUE_TYPES):
+                stack.append(vars(current))
+
+    return n_bytes
+
+
+def footprint(structure):
+    """
+    Returns the number of entries (e.g. keys of a dictionary or rows of a dataframe) and the approximate memory usage
+    of an internal structure.
+    :param structure: The structure.
+    :return: dictionary with the entries and the bytes.
+    """
+    return {'entries': len(structure) if hasattr(structure, '__len__') else 1,
+            'bytes': approximate_size(structure)}
+
+
+def memory_report(obj, structures=None, exclude=()):
+    """
+    Returns the footprint of the internal structures of a component.
+    :param obj: The component, e.g. a feature, a database or an estimator.
+    :param structures: List of the names of the structures. The structures of nested objects are given by dotted names
+    (e.g. 'interpreter.frequencies'). If None, all attributes, which hold containers, arrays or dataframes, are
+    reported.
+    :param exclude: List of names of attributes, which are not reported, if structures is None.
+    :return: dictionary with the footprint of every structure.
+    """
+    if structures is None:
+        structures = [name for name, value in vars(obj).items()
+                      if isinstance(value, CONTAINER_TYPES) and name not in exclude]
+
+    report = {}
+    for name in structures:
+        structure = obj
+        for attribute in name.split('.'):
+            structure = getattr(structure, attribute)
+        report[name] = footprint(structure)
+
+    return report
+
+
+class MemoryTimeSeries:
+    """
+    Records the memory reports of an analyzer every interval time windows. As every report visits all entries of the
+    reported structures, a larger interval reduces the overhead for large states.
+    """
+
+    def __init__(self, interval=1):
+        """
+        :param interval: The number of time windows between two reports.
+        """
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError("The given parameter 'interval' should be an integer and >= 1!")
+
+        self.interval = interval
+        self.rows = []
+
+    def record(self, time_window, analyzer):
+        """
+        Records the memory report of the analyzer, if a report is due in the given time window.
+        :param time_window: The time window.
+        :param analyzer: The analyzer.
+        """
+        if time_window % self.interval != 0:
+            return
+
+        for component, report in analyzer.memory_report().items():
+            for structure, structure_footprint in report.items():
+                self.rows.append((time_window, component, structure, structure_footprint['entries'],
+                                  structure_footprint['bytes']))
+
+    def to_frame(self):
+        """
+        Returns the recorded reports.
+        :return: dataframe with the columns (time_window, component, structure, entries, bytes).
+        """
+        return pd.DataFrame(self.rows, columns=['time_window', 'component', 'structure', 'entries', 'bytes'])
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+META_COLUMNS = ['name', 'type', 'time_window']
+
+
+class ObservationBlock:
+    """
+    A typed block of observations, which is passed between the stages of the analyzer instead of a dataframe. The
+    observations are validated once, when the block is created, and consist of a contiguous float64 array of values
+    (e.g. features or feature p_values) and of the meta information name, type and time_window. Types are stored as int32
+    codes into the array of distinct types.
+
+    Like a dataframe, a block returns a column for a column name, a block with the given value columns for a list of
+    column names and a block of the selected rows for a boolean mask, an index array or a slice.
+    """
+
+    def __init__(self, values, columns, names, time_windows, type_codes, types):
+        self.values = values
+        self.columns = list(columns)
+        self.names = names
+        self.time_windows = time_windows
+        self.type_codes = type_codes
+        self.types = types
+
+    @classmethod
+    def from_frame(cls, frame, columns):
+        """
+        Creates a block from the given dataframe and validates it.
+        :param frame: Dataframe with the columns name, type, time_window and the given value columns.
+        :param columns: The value columns.
+        :return: the block.
+        """
+        missing = set(META_COLUMNS + list(columns)).difference(frame.columns)
+        if missing:
+            raise ValueError("Found DataFrame with the required columns %s missing." % missing)
+
+        try:
+            values = np.ascontiguousarray(frame[list(columns)].to_numpy(dtype=np.float64))
+        except (TypeError, ValueError):
+            raise ValueError("Found DataFrame with values, which are not numeric.")
+
+        type_codes, types = pd.factorize(frame['type'])
+
+        return cls(values, columns, np.asarray(frame['name'].values, dtype=object),
+                   np.asarray(frame['time_window'].values, dtype=np.int64), type_codes.astype(np.int32),
+                   np.asarray(types, dtype=object))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+
+        if isinstance(key, list) and all(isinstance(column, str) for column in key):
+            return self.select(key)
+
+        return self.take(key)
+
+    def column(self, column):
+        """
+        Returns a single column.
+        :param column: Either 'name', 'type', 'time_window' or a value column.
+        :return: array with the column.
+        """
+        if column == 'name':
+            return self.names
+        if column == 'type':
+            return self.types[self.type_codes]
+        if column == 'time_window':
+            return self.time_windows
+        if column in self.columns:
+            return self.values[:, self.columns.index(column)]
+
+        raise KeyError(column)
+
+    def select(self, columns):
+        """
+        Returns a block with the given value columns and the same rows.
+        :param columns: List of value columns.
+        :return: the block.
+        """
+        indices = [self.columns.index(column) for column in columns]
+
+        return ObservationBlock(np.ascontiguousarray(self.values[:, indices]), columns, self.names, self.time_windows,
+                                self.type_codes, self.types)
+
+    def take(self, rows):
+        """
+        Returns a block with the given rows.
+        :param rows: Boolean mask, array of row indices or slice.
+        :return: the block.
+        """
+        if not isinstance(rows, slice):
+            rows = np.asarray(rows)
+
+        return ObservationBlock(self.values[rows], self.columns, self.names[rows], self.time_windows[rows],
+                                self.type_codes[rows], self.types)
+
+    def to_frame(self):
+        """
+        Converts the block back to a dataframe.
+        :return: Dataframe with the columns name, type, time_window and the value columns.
+        """
+        frame = pd.DataFrame({'name': self.names, 'type': self.column('type'), 'time_window': self.time_windows})
+        for i, column in enumerate(self.columns):
+            frame[column] = self.values[:, i]
+
+        return frame
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from .observation_block import ObservationBlock, META_COLUMNS
+
 
 def check_p_values(p_values):
     p_values = np.atleast_2d(p_values)
@@ -27,6 +29,14 @@ def check_meta_info_series(meta_info, required_columns=()):
 
 
 def check_meta_info_dataframe(meta_info, required_columns=()):
+    # blocks are validated when they are created
+    if isinstance(meta_info, ObservationBlock):
+        if not set(required_columns).issubset(META_COLUMNS + meta_info.columns):
+            raise ValueError("Found ObservationBlock with the required columns %s missing." % set(
+                required_columns).difference(META_COLUMNS + meta_info.columns))
+
+        return meta_info
+
     if not isinstance(meta_info, pd.DataFrame):
         raise TypeError("Found input of type %s, but expected a DataFrame." % type(meta_info))
 
@@ -51,8 +61,12 @@ def check_observations(observations, n_features=None):
 
 
 def check_reference_observations(ref_observations):
-    ref_observations = np.atleast_2d(ref_observations)
-    ref_observations = np.array(ref_observations, dtype=np.float64)
+    # the values of blocks are converted when the blocks are created
+    if isinstance(ref_observations, ObservationBlock):
+        ref_observations = ref_observations.values
+    else:
+        ref_observations = np.atleast_2d(ref_observations)
+        ref_observations = np.array(ref_observations, dtype=np.float64)
 
     if ref_observations.ndim > 2:
         raise ValueError("Found array with dim %d, but expected <= 2." % ref_observations.ndim)
@@ -85,3 +99,18 @@ def check_is_fitted(estimator, attributes):
     if not all([hasattr(estimator, attr) for attr in attributes]):
         raise ValueError("This %s is not fitted yet. Call 'fit' with appropriate arguments before using this method."
                          % type(estimator).__name__)
+
+
+def check_offsets(offsets, ref_observations):
+    offsets = np.array(offsets, dtype=np.int64)
+
+    if offsets.ndim != 1 or len(offsets) == 0:
+        raise ValueError("Found offsets with shape %s, but expected a non-empty 1-d array." % (offsets.shape,))
+
+    if offsets[0] != 0 or offsets[-1] != len(ref_observations):
+        raise ValueError("Offsets should start with 0 and end with the number of reference observations.")
+
+    if np.any(np.diff(offsets) < 0):
+        raise ValueError("Offsets should be non-decreasing.")
+
+    return offsets